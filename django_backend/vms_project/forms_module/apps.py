@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class FormsModuleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'forms_module'
-    verbose_name = "Forms Module (Device Storage, Gate Pass)"
\ No newline at end of file
+    verbose_name = "Forms Module (Device Storage, Gate Pass)"
+
+    def ready(self):
+        from . import health # noqa: F401 -- counts database connections and requests for /healthz
\ No newline at end of file
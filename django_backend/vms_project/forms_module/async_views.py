@@ -0,0 +1,176 @@
+"""
+Async read paths for the location-scoped APIs, served when the project runs under ASGI
+(vms_project/asgi.py sets ASYNC_READ_VIEWS).
+
+Under ASGI a sync DRF view holds a thread for its whole run. The busiest reads (the
+visitor desk polls the visitor list and the task counters) are instead served by async
+views that reuse the viewset's own queryset, location scoping, filter backends,
+serializers and paginator, and run only the queries themselves through Django's async
+ORM. Everything else on the same URLs (writes, CSV/XLSX exports, cursor pagination) is
+handed to the viewset's sync view. Exports stream from a sync generator, which Django's
+ASGI handler would read into memory whole (sync_to_async(list)) before sending a byte;
+they are passed on as an async iterator instead, a chunk per thread hop.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, HttpResponseBase
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from locations.registry import location_registry
+from users.authorization import get_authorized_location_ids
+
+EXPORT_MEDIA_TYPES = ('text/csv', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+
+def render(response):
+    """Renders a DRF Response (or plain data) as JSON, as the sync views' default renderer would."""
+    if isinstance(response, HttpResponseBase) and not isinstance(response, Response):
+        return response # Already final, e.g. a 304
+    if not isinstance(response, Response):
+        response = Response(response)
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    rendered = HttpResponse(renderer.render(response.data), status=response.status_code,
+                            content_type='application/json')
+    for header, value in response.items():
+        if header.lower() != 'content-type': # An unrendered Response still holds HttpResponse's text/html default
+            rendered[header] = value
+    return rendered
+
+
+def _authenticate(request):
+    # simplejwt is sync; header parsing, token validation and the user lookup run in one thread hop.
+    authenticator = JWTAuthentication()
+    result = authenticator.authenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    user = result[0]
+    get_authorized_location_ids(user) # Memoized on the user, so get_queryset() below needs no query
+    return user
+
+
+def needs_sync_view(request):
+    """Requests the async reads don't implement: non-GETs, keyset pages and file exports."""
+    if request.method != 'GET' or request.GET.get('pagination') == 'cursor':
+        return True
+    if request.GET.get('format', 'json') != 'json':
+        return True
+    accept = request.headers.get('Accept', '')
+    return any(media_type in accept for media_type in EXPORT_MEDIA_TYPES)
+
+
+async def _iterate_in_thread(iterator):
+    # Thread-sensitive, like the sync view itself: each chunk is read on the request's sync
+    # thread, so a server-side cursor stays on the connection that opened it.
+    next_chunk, done = sync_to_async(next), object()
+    while (chunk := await next_chunk(iterator, done)) is not done:
+        yield chunk
+
+
+def stream_async(response):
+    """Gives a sync StreamingHttpResponse async content, so ASGI sends it as it is produced."""
+    if response.streaming and not response.is_async:
+        # The original generator stays in the response's closers, so response.close() still releases it.
+        response.streaming_content = _iterate_in_thread(iter(response.streaming_content))
+    return response
+
+
+def read_async(async_view, sync_view):
+    """A view that answers GETs with `async_view` and everything else with the router's `sync_view`."""
+    async def view(request, *args, **kwargs):
+        if needs_sync_view(request):
+            return stream_async(await sync_to_async(sync_view)(request, *args, **kwargs))
+        return await async_view(request, *args, **kwargs)
+    view.csrf_exempt = True # As DRF's own views; JWT requests carry no CSRF token
+    return view
+
+
+def router_views(router):
+    """{url name: view} for a DRF router's routes, to fall back on for the same URLs."""
+    views = {}
+    for pattern in router.urls:
+        views.setdefault(pattern.name, pattern.callback)
+    return views
+
+
+class AsyncLocationScopedReads:
+    """Async list and retrieve for a BaseLocationScopedViewSet subclass; subclass it to add actions."""
+
+    def __init__(self, viewset_class):
+        self.viewset_class = viewset_class
+
+    async def view_for(self, request, action, **kwargs):
+        """An authenticated, unbound viewset instance to build querysets and serializers with."""
+        user = await sync_to_async(_authenticate)(request)
+        drf_request = Request(request)
+        drf_request.user = user
+        view = self.viewset_class()
+        view.request, view.args, view.kwargs = drf_request, (), kwargs
+        view.action, view.action_map, view.format_kwarg, view.headers = action, {'get': action}, None, {}
+        return view
+
+    async def load_locations(self, rows):
+        """Makes sure the location registry holds every row's location, so serializing them needs no query."""
+        location_ids = {row['location_id'] if isinstance(row, dict) else row.location_id for row in rows}
+        if location_registry.stale(location_ids):
+            await sync_to_async(location_registry.ensure)(location_ids)
+
+    async def paginated(self, view, queryset):
+        """view.list_response(queryset), queried with the async ORM."""
+        projection = view.get_projection()
+        if projection is not None:
+            queryset = projection.values(queryset)
+        page = await view.paginator.apaginate_queryset(queryset, view.request, view=view)
+        rows = [row async for row in queryset] if page is None else page
+        await self.load_locations(rows)
+        data = view.get_serializer(rows, many=True).data if projection is None else projection.represent(rows)
+        return Response(data) if page is None else view.paginator.get_paginated_response(data)
+
+    async def respond(self, handler, request, *args, **kwargs):
+        try:
+            return render(await handler(request, *args, **kwargs))
+        except Http404:
+            return render(Response({'detail': NotFound.default_detail}, status=status.HTTP_404_NOT_FOUND))
+        except APIException as exc:
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = render(Response(data, status=exc.status_code))
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                response['WWW-Authenticate'] = JWTAuthentication().authenticate_header(request)
+            return response
+
+    async def list(self, request):
+        return await self.respond(self._list, request)
+
+    async def retrieve(self, request, pk):
+        return await self.respond(self._retrieve, request, pk)
+
+    async def _list(self, request):
+        view = await self.view_for(request, 'list')
+        queryset = view.filter_queryset(view.get_queryset())
+        if not view.counts_rows():
+            return await self.paginated(view, queryset)
+        values = await queryset.order_by().aaggregate(**view.validator_aggregates())
+        etag, _ = view.get_validators(values)
+        not_modified = view.conditional_response(etag)
+        if not_modified is not None:
+            return not_modified
+        view.known_count = values['count']
+        return view.set_validators(await self.paginated(view, queryset), etag)
+
+    async def _retrieve(self, request, pk):
+        view = await self.view_for(request, 'retrieve', pk=pk)
+        try:
+            instance = await view.filter_queryset(view.get_queryset()).filter(pk=pk).afirst()
+        except (TypeError, ValueError):
+            instance = None
+        if instance is None:
+            raise Http404
+        await self.load_locations([instance])
+        etag, last_modified = view.get_validators(view.instance_validator_values(instance))
+        not_modified = view.conditional_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return view.set_validators(Response(view.get_serializer(instance).data), etag, last_modified)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Response compression.
+
+Django's GZipMiddleware compresses anything over 200 bytes, including the JPEG/WebP files
+images/media.py streams. CompressionMiddleware only compresses text-like responses
+(JSON pages, CSV exports, the browsable API) of at least settings.COMPRESSION_MIN_SIZE
+bytes; below that the CPU spent outweighs the bytes saved. Clients that accept brotli get
+it when the `brotli` package is installed, otherwise gzip. Streaming responses (CSV
+exports) are always gzipped chunk by chunk.
+
+Both weaken a strong ETag, as GZipMiddleware does; the API's own ETags are already weak.
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+BROTLI_QUALITY = 4 # About gzip's speed at a better ratio; the default (11) is meant for static files
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+def compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return response.status_code != 206 and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not compressible(response):
+            return response
+        if response.streaming:
+            return super().process_response(request, response)
+        if len(response.content) < self.min_size:
+            return response
+        if brotli is None or not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(compressed_content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Sparse fieldsets for the location-scoped APIs.
+
+    ?fields=id,fullName,checkInTime   only these fields
+    ?omit=reason,items                every field but these
+    ?expand=location                  with ?fields=, nest these relations in full
+
+Without any of them responses are unchanged. In a ?fields= response the relations in a
+serializer's `expandable_fields` (location, photo, items) are collapsed to their id(s)
+unless they are also named in ?expand=. The queryset is cut down to match: only() the
+columns the remaining fields read, and select/prefetch only the relations they render.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+EXPAND_PARAM = 'expand'
+
+
+def collapsed_id(source):
+    """An expandable_fields entry rendering a foreign key as its id."""
+    return lambda: serializers.IntegerField(source=source, read_only=True)
+
+
+def collapsed_ids():
+    """An expandable_fields entry rendering a reverse relation as a list of ids."""
+    return lambda: serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+
+def _names(request, param):
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class Fieldset:
+    """The fields a request asked for with ?fields=, ?omit= and ?expand=."""
+
+    def __init__(self, fields=None, omit=(), expand=()):
+        self.fields, self.omit, self.expand = fields, set(omit), set(expand)
+
+    @classmethod
+    def from_request(cls, request):
+        """A Fieldset, or None when the request uses none of the parameters."""
+        fields, omit, expand = (_names(request, param) for param in (FIELDS_PARAM, OMIT_PARAM, EXPAND_PARAM))
+        if fields is None and not omit and not expand:
+            return None
+        return cls(fields, omit or (), expand or ())
+
+    def select(self, fields, expandable_fields):
+        """The serializer fields to render, from its full {name: field} map."""
+        readable = {name for name, field in fields.items() if not field.write_only}
+        unknown = (set(self.fields or ()) | self.omit | self.expand) - readable
+        if unknown:
+            raise ParseError(f"Unknown field(s): {', '.join(sorted(unknown))}.")
+        not_expandable = self.expand - set(expandable_fields)
+        if not_expandable:
+            raise ParseError(f"Can't expand: {', '.join(sorted(not_expandable))}. Expandable: {', '.join(expandable_fields)}.")
+
+        selected = {}
+        for name, field in fields.items():
+            if name in self.omit:
+                continue
+            if self.fields is not None and not field.write_only:
+                if name not in self.fields and name not in self.expand:
+                    continue
+                if name in expandable_fields and name not in self.expand:
+                    field = expandable_fields[name]()
+            selected[name] = field
+        return selected
+
+
+class SparseFieldsetSerializerMixin:
+    """ModelSerializer mixin that renders only the fields of context['fieldset'], if any."""
+    # {field name: factory for its collapsed form}, used when ?fields= names it without ?expand=
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get('fieldset')
+        return fields if fieldset is None else fieldset.select(fields, self.expandable_fields)
+
+
+def trim_queryset(queryset, fields, keep=()):
+    """
+    `queryset` loading only what `fields` (a serializer's bound fields) read, plus the model
+    fields in `keep`. Left unchanged if a field reads anything but a model field.
+    """
+    opts = queryset.model._meta
+    columns, related, prefetches = set(keep), set(), {}
+    selected = queryset.query.select_related
+    for field in fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return queryset # SerializerMethodField and the like: can't tell what they read
+        try:
+            model_field = opts.get_field(field.source.split('.')[0])
+        except FieldDoesNotExist:
+            return queryset
+        if model_field.concrete:
+            columns.add(model_field.name)
+            if model_field.is_relation and isinstance(field, serializers.BaseSerializer):
+                related.add(model_field.name)
+        elif model_field.one_to_many:
+            if isinstance(field, serializers.BaseSerializer):
+                prefetches[model_field.name] = model_field.name
+            else: # Collapsed to ids
+                rows = model_field.related_model.objects.only('pk', model_field.remote_field.name)
+                prefetches[model_field.name] = Prefetch(model_field.name, queryset=rows)
+        else:
+            return queryset
+
+    # Keep the viewset's select_related for relations still rendered or kept; they must be loaded in full.
+    keep_related = [name for name in (selected if isinstance(selected, dict) else ())
+                    if name in related or name in keep]
+    columns.update(keep_related)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if keep_related:
+        queryset = queryset.select_related(*keep_related)
+    return queryset.prefetch_related(*prefetches.values()).only(*columns)
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+/healthz: a readiness check for load balancers and orchestrators, plus this process's
+database connection statistics.
+
+Django 4.2 has no connection pool; with CONN_MAX_AGE each worker thread keeps its own
+connection open between requests (vms_project/settings_production.py), so the "pool" is
+the set of per-thread connections in this process. The counters below show whether they
+are actually reused: requests_per_connection near 1 means every request still reconnects.
+"""
+import logging
+import os
+import threading
+import time
+import weakref
+
+from django.core.signals import request_finished
+from django.db import DatabaseError, connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.opened = 0
+        self.requests = 0
+        self.wrappers = weakref.WeakSet() # One DatabaseWrapper per thread and alias
+
+    def connection_opened(self, wrapper):
+        with self._lock:
+            self.opened += 1
+            self.wrappers.add(wrapper)
+
+    def request_finished(self):
+        with self._lock:
+            self.requests += 1
+
+    def snapshot(self):
+        with self._lock:
+            wrappers = list(self.wrappers)
+            opened, requests = self.opened, self.requests
+        return {
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.monotonic() - self.started),
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'conn_health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            'connections_open': sum(1 for wrapper in wrappers if wrapper.connection is not None),
+            'connections_opened': opened,
+            'requests': requests,
+            'requests_per_connection': round(requests / opened, 1) if opened else None,
+        }
+
+
+stats = ConnectionStats()
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    stats.connection_opened(connection)
+
+
+@receiver(request_finished)
+def count_request(sender, **kwargs):
+    stats.request_finished()
+
+
+@require_GET
+def healthz(request):
+    """200 when the database answers, 503 otherwise; no authentication, so probes can call it."""
+    body = {'status': 'ok'}
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        body['database_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    except DatabaseError:
+        logger.exception('Health check: database unavailable')
+        body['status'] = 'database unavailable' # Details stay in the log; this endpoint is public
+    body['connections'] = stats.snapshot()
+    return JsonResponse(body, status=200 if 'database_ms' in body else 503)
\ No newline at end of file
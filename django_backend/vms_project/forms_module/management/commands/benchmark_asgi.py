@@ -0,0 +1,139 @@
+import asyncio
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ['/api/visitors/', '/api/task-management/tasks/completed-today-count/']
+
+SERVERS = {
+    # Same worker count for both; the WSGI workers get threads so neither side serves one request at a time.
+    'wsgi': lambda workers, threads: ['vms_project.wsgi:application', '-w', str(workers), '-k', 'gthread', '--threads', str(threads)],
+    'asgi': lambda workers, threads: ['vms_project.asgi:application', '-w', str(workers), '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _get(reader, writer, request):
+    """Sends one keep-alive GET and returns its status code."""
+    writer.write(request)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(':', 1) for line in lines[1:] if ':' in line)
+    headers = {name.strip().lower(): value.strip() for name, value in headers.items()}
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    return int(lines[0].split()[1]), headers.get('connection', '').lower() == 'close'
+
+
+async def _client(host, port, requests, deadline, latencies, errors):
+    reader = writer = None
+    i = 0
+    while time.monotonic() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection(host, port)
+        started = time.perf_counter()
+        try:
+            status, closed = await _get(reader, writer, requests[i % len(requests)])
+        except (ConnectionError, asyncio.IncompleteReadError):
+            errors.append('connection')
+            writer.close()
+            writer = None
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status != 200:
+            errors.append(status)
+        if closed:
+            writer.close()
+            writer = None
+        i += 1
+    if writer is not None:
+        writer.close()
+
+
+async def drive(host, port, requests, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(_client(host, port, requests[i:] + requests[:i], deadline, latencies, errors)
+                           for i in range(concurrency)))
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = ("Starts gunicorn with the WSGI app (gthread workers) and then the ASGI app (uvicorn workers), "
+            "with the same worker count, and drives keep-alive GET load at the busiest read endpoints "
+            "as an existing approved user, reporting requests/s and latency percentiles for each.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', required=True, help='An approved user with authorized locations.')
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=8, help='Threads per WSGI worker.')
+        parser.add_argument('--concurrency', type=int, default=64, help='Open client connections.')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds of load per server.')
+        parser.add_argument('--warmup', type=float, default=3)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--path', action='append', dest='paths', help=f'Endpoint to load (repeatable); default {DEFAULT_PATHS}.')
+        parser.add_argument('--server', choices=sorted(SERVERS), action='append', dest='servers')
+
+    def handle(self, *args, **options):
+        host, port = '127.0.0.1', options['port']
+        paths = options['paths'] or DEFAULT_PATHS
+        results = {}
+        for server in options['servers'] or ['wsgi', 'asgi']:
+            process = self.start(server, host, port, options)
+            try:
+                token = self.login(host, port, options['email'], options['password'])
+                requests = [(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAuthorization: Bearer {token}\r\n'
+                             'Accept: application/json\r\n\r\n').encode() for path in paths]
+                asyncio.run(drive(host, port, requests, options['concurrency'], options['warmup']))
+                latencies, errors = asyncio.run(drive(host, port, requests, options['concurrency'], options['duration']))
+            finally:
+                process.send_signal(signal.SIGTERM)
+                process.wait(timeout=30)
+            results[server] = latencies
+            self.stdout.write(
+                f'{server}: {len(latencies) / options["duration"]:.0f} req/s, '
+                f'p50 {percentile(latencies, 0.50):.1f}ms, p99 {percentile(latencies, 0.99):.1f}ms, '
+                f'{len(errors)} errors{f" {sorted(set(map(str, errors)))}" if errors else ""}'
+            )
+        if len(results) == 2:
+            ratio = len(results['asgi']) / max(len(results['wsgi']), 1)
+            self.stdout.write(f'asgi/wsgi throughput: {ratio:.2f}x')
+
+    def start(self, server, host, port, options):
+        command = [sys.executable, '-m', 'gunicorn', *SERVERS[server](options['workers'], options['threads']),
+                   '-b', f'{host}:{port}', '--log-level', 'warning', '--access-logfile', '/dev/null']
+        environment = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'vms_project.settings')}
+        environment.pop('DJANGO_ASYNC_READ_VIEWS', None) # Let each entry point pick its own views
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=environment)
+        for _ in range(100):
+            try:
+                socket.create_connection((host, port), timeout=1).close()
+                return process
+            except OSError:
+                if process.poll() is not None:
+                    raise CommandError(f'gunicorn ({server}) exited with status {process.returncode}.')
+                time.sleep(0.1)
+        process.kill()
+        raise CommandError(f'gunicorn ({server}) did not start listening on {host}:{port}.')
+
+    def login(self, host, port, email, password):
+        connection = http.client.HTTPConnection(host, port, timeout=10)
+        connection.request('POST', '/api/auth/login/', json.dumps({'username': email, 'password': password}),
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        if response.status != 200:
+            raise CommandError(f'Login as {email} failed: {response.status} {response.read()[:200]!r}')
+        return json.loads(response.read())['access']
\ No newline at end of file
@@ -0,0 +1,135 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+
+from images.models import StoredImage
+from locations.models import Location
+from locations.registry import location_registry
+from task_management.models import Task
+from task_management.views import TaskViewSet
+from visitors.models import Visitor
+from visitors.views import VisitorViewSet
+
+FIRST_NAMES = ['Aarav', 'Sita', 'Ram', 'Gita', 'Hari', 'Maya', 'Bikash', 'Anita', 'Suman', 'Priya', 'Rajesh', 'Sunita']
+LAST_NAMES = ['Shrestha', 'Sharma', 'Paneru', 'Thapa', 'Gurung', 'Rai', 'Karki', 'Adhikari', 'Tamang', 'Magar']
+
+# Timed list pages. A quarter of the seeded visitors have a photo, whose signed media URLs cost the same on
+# both paths, so the visitor list is also timed without it.
+TIMED_CASES = [
+    (VisitorViewSet, {}),
+    (VisitorViewSet, {'omit': 'photo'}),
+    (TaskViewSet, {}),
+]
+
+
+class Command(BaseCommand):
+    help = ("Compares the rows/sec of list pages built from values() rows (forms_module/projection.py) with "
+            "the serializers over model instances. The rows it seeds are rolled back afterwards. Output "
+            "parity is checked by forms_module.tests.ValuesProjectionParityTests.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Seed the benchmark location up to this many visitors and tasks for the run.')
+        parser.add_argument('--page-sizes', default='100,1000', help='Comma separated rows per timed page.')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per page size and path.')
+        parser.add_argument('--location-name', default='Projection Benchmark')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                location, _ = Location.objects.get_or_create(name=options['location_name'])
+                location_registry.ensure({location.pk})
+                self.seed(location, options['rows'])
+                self.benchmark(location, options)
+                transaction.set_rollback(True) # Leave the database as it was
+        finally:
+            location_registry.invalidate() # It may hold the rolled back location
+
+    def benchmark(self, location, options):
+        # Query plus serialization, as list spends it on one page.
+        for viewset_class, params in TIMED_CASES:
+            view = self.view(viewset_class, 'list', params)
+            projection = view.get_projection()
+            if projection is None:
+                raise CommandError(f'{viewset_class.__name__}.list {params} has no values projection.')
+            for page_size in (int(size) for size in options['page_sizes'].split(',')):
+                page = self.queryset(view, location)[:page_size]
+                timings = {
+                    'instances': self.time(lambda: view.get_serializer(list(page.all()), many=True).data, options['repeat']),
+                    'values()': self.time(lambda: projection.represent(list(projection.values(page))), options['repeat']),
+                }
+                self.stdout.write(
+                    f'{viewset_class.__name__} {params or ""}'.ljust(36) + f'{page_size:>5} rows: ' + ', '.join(
+                        f'{label} {page_size / seconds:>8,.0f} rows/s' for label, seconds in timings.items()
+                    ) + f' ({timings["instances"] / timings["values()"]:.1f}x)'
+                )
+
+    def view(self, viewset_class, action, params):
+        """A viewset instance set up for a GET with these query parameters, as the router would."""
+        view = viewset_class()
+        host = settings.ALLOWED_HOSTS[0].lstrip('.') if settings.ALLOWED_HOSTS else 'localhost' # Media URLs are absolute
+        view.request = Request(RequestFactory().get('/', params, HTTP_HOST=host))
+        view.args, view.kwargs, view.format_kwarg = (), {}, None
+        view.action = action
+        return view
+
+    def queryset(self, view, location):
+        # The viewset's own ordering, filter backends and fieldset trimming, minus the per-user scoping.
+        return view.filter_queryset(view.queryset.filter(location=location))
+
+    def time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def seed(self, location, rows):
+        photo = StoredImage.objects.filter(fullName='Projection Benchmark').first()
+        if photo is None:
+            # bulk_create skips StoredImage.save(), which would read the (absent) file
+            photo = StoredImage.objects.bulk_create([StoredImage(
+                fullName='Projection Benchmark', imageFile='stored_images/projection-benchmark.jpg',
+                derivatives={'64': {'path': 'derivatives/projection-benchmark-64.webp', 'width': 64, 'height': 48, 'bytes': 2048}},
+            )])[0]
+
+        now = timezone.now()
+        existing = Visitor.objects.filter(location=location).count()
+        if existing < rows:
+            self.stdout.write(f'Seeding {rows - existing} visitors into "{location.name}"...')
+            visitors = []
+            for i in range(existing, rows):
+                first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+                check_in = now - timedelta(minutes=random.randint(0, 60 * 24 * 90))
+                visitors.append(Visitor(
+                    location=location, fullName=f'{first} {last}', idNumberType=f'Citizenship {random.randint(10000, 99999)}',
+                    email=f'{first.lower()}.{last.lower()}{i}@gmail.com', contact=f'98{random.randint(40000000, 49999999)}',
+                    reason=random.choice(['Meeting', 'Delivery', 'Interview', '']), requestSource='Walk-in',
+                    photo=photo if i % 4 == 0 else None, checkInTime=check_in,
+                    checkOutTime=check_in + timedelta(minutes=random.randint(5, 240)) if i % 3 else None,
+                    created_by_name='Benchmark Seeder', created_by_email='seeder@example.com',
+                ))
+            Visitor.objects.bulk_create(visitors, batch_size=5000)
+
+        existing = Task.objects.filter(location=location).count()
+        if existing < rows:
+            self.stdout.write(f'Seeding {rows - existing} tasks into "{location.name}"...')
+            tasks = []
+            for i in range(existing, rows):
+                completed = i % 2 == 0
+                tasks.append(Task(
+                    location=location, job_date=timezone.localdate() - timedelta(days=i % 90),
+                    job_id=f'B{i + 1}', job_title=f'Benchmark task {i}', full_name=random.choice(FIRST_NAMES),
+                    company_name='Benchmark Ltd', rack_number=f'R{i % 40}', encoded_by='Benchmark Seeder',
+                    is_completed=completed, completed_at=now - timedelta(hours=i % 500) if completed else None,
+                    created_by_name='Benchmark Seeder', created_by_email='seeder@example.com',
+                ))
+            Task.objects.bulk_create(tasks, batch_size=5000)
\ No newline at end of file
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from forms_module.management.commands.benchmark_asgi import percentile
+
+# Share of each virtual user's requests per scenario; --mix overrides these.
+SCENARIOS = ('visitor-list', 'task-list', 'search', 'report', 'create', 'checkout', 'login')
+DEFAULT_MIX = 'visitor-list=30,task-list=10,search=20,report=10,create=15,checkout=10,login=5'
+DEFAULT_SEARCH_TERMS = 'Shrestha,Paneru,Desk 1,9841,zzzz'
+
+
+class ServerError(Exception):
+    """The connection broke or the response couldn't be read."""
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection, reopened after errors or Connection: close."""
+
+    def __init__(self, host, port, timeout):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.reader = self.writer = None
+        self.token = None
+
+    async def request(self, method, path, payload=None):
+        """Returns (status, body); raises ServerError on connection failures and timeouts."""
+        try:
+            return await asyncio.wait_for(self._request(method, path, payload), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError) as exc:
+            self.close()
+            raise ServerError(type(exc).__name__) from exc
+
+    async def _request(self, method, path, payload):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = b'' if payload is None else json.dumps(payload).encode()
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host}', 'Accept: application/json', f'Content-Length: {len(body)}']
+        if payload is not None:
+            head.append('Content-Type: application/json')
+        if self.token:
+            head.append(f'Authorization: Bearer {self.token}')
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+        await self.writer.drain()
+
+        lines = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        headers = dict(line.split(':', 1) for line in lines[1:] if ':' in line)
+        headers = {name.strip().lower(): value.strip() for name, value in headers.items()}
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                chunks.append(await self.reader.readexactly(size + 2))
+                if size == 0:
+                    break
+            data = b''.join(chunk[:-2] for chunk in chunks)
+        else:
+            data = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return int(lines[0].split()[1]), data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class VirtualUser:
+    """Logs in, then runs weighted scenarios as the visitor desk would, until the deadline."""
+
+    def __init__(self, harness, client):
+        self.harness, self.client = harness, client
+        self.location_ids = []
+        self.checked_in = [] # Visitors this user created and hasn't checked out yet
+
+    async def call(self, name, method, path, payload=None, expected=(200,)):
+        """Times one request under `name`; returns the parsed JSON body, or None if it failed."""
+        started = time.perf_counter()
+        try:
+            status, body = await self.client.request(method, path, payload)
+        except ServerError as exc:
+            self.harness.record(name, started, str(exc))
+            return None
+        self.harness.record(name, started, None if status in expected else status)
+        if status not in expected:
+            return None
+        try:
+            return json.loads(body) if body else {}
+        except ValueError:
+            return None
+
+    async def login(self):
+        self.client.token = None
+        data = await self.call('login', 'POST', '/api/auth/login/',
+                               {'username': self.harness.email, 'password': self.harness.password})
+        if not data or 'access' not in data:
+            return False
+        self.client.token = data['access']
+        self.location_ids = [location['id'] for location in data.get('user', {}).get('authorized_locations', [])]
+        return bool(self.location_ids)
+
+    async def run(self, deadline):
+        harness = self.harness
+        while time.monotonic() < deadline and not await self.login():
+            await asyncio.sleep(1) # Server still starting, or the user has no locations yet
+        while time.monotonic() < deadline:
+            scenario = random.choices(harness.scenarios, cum_weights=harness.weights)[0]
+            await getattr(self, scenario.replace('-', '_'))()
+            if harness.think_time:
+                await asyncio.sleep(random.expovariate(1 / harness.think_time))
+
+    def location_query(self, **params):
+        return urlencode({'location_id': random.choice(self.location_ids), **params})
+
+    async def visitor_list(self):
+        params = {'page': 2} if random.random() < 0.2 else {} # Mostly the first page, as the desk polls it
+        await self.call('visitor-list', 'GET', f'/api/visitors/?{self.location_query(**params)}')
+
+    async def task_list(self):
+        await self.call('task-list', 'GET', f'/api/task-management/tasks/?{self.location_query()}')
+
+    async def search(self):
+        term = random.choice(self.harness.search_terms)
+        await self.call('search', 'GET', f'/api/visitors/?{self.location_query(search=term)}')
+
+    async def report(self):
+        end = date.today() - timedelta(days=random.randrange(30))
+        start = end - timedelta(days=random.randint(1, self.harness.report_days))
+        await self.call('report', 'GET', f'/api/visitors/report/?'
+                        f'{self.location_query(start_date=start.isoformat(), end_date=end.isoformat())}')
+
+    async def create(self):
+        first, last = random.choice(['Load', 'Test', 'Harness']), random.choice(['Shrestha', 'Sharma', 'Paneru'])
+        data = await self.call('create', 'POST', '/api/visitors/', {
+            'location_id': random.choice(self.location_ids), 'fullName': f'{first} {last}',
+            'contact': f'98{random.randint(10000000, 99999999)}', 'reason': 'Load test', 'requestSource': 'Walk-in',
+        }, expected=(201,))
+        if data and 'id' in data:
+            self.checked_in.append(data['id'])
+
+    async def checkout(self):
+        if not self.checked_in:
+            await self.create() # Only check out visitors this run created
+            if not self.checked_in:
+                return
+        visitor_id = self.checked_in.pop(random.randrange(len(self.checked_in)))
+        await self.call('checkout', 'POST', f'/api/visitors/{visitor_id}/checkout/')
+
+
+class Command(BaseCommand):
+    help = ("Drives a running server with concurrent virtual users that log in with JWT and then list, search, "
+            "report on, create and check out visitors in a weighted mix, reporting throughput, errors and "
+            "latency percentiles per endpoint. Seed data and a login with seed_load_data first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--email', default='loadtest@example.com', help="An approved user; seed_load_data's by default.")
+        parser.add_argument('--password', default='loadtest-password')
+        parser.add_argument('--users', type=int, default=32, help='Concurrent virtual users, one connection each.')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds of measured load.')
+        parser.add_argument('--warmup', type=float, default=5, help='Seconds of unmeasured load first.')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'scenario=weight pairs; default {DEFAULT_MIX}.')
+        parser.add_argument('--search-terms', default=DEFAULT_SEARCH_TERMS, help='Comma separated ?search= values.')
+        parser.add_argument('--report-days', type=int, default=31, help='Longest report date range.')
+        parser.add_argument('--think-time', type=float, default=0, help='Mean pause between a user\'s requests, in seconds.')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds before a request counts as failed.')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['base_url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('--base-url must be a plain http:// URL (put TLS in front of the server, not in the test).')
+        if options['users'] < 1 or options['duration'] <= 0:
+            raise CommandError('--users and --duration must be positive.')
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+        self.email, self.password = options['email'], options['password']
+        self.search_terms = [term.strip() for term in options['search_terms'].split(',') if term.strip()]
+        self.report_days, self.think_time = max(options['report_days'], 1), options['think_time']
+        self.scenarios, self.weights = self.parse_mix(options['mix'])
+
+        self.stdout.write(f'{options["users"]} users against {options["base_url"]}: '
+                          f'{options["warmup"]:g}s warm-up, then {options["duration"]:g}s measured.')
+        elapsed = asyncio.run(self.drive(url.hostname, url.port or 80, options))
+        self.report(elapsed)
+
+    def parse_mix(self, mix):
+        scenarios, weights, total = [], [], 0
+        for pair in mix.split(','):
+            name, _, weight = pair.partition('=')
+            name = name.strip()
+            if name not in SCENARIOS:
+                raise CommandError(f'Unknown scenario {name!r} in --mix; choose from {", ".join(SCENARIOS)}.')
+            try:
+                total += float(weight)
+            except ValueError:
+                raise CommandError(f'--mix takes scenario=weight pairs, not {pair!r}.')
+            scenarios.append(name)
+            weights.append(total)
+        if total <= 0:
+            raise CommandError('--mix weights must add up to more than 0.')
+        return scenarios, weights
+
+    async def drive(self, host, port, options):
+        self.latencies, self.errors, self.measuring = defaultdict(list), defaultdict(Counter), False
+        start = time.monotonic()
+        measured_from = start + options['warmup']
+        deadline = measured_from + options['duration']
+        users = [VirtualUser(self, Client(host, port, options['timeout'])) for _ in range(options['users'])]
+        tasks = [asyncio.create_task(user.run(deadline)) for user in users]
+        await asyncio.sleep(max(measured_from - time.monotonic(), 0))
+        self.measuring = True
+        await asyncio.gather(*tasks)
+        for user in users:
+            user.client.close()
+        return time.monotonic() - measured_from
+
+    def record(self, name, started, error):
+        """Counts one finished request, once the warm-up is over."""
+        if not self.measuring:
+            return
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        if error is not None:
+            self.errors[name][str(error)] += 1
+
+    def report(self, elapsed):
+        if not self.latencies:
+            raise CommandError('No requests completed; is the server up at --base-url?')
+        self.stdout.write(f'{"endpoint":<14}{"requests":>9}{"req/s":>9}{"p50 ms":>9}{"p90 ms":>9}{"p99 ms":>9}{"max ms":>9}  errors')
+        rows = [(name, self.latencies[name], self.errors[name]) for name in sorted(self.latencies)]
+        rows.append(('total', [value for values in self.latencies.values() for value in values],
+                     sum(self.errors.values(), Counter())))
+        for name, latencies, errors in rows:
+            self.stdout.write(
+                f'{name:<14}{len(latencies):>9}{len(latencies) / elapsed:>9.1f}'
+                f'{percentile(latencies, 0.50):>9.1f}{percentile(latencies, 0.90):>9.1f}'
+                f'{percentile(latencies, 0.99):>9.1f}{max(latencies):>9.1f}  '
+                + (', '.join(f'{error} x{count}' for error, count in errors.most_common()) or '-')
+            )
\ No newline at end of file
@@ -0,0 +1,291 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.db.models import Max
+from django.utils import timezone
+
+from forms_module.models import DeviceStorageEntry, DeviceStorageItem, GatePass, GatePassItem
+from locations.models import Location
+from task_management.models import Task, TaskJobSequence
+from users.models import User
+from visitors.models import Visitor
+
+FIRST_NAMES = ['Aarav', 'Sita', 'Ram', 'Gita', 'Hari', 'Maya', 'Bikash', 'Anita', 'Suman', 'Priya', 'Rajesh', 'Sunita',
+               'Krishna', 'Laxmi', 'Binod', 'Sarita', 'Dipak', 'Asha', 'Nabin', 'Puja', 'Roshan', 'Kabita', 'Sanjay', 'Rita']
+# Most common first; with --name-skew the head of the list dominates, as real surnames do.
+LAST_NAMES = ['Shrestha', 'Sharma', 'Thapa', 'Gurung', 'Rai', 'Karki', 'Adhikari', 'Tamang', 'Magar', 'Khadka',
+              'Basnet', 'Poudel', 'Bhandari', 'Maharjan', 'Limbu', 'KC', 'Joshi', 'Pandey', 'Bista', 'Lama']
+ID_TYPES = ['Citizenship', 'Passport', 'License', 'Staff ID', 'Voter ID']
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'times.com.np']
+REASONS = ['Meeting', 'Delivery', 'Interview', 'Maintenance', 'Site inspection', 'Vendor demo', 'Audit', 'Rack installation']
+REQUEST_SOURCES = ['Walk-in', 'Email', 'Phone', 'Ticket', 'Kiosk']
+COMPANIES = ['Times Global', 'Nepal Telecom', 'Ncell', 'WorldLink', 'Vianet', 'Subisu', 'CG Net', 'Classic Tech']
+DEVICES = ['Laptop', 'Router', 'Switch', 'Server', 'UPS', 'Patch panel', 'Fibre cable', 'Hard disk', 'Firewall']
+
+# --checkin-profile: how check-in times spread over the --days window.
+CHECKIN_PROFILES = ('business-hours', 'uniform')
+
+
+@contextmanager
+def historical_timestamps(*model_classes):
+    """Lets bulk_create write the created_at/updated_at it is given instead of auto_now(_add)'s "now"."""
+    fields = [field for model_class in model_classes for field in model_class._meta.concrete_fields
+              if isinstance(field, models.DateTimeField) and (field.auto_now or field.auto_now_add)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def zipf_weights(count, skew):
+    """Cumulative weights where rank r is drawn in proportion to 1 / r**skew (skew 0 is uniform)."""
+    total, cumulative = 0, []
+    for rank in range(1, count + 1):
+        total += 1 / rank ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+def parse_search_terms(values):
+    """['Paneru:0.001', ...] -> [('Paneru', 0.001), ...]"""
+    terms = []
+    for value in values:
+        term, _, share = value.partition(':')
+        try:
+            terms.append((term.strip(), float(share)))
+        except ValueError:
+            raise CommandError(f'--search-term takes TERM:SHARE, e.g. Paneru:0.001, not {value!r}.')
+    if sum(share for _, share in terms) > 1:
+        raise CommandError('--search-term shares add up to more than 1.')
+    return terms
+
+
+class Command(BaseCommand):
+    help = ("Fills the database with synthetic locations, visitors, tasks, gate passes and device storage entries "
+            "(with items) for load testing, plus an approved user authorized for every seeded location. "
+            "Rows are written with bulk_create and counts are targets: running it again only tops them up. "
+            "Run it against an idle database; daily stats are rebuilt at the end.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--visitors', type=int, default=5_000_000)
+        parser.add_argument('--tasks', type=int, default=500_000)
+        parser.add_argument('--gate-passes', type=int, default=50_000)
+        parser.add_argument('--device-entries', type=int, default=50_000)
+        parser.add_argument('--max-items', type=int, default=5, help='Items per gate pass/device entry, 1 to this many.')
+        parser.add_argument('--location-prefix', default='Load Location')
+        parser.add_argument('--location-skew', type=float, default=1.0,
+                            help='Zipf exponent for how rows spread over locations (0 = evenly).')
+        # Check-in time distribution
+        parser.add_argument('--days', type=int, default=365, help='History covered, ending now.')
+        parser.add_argument('--checkin-profile', choices=CHECKIN_PROFILES, default='business-hours')
+        parser.add_argument('--peak-hour', type=float, default=11.0, help='business-hours: busiest local hour.')
+        parser.add_argument('--hour-spread', type=float, default=2.5, help='business-hours: standard deviation, in hours.')
+        parser.add_argument('--weekend-share', type=float, default=0.3,
+                            help="business-hours: a weekend day's traffic relative to a weekday's.")
+        parser.add_argument('--dwell-minutes', type=float, default=90, help='Mean visit length (exponential).')
+        # Search term distribution
+        parser.add_argument('--name-skew', type=float, default=1.1, help='Zipf exponent over the built-in surnames.')
+        parser.add_argument('--search-term', action='append', default=None, metavar='TERM:SHARE',
+                            help='Plant TERM as the surname of SHARE of the visitors, for searches of known '
+                                 'selectivity (repeatable; default Paneru:0.0005).')
+        # Load-test login
+        parser.add_argument('--user-email', default='loadtest@example.com')
+        parser.add_argument('--user-password', default='loadtest-password')
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for repeatable data.')
+        parser.add_argument('--skip-rollups', action='store_true', help="Don't rebuild daily stats afterwards.")
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['batch_size'] < 1 or options['max_items'] < 1:
+            raise CommandError('--days, --batch-size and --max-items must be at least 1.')
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+        self.options = options
+        self.now = timezone.now()
+        self.zone = timezone.get_current_timezone()
+        self.today = timezone.localdate(self.now, self.zone)
+        self.search_terms = parse_search_terms(options['search_term'] or ['Paneru:0.0005'])
+
+        self.locations = self.seed_locations()
+        self.location_weights = zipf_weights(len(self.locations), options['location_skew'])
+        self.surname_weights = zipf_weights(len(LAST_NAMES), options['name_skew'])
+        self.seed_user()
+
+        location_ids = [location.pk for location in self.locations]
+        with historical_timestamps(Visitor, Task, GatePass, DeviceStorageEntry):
+            self.fill('visitors', Visitor, options['visitors'], location_ids, self.visitors)
+            self.fill('tasks', Task, options['tasks'], location_ids, self.tasks)
+            self.fill('gate passes', GatePass, options['gate_passes'], location_ids, self.gate_passes)
+            self.fill('device storage entries', DeviceStorageEntry, options['device_entries'], location_ids, self.device_entries)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE') # Fresh statistics, so load tests see production-like plans
+        if not options['skip_rollups']:
+            call_command('rebuild_daily_stats', stdout=self.stdout)
+
+    def seed_locations(self):
+        count, prefix = self.options['locations'], self.options['location_prefix']
+        width = len(str(count))
+        names = [f'{prefix} {i:0{width}d}' for i in range(1, count + 1)]
+        existing = set(Location.objects.filter(name__in=names).values_list('name', flat=True))
+        Location.objects.bulk_create([Location(name=name, description=f'Synthetic data for load tests ({name})')
+                                      for name in names if name not in existing])
+        return list(Location.objects.filter(name__in=names).order_by('name'))
+
+    def seed_user(self):
+        email = self.options['user_email']
+        user = User.objects.filter(email=email).first() or User(username=email, email=email, first_name='Load', last_name='Test')
+        user.is_approved_by_admin = True
+        user.set_password(self.options['user_password'])
+        user.save()
+        user.authorized_locations.add(*self.locations) # Bumps authz_version, so cached authorization is refreshed
+        self.stdout.write(f'Load-test login: {email} / {self.options["user_password"]} ({len(self.locations)} locations)')
+
+    def fill(self, label, model_class, target, location_ids, build):
+        """Creates rows with build(count) in batches until `target` rows exist at the seeded locations."""
+        missing = target - model_class.objects.filter(location_id__in=location_ids).count()
+        if missing <= 0:
+            return
+        self.stdout.write(f'Seeding {missing:,} {label}...')
+        started, done = time.monotonic(), 0
+        while done < missing:
+            count = min(self.options['batch_size'], missing - done)
+            build(count)
+            done += count
+            if done % (self.options['batch_size'] * 20) < count or done == missing:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'  {done:,}/{missing:,} {label} ({done / elapsed:,.0f} rows/s)')
+
+    def pick_locations(self, count):
+        return random.choices(self.locations, cum_weights=self.location_weights, k=count)
+
+    def check_in_time(self):
+        options = self.options
+        if options['checkin_profile'] == 'uniform':
+            return self.now - timedelta(seconds=random.uniform(0, options['days'] * 86400))
+        while True:
+            day = self.today - timedelta(days=random.randrange(options['days']))
+            if day.weekday() >= 5 and random.random() > options['weekend_share']:
+                continue
+            hour = min(max(random.gauss(options['peak_hour'], options['hour_spread']), 0), 23.999)
+            moment = timezone.make_aware(datetime(day.year, day.month, day.day), self.zone) + timedelta(hours=hour)
+            if moment <= self.now: # Later today hasn't happened yet
+                return moment
+
+    def person(self):
+        first = random.choice(FIRST_NAMES)
+        roll, last = random.random(), None
+        for term, share in self.search_terms:
+            if roll < share:
+                last = term
+                break
+            roll -= share
+        if last is None:
+            last = random.choices(LAST_NAMES, cum_weights=self.surname_weights)[0]
+        return first, last
+
+    def staff(self, location):
+        # A handful of desk staff per location, so created_by_* searches have realistic selectivity
+        number = random.randrange(4)
+        return f'{location.name} Desk {number}', f'desk{number}.{location.pk}@example.com'
+
+    def visitors(self, count):
+        mean_dwell = self.options['dwell_minutes']
+        rows = []
+        for location in self.pick_locations(count):
+            first, last = self.person()
+            check_in = self.check_in_time()
+            check_out = check_in + timedelta(minutes=5 + random.expovariate(1 / mean_dwell))
+            if check_out > self.now:
+                check_out = None # Still on site
+            staff_name, staff_email = self.staff(location)
+            rows.append(Visitor(
+                location=location, fullName=f'{first} {last}',
+                idNumberType=f'{random.choice(ID_TYPES)} {random.randint(100000, 9999999)}',
+                contact=f'98{random.randint(10000000, 99999999)}',
+                email=f'{first.lower()}.{last.lower()}{random.randint(1, 9999)}@{random.choice(EMAIL_DOMAINS)}',
+                reason=random.choice(REASONS), approvedBy=f'{random.choice(FIRST_NAMES)} {LAST_NAMES[0]}',
+                requestedBy=random.choice(COMPANIES), requestSource=random.choice(REQUEST_SOURCES),
+                checkInTime=check_in, checkOutTime=check_out,
+                created_by_name=staff_name, created_by_email=staff_email,
+                created_at=check_in, updated_at=check_out or check_in,
+            ))
+        Visitor.objects.bulk_create(rows)
+
+    def tasks(self, count):
+        locations = self.pick_locations(count)
+        location_ids = {location.pk for location in locations}
+        # Continue each location's job numbers as TaskJobSequence would have allocated them.
+        last_numbers = dict(TaskJobSequence.objects.filter(location_id__in=location_ids).values_list('location_id', 'last_value'))
+        for location_id, last in (Task.objects.filter(location_id__in=location_ids).values_list('location_id')
+                                  .annotate(last=Max('job_number')).order_by()):
+            last_numbers[location_id] = max(last_numbers.get(location_id) or 0, last or 0)
+        rows = []
+        for location in locations:
+            number = (last_numbers.get(location.pk) or 0) + 1
+            last_numbers[location.pk] = number
+            created = self.check_in_time()
+            completed = created + timedelta(hours=random.expovariate(1 / 24))
+            is_completed = completed <= self.now and random.random() < 0.85
+            staff_name, staff_email = self.staff(location)
+            rows.append(Task(
+                location=location, job_number=number, job_id=str(number),
+                job_date=timezone.localdate(created, self.zone), job_title=f'{random.choice(REASONS)} for {random.choice(COMPANIES)}',
+                full_name=' '.join(self.person()), company_name=random.choice(COMPANIES),
+                company_location='Kathmandu', rack_number=f'R{random.randint(1, 60):02d}',
+                job_description=f'{random.choice(DEVICES)} work on rack', contact=f'98{random.randint(10000000, 99999999)}',
+                encoded_by=staff_name, is_completed=is_completed, completed_at=completed if is_completed else None,
+                created_by_name=staff_name, created_by_email=staff_email,
+                created_at=created, updated_at=completed if is_completed else created,
+            ))
+        Task.objects.bulk_create(rows)
+        for location_id, number in last_numbers.items():
+            TaskJobSequence.objects.update_or_create(location_id=location_id, defaults={'last_value': number})
+
+    def gate_passes(self, count):
+        passes = []
+        for location in self.pick_locations(count):
+            created = self.check_in_time()
+            staff_name, staff_email = self.staff(location)
+            passes.append(GatePass(
+                location=location, recipient_name=' '.join(self.person()), recipient_address='Kathmandu',
+                prepared_by=staff_name, received_by=random.choice(COMPANIES), approved_by=f'{random.choice(FIRST_NAMES)} {LAST_NAMES[0]}',
+                pass_date=timezone.localdate(created, self.zone), created_by_name=staff_name, created_by_email=staff_email,
+                created_at=created, updated_at=created,
+            ))
+        passes = GatePass.objects.bulk_create(passes)
+        GatePassItem.objects.bulk_create([
+            GatePassItem(gate_pass=gate_pass, sno=str(number), itemName=random.choice(DEVICES),
+                         description='Returned after repair', quantity=str(random.randint(1, 4)))
+            for gate_pass in passes for number in range(1, random.randint(1, self.options['max_items']) + 1)
+        ], batch_size=self.options['batch_size'])
+
+    def device_entries(self, count):
+        entries = []
+        for location in self.pick_locations(count):
+            created = self.check_in_time()
+            first, last = self.person()
+            staff_name, staff_email = self.staff(location)
+            entries.append(DeviceStorageEntry(
+                location=location, date=timezone.localdate(created, self.zone), submitter_name=f'{first} {last}',
+                submitter_company_name=random.choice(COMPANIES), submitter_contact=f'98{random.randint(10000000, 99999999)}',
+                submitter_signature=f'{first} {last}', prepared_by_signature=staff_name,
+                created_by_name=staff_name, created_by_email=staff_email, created_at=created, updated_at=created,
+            ))
+        entries = DeviceStorageEntry.objects.bulk_create(entries)
+        DeviceStorageItem.objects.bulk_create([
+            DeviceStorageItem(entry=entry, sno=str(number), quantity=str(random.randint(1, 4)),
+                              description=random.choice(DEVICES), rackNo=f'R{random.randint(1, 60):02d}')
+            for entry in entries for number in range(1, random.randint(1, self.options['max_items']) + 1)
+        ], batch_size=self.options['batch_size'])
\ No newline at end of file
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms_module', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='devicestorageitem',
+            options={'ordering': ['position', 'id'], 'verbose_name': 'Device Storage Item', 'verbose_name_plural': 'Device Storage Items'},
+        ),
+        migrations.AlterModelOptions(
+            name='gatepassitem',
+            options={'ordering': ['position', 'id'], 'verbose_name': 'Gate Pass Item', 'verbose_name_plural': 'Gate Pass Items'},
+        ),
+        migrations.AddField(
+            model_name='devicestorageitem',
+            name='position',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Index in the submitted items list.'),
+        ),
+        migrations.AddField(
+            model_name='gatepassitem',
+            name='position',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Index in the submitted items list.'),
+        ),
+    ]
@@ -47,6 +47,7 @@ class DeviceStorageItem(models.Model):
     description = models.CharField(max_length=500, verbose_name="Item Description")
     rackNo = models.CharField(max_length=100, blank=True, null=True, verbose_name="Rack No.")
     remarks = models.TextField(blank=True, null=True)
+    position = models.PositiveIntegerField(default=0, editable=False, help_text="Index in the submitted items list.")
 
     def __str__(self):
         return f"{self.description} (Qty: {self.quantity})"
@@ -54,6 +55,7 @@ class DeviceStorageItem(models.Model):
     class Meta:
         verbose_name = "Device Storage Item"
         verbose_name_plural = "Device Storage Items"
+        ordering = ['position', 'id']
 
 
 class GatePass(models.Model):
@@ -98,10 +100,12 @@ class GatePassItem(models.Model):
     description = models.TextField(blank=True, null=True)
     quantity = models.CharField(max_length=50, verbose_name="Quantity") 
     remarks = models.TextField(blank=True, null=True)
+    position = models.PositiveIntegerField(default=0, editable=False, help_text="Index in the submitted items list.")
 
     def __str__(self):
         return f"{self.itemName} (Qty: {self.quantity})"
 
     class Meta:
         verbose_name = "Gate Pass Item"
-        verbose_name_plural = "Gate Pass Items"
\ No newline at end of file
+        verbose_name_plural = "Gate Pass Items"
+        ordering = ['position', 'id']
\ No newline at end of file
@@ -0,0 +1,118 @@
+from django.core.paginator import InvalidPage
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class OptionalCountPageNumberPagination(PageNumberPagination):
+    """
+    The project-wide page number pagination, with a `?count=false` switch.
+    When the total count is skipped, one extra row is fetched to find out whether
+    a next page exists, so no COUNT(*) query is issued. `count` is then null.
+    """
+    count_query_param = 'count'
+
+    def skip_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('false', '0', 'no')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.counting = not self.skip_count(request)
+        known_count = getattr(view, 'known_count', None) # Set by views that already counted the rows
+        if self.counting and known_count is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        if self.counting:
+            return list(self._counted_page(queryset, request, page_size, known_count))
+        window = self._uncounted_window(queryset, request, page_size)
+        return self._uncounted_page(list(window), request, page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views: the same pages and links, queried with the async ORM."""
+        self.counting = not self.skip_count(request)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        if not self.counting:
+            window = self._uncounted_window(queryset, request, page_size)
+            return self._uncounted_page([row async for row in window], request, page_size)
+
+        known_count = getattr(view, 'known_count', None)
+        page = self._counted_page(queryset, request, page_size, await queryset.acount() if known_count is None else known_count)
+        page.object_list = [row async for row in page.object_list]
+        return list(page)
+
+    def _counted_page(self, queryset, request, page_size, count):
+        """PageNumberPagination's page, with the row count supplied instead of queried."""
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = count # Primes the cached count so page() doesn't query
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return self.page
+
+    def _uncounted_window(self, queryset, request, page_size):
+        """The rows of the requested page plus one, which tells whether a next page exists."""
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+            if self.page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(page_number=request.query_params.get(self.page_query_param), message='Invalid page.'))
+        offset = (self.page_number - 1) * page_size
+        return queryset[offset:offset + page_size + 1]
+
+    def _uncounted_page(self, rows, request, page_size):
+        if not rows and self.page_number != 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.page_number, message='That page contains no results'))
+        self.has_next = len(rows) > page_size
+        self.request = request
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.counting:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if self.counting:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.counting:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class LocationScopedCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the large location-scoped lists (opt in with `?pagination=cursor`).
+    The ordering comes from the view's `cursor_ordering`, which must be backed by a
+    (location, ..., id) composite index on the model so each page is an index range scan.
+    """
+    def get_ordering(self, request, queryset, view):
+        cursor_ordering = getattr(view, 'cursor_ordering', None)
+        if cursor_ordering:
+            return tuple(cursor_ordering)
+        return super().get_ordering(request, queryset, view)
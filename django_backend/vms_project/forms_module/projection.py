@@ -0,0 +1,121 @@
+"""
+Read-only list rows built from queryset.values() instead of model instances.
+
+Serializing a page through a ModelSerializer builds a model instance per row (running its
+post_init receivers), then resolves every field's source with getattr and calls its
+to_representation(). Past a hundred or so rows per page that is most of the request.
+
+A ValuesProjection is compiled from a serializer's bound fields once per response. Each
+field becomes (output name, values() key, converter), where the converter is the field's own
+to_representation(), or nothing at all when that would hand the database value back unchanged
+(text, integers, booleans, foreign key ids, datetimes with DATETIME_FORMAT = None). Rows then
+go straight from values() dicts to output dicts with the serializer's keys, in its order, so
+the rendered JSON is the same byte for byte.
+
+compile() returns None for serializers it can't reproduce from columns: SerializerMethodFields
+and other source='*' fields, dotted sources, to-many relations, or a serializer that overrides
+to_representation(). Views then serialize model instances as before.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+# Serializer field types whose to_representation() returns a value of the matching column unchanged.
+PASSTHROUGH_FIELDS = (
+    (serializers.CharField, (models.CharField, models.TextField)),
+    (serializers.IntegerField, (models.IntegerField,)),
+    (serializers.BooleanField, (models.BooleanField,)),
+)
+
+
+def _own_method(field, base, name):
+    """Whether `field` uses `base`'s implementation of `name` (a subclass may format differently)."""
+    return getattr(type(field), name) is getattr(base, name)
+
+
+def _passes_through(field, model_field):
+    for field_class, model_field_classes in PASSTHROUGH_FIELDS:
+        if isinstance(field, field_class) and _own_method(field, field_class, 'to_representation'):
+            return isinstance(model_field, model_field_classes)
+    if isinstance(field, serializers.DateTimeField) and _own_method(field, serializers.DateTimeField, 'to_representation'):
+        return getattr(field, 'format', api_settings.DATETIME_FORMAT) is None
+    return False
+
+
+def _related_converter(field, model_field):
+    """Builds the related instance from its `<fk>__<column>` values and serializes it with the nested serializer."""
+    related_model = model_field.related_model
+    lookups = [f'{model_field.name}__{column.name}' for column in related_model._meta.concrete_fields]
+    attnames = [column.attname for column in related_model._meta.concrete_fields]
+
+    def convert(row):
+        return field.to_representation(related_model.from_db(None, attnames, [row[lookup] for lookup in lookups]))
+    return lookups, convert
+
+
+class ValuesProjection:
+    def __init__(self, columns, entries):
+        self.columns = columns
+        self.entries = entries # [(output name, values() key, converter or None, converter takes the whole row)]
+
+    @classmethod
+    def compile(cls, serializer, extra_columns=()):
+        """
+        The projection of `serializer` (a single, bound ModelSerializer) or None. `extra_columns`
+        are loaded too, for the view's own use of the rows (e.g. cursor positions).
+        """
+        if not _own_method(serializer, serializers.Serializer, 'to_representation'):
+            return None
+        opts = serializer.Meta.model._meta
+        columns, entries = list(extra_columns), []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or '.' in field.source:
+                return None
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None # To-many relations
+            key = model_field.attname
+            if model_field.is_relation and field.source == model_field.name:
+                # The instance attribute is the related object; only these two fields are known to need no more than its id.
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                    entries.append((name, key, None, False))
+                elif isinstance(field, serializers.ModelSerializer):
+                    lookups, convert = _related_converter(field, model_field)
+                    columns.extend(lookups)
+                    entries.append((name, key, convert, True))
+                else:
+                    return None
+            elif not _own_method(field, serializers.Field, 'get_attribute'):
+                return None
+            elif isinstance(model_field, models.FileField):
+                # values() gives the stored name; the instance attribute is a FieldFile wrapping it.
+                entries.append((name, key, lambda value, field=field, model_field=model_field:
+                                field.to_representation(model_field.attr_class(None, model_field, value)), False))
+            else:
+                entries.append((name, key, None if _passes_through(field, model_field) else field.to_representation, False))
+            columns.append(key)
+        return cls(list(dict.fromkeys(columns)), entries)
+
+    def values(self, queryset):
+        """`queryset` as the values() rows represent() expects."""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def represent(self, rows):
+        """The serializer's output (many=True) for these values() rows."""
+        entries = self.entries
+        data = []
+        for row in rows:
+            item = {}
+            for name, key, convert, whole_row in entries:
+                value = row[key]
+                if value is not None and convert is not None:
+                    value = convert(row if whole_row else value)
+                item[name] = value
+            data.append(item)
+        return data
@@ -1,9 +1,57 @@
 from rest_framework import serializers
 from .models import DeviceStorageEntry, DeviceStorageItem, GatePass, GatePassItem
-from locations.models import Location 
-from locations.serializers import LocationSerializer 
+from locations.serializers import RegisteredLocationField, RegisteredLocationPrimaryKeyField
+from .fieldsets import SparseFieldsetSerializerMixin, collapsed_id, collapsed_ids
 from datetime import date, datetime 
 from django.utils import timezone 
+from django.db import transaction
+
+
+def create_items(item_model, parent_field, parent, items_data):
+    """Inserts all nested items with a single bulk_create, numbered in the order given."""
+    item_model.objects.bulk_create([item_model(**{parent_field: parent}, **item_data, position=position)
+                                    for position, item_data in enumerate(items_data)])
+
+
+def sync_items(item_model, parent_field, parent, items_data):
+    """
+    Brings parent.items in line with items_data in a constant number of queries.
+    Items are matched on `sno`: unchanged rows are left alone, changed (or moved) rows go through
+    one bulk_update, new rows through one bulk_create and missing rows through one delete.
+    When sno can't be used as a key (blank or repeated), all items are replaced instead.
+    Call inside a transaction.
+    """
+    existing = list(parent.items.all())
+    incoming_snos = [item_data.get('sno') for item_data in items_data]
+    existing_snos = [item.sno for item in existing]
+    keyed = (all(incoming_snos) and len(set(incoming_snos)) == len(incoming_snos)
+             and all(existing_snos) and len(set(existing_snos)) == len(existing_snos))
+    if not keyed:
+        parent.items.all().delete()
+        create_items(item_model, parent_field, parent, items_data)
+        return
+
+    existing_by_sno = {item.sno: item for item in existing}
+    to_create, to_update, update_fields = [], [], set()
+    for position, item_data in enumerate(items_data):
+        item_data = {**item_data, 'position': position}
+        item = existing_by_sno.pop(item_data['sno'], None)
+        if item is None:
+            to_create.append(item_model(**{parent_field: parent}, **item_data))
+            continue
+        changed = [field for field, value in item_data.items() if getattr(item, field) != value]
+        if changed:
+            for field in changed:
+                setattr(item, field, item_data[field])
+            update_fields.update(changed)
+            to_update.append(item)
+
+    if existing_by_sno:
+        item_model.objects.filter(pk__in=[item.pk for item in existing_by_sno.values()]).delete()
+    if to_update:
+        item_model.objects.bulk_update(to_update, sorted(update_fields))
+    if to_create:
+        item_model.objects.bulk_create(to_create)
 
 
 # Device Storage Serializers
@@ -12,12 +60,11 @@ class DeviceStorageItemSerializer(serializers.ModelSerializer):
         model = DeviceStorageItem
         fields = ['sno', 'quantity', 'description', 'rackNo', 'remarks']
 
-class DeviceStorageEntrySerializer(serializers.ModelSerializer):
+class DeviceStorageEntrySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {'location': collapsed_id('location_id'), 'items': collapsed_ids()}
     items = DeviceStorageItemSerializer(many=True)
-    location = LocationSerializer(read_only=True)
-    location_id = serializers.PrimaryKeyRelatedField(
-        queryset=Location.objects.all(), source='location', write_only=True
-    )
+    location = RegisteredLocationField() # From the in-memory location registry, no join
+    location_id = RegisteredLocationPrimaryKeyField(source='location', write_only=True)
     date = serializers.DateField(format="%Y-%m-%d", input_formats=['%Y-%m-%d', 'iso-8601'])
 
     class Meta:
@@ -31,17 +78,19 @@ class DeviceStorageEntrySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ('id', 'created_by_name', 'created_by_email', 'created_at', 'updated_at') 
 
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items')
         entry = DeviceStorageEntry.objects.create(**validated_data)
-        for item_data in items_data:
-            DeviceStorageItem.objects.create(entry=entry, **item_data)
+        create_items(DeviceStorageItem, 'entry', entry, items_data)
         return entry
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         items_data = validated_data.pop('items', None)
         
-        instance.location = validated_data.get('location', instance.location)
+        if 'location' in validated_data: # .get()'s default would load the current location
+            instance.location = validated_data['location']
         instance.company_name = validated_data.get('company_name', instance.company_name)
         instance.date = validated_data.get('date', instance.date)
         instance.office_address = validated_data.get('office_address', instance.office_address)
@@ -55,9 +104,7 @@ class DeviceStorageEntrySerializer(serializers.ModelSerializer):
         instance.save()
 
         if items_data is not None:
-            instance.items.all().delete() 
-            for item_data in items_data:
-                DeviceStorageItem.objects.create(entry=instance, **item_data)
+            sync_items(DeviceStorageItem, 'entry', instance, items_data)
         
         return instance
 
@@ -68,12 +115,11 @@ class GatePassItemSerializer(serializers.ModelSerializer):
         model = GatePassItem
         fields = ['sno', 'itemName', 'description', 'quantity', 'remarks']
 
-class GatePassSerializer(serializers.ModelSerializer):
+class GatePassSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {'location': collapsed_id('location_id'), 'items': collapsed_ids()}
     items = GatePassItemSerializer(many=True)
-    location = LocationSerializer(read_only=True)
-    location_id = serializers.PrimaryKeyRelatedField(
-        queryset=Location.objects.all(), source='location', write_only=True
-    )
+    location = RegisteredLocationField() # From the in-memory location registry, no join
+    location_id = RegisteredLocationPrimaryKeyField(source='location', write_only=True)
     pass_date = serializers.DateField(format="%Y-%m-%d", input_formats=['%Y-%m-%d', 'iso-8601'])
 
     class Meta:
@@ -89,25 +135,27 @@ class GatePassSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        if hasattr(instance, 'pass_date') and instance.pass_date:
+        if 'pass_date' in representation and instance.pass_date: # Not when left out with ?fields=/?omit=
             if isinstance(instance.pass_date, datetime): 
                 representation['pass_date'] = instance.pass_date.date().isoformat()
             elif isinstance(instance.pass_date, date):
                 representation['pass_date'] = instance.pass_date.isoformat()
         return representation
 
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items')
         gate_pass = GatePass.objects.create(**validated_data)
         print(f"DEBUG (Serializer Create): Gate pass ID {gate_pass.id}, pass_date type: {type(gate_pass.pass_date)}, value: {gate_pass.pass_date}")
-        for item_data in items_data:
-            GatePassItem.objects.create(gate_pass=gate_pass, **item_data)
+        create_items(GatePassItem, 'gate_pass', gate_pass, items_data)
         return gate_pass
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         items_data = validated_data.pop('items', None)
         
-        instance.location = validated_data.get('location', instance.location) 
+        if 'location' in validated_data: # .get()'s default would load the current location
+            instance.location = validated_data['location']
         instance.recipient_name = validated_data.get('recipient_name', instance.recipient_name)
         instance.recipient_address = validated_data.get('recipient_address', instance.recipient_address)
         instance.prepared_by = validated_data.get('prepared_by', instance.prepared_by)
@@ -117,8 +165,6 @@ class GatePassSerializer(serializers.ModelSerializer):
         instance.save()
 
         if items_data is not None:
-            instance.items.all().delete() 
-            for item_data in items_data:
-                GatePassItem.objects.create(gate_pass=instance, **item_data)
+            sync_items(GatePassItem, 'gate_pass', instance, items_data)
         
         return instance
\ No newline at end of file
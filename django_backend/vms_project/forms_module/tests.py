@@ -0,0 +1,266 @@
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from PIL import Image
+from rest_framework_simplejwt.tokens import AccessToken
+
+from images.derivatives import generate_derivatives
+from images.models import StoredImage
+from locations.models import Location
+from locations.registry import location_registry
+from task_management.models import Task
+from task_management.views import TaskViewSet
+from users.models import User
+from visitors.models import Visitor
+from visitors.views import VisitorViewSet
+from .async_views import stream_async
+from .models import DeviceStorageEntry, DeviceStorageItem, GatePass, GatePassItem
+from .projection import ValuesProjection
+
+
+class LocationScopedAPITestCase(TestCase):
+    """An approved user authorized for one location, calling the API with a JWT as the frontend does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.location = Location.objects.create(name='Test Data Center')
+        cls.user = User.objects.create_user(username='desk@example.com', email='desk@example.com',
+                                            password='desk-password', is_approved_by_admin=True)
+        cls.user.authorized_locations.add(cls.location)
+        # bulk_create skips StoredImage.save(), which would read the (absent) file
+        cls.photo = StoredImage.objects.bulk_create([StoredImage(fullName='Test Visitor', imageFile='stored_images/test.jpg')])[0]
+
+    def setUp(self):
+        # Both outlive a test's transaction, and row ids can be reused after its rollback.
+        cache.clear()
+        location_registry.invalidate()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def use_temporary_media(self):
+        """Points MEDIA_ROOT at a directory removed after the test, with a real JPEG as self.photo's file."""
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        os.makedirs(os.path.join(media_root.name, 'stored_images'))
+        Image.new('RGB', (320, 240), 'teal').save(os.path.join(media_root.name, 'stored_images', 'visitor.jpg'))
+        StoredImage.objects.filter(pk=self.photo.pk).update(imageFile='stored_images/visitor.jpg')
+        self.photo.refresh_from_db()
+
+    def create_visitors(self, count, **fields):
+        now = timezone.now()
+        return Visitor.objects.bulk_create([
+            Visitor(location=self.location, fullName=f'Visitor {i}', contact=f'98000000{i:02d}', reason='Meeting',
+                    photo=self.photo if i % 2 else None, checkInTime=now - timedelta(minutes=i),
+                    checkOutTime=now - timedelta(minutes=i) + timedelta(seconds=30) if i % 3 else None, **fields)
+            for i in range(count)
+        ])
+
+    def create_tasks(self, count):
+        now, start = timezone.now(), Task.objects.filter(location=self.location).count()
+        return Task.objects.bulk_create([
+            Task(location=self.location, job_number=start + i + 1, job_id=str(start + i + 1), job_date=now.date(), job_title=f'Task {i}',
+                 full_name='Engineer', company_name='Times Global', rack_number=f'R{i}', encoded_by='Desk',
+                 is_completed=bool(i % 2), completed_at=now - timedelta(hours=i) if i % 2 else None)
+            for i in range(count)
+        ])
+
+    def create_gate_passes(self, count):
+        passes = GatePass.objects.bulk_create([
+            GatePass(location=self.location, recipient_name=f'Recipient {i}', prepared_by='Desk', approved_by='Manager',
+                     pass_date=timezone.localdate() - timedelta(days=i))
+            for i in range(count)
+        ])
+        GatePassItem.objects.bulk_create([GatePassItem(gate_pass=gate_pass, sno=str(sno), itemName='Router', quantity='1')
+                                          for gate_pass in passes for sno in (1, 2)])
+        return passes
+
+    def create_device_entries(self, count):
+        entries = DeviceStorageEntry.objects.bulk_create([
+            DeviceStorageEntry(location=self.location, date=timezone.localdate() - timedelta(days=i),
+                               submitter_name=f'Submitter {i}', submitter_signature='Submitter', prepared_by_signature='Desk')
+            for i in range(count)
+        ])
+        DeviceStorageItem.objects.bulk_create([DeviceStorageItem(entry=entry, sno=str(sno), description='Laptop', quantity='1')
+                                               for entry in entries for sno in (1, 2)])
+        return entries
+
+
+class QueryBudgetTests(LocationScopedAPITestCase):
+    """
+    List pages cost a fixed number of queries however many rows they hold: the user (JWT
+    authentication), the validators' Count/Max aggregate (which doubles as the page count;
+    the unvalidated report counts instead), the page itself, and one prefetch per nested
+    to-many relation. Details load their nested rows the same way. Authorization and
+    locations come from their caches, which the first request of each test fills.
+    """
+    ROWS = api_settings.PAGE_SIZE * 2 # More than a full page
+
+    def assertListQueries(self, url, create, queries):
+        create(1)
+        self.assertEqual(self.client.get(url).status_code, 200) # Warms the authorization cache and location registry
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()['results']), 1)
+
+        create(self.ROWS - 1)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()['results']), api_settings.PAGE_SIZE)
+
+    def test_visitors(self):
+        self.assertListQueries('/api/visitors/', self.create_visitors, 3)
+
+    def test_visitor_report(self):
+        today = timezone.localdate()
+        url = f'/api/visitors/report/?start_date={today - timedelta(days=1)}&end_date={today}'
+        self.assertListQueries(url, self.create_visitors, 3) # Not validated, so its paginator counts instead
+
+    def test_tasks(self):
+        self.assertListQueries('/api/task-management/tasks/', self.create_tasks, 3)
+
+    def test_gate_passes(self):
+        self.assertListQueries('/api/gate-passes/', self.create_gate_passes, 4)
+
+    def test_device_storage_entries(self):
+        self.assertListQueries('/api/device-storage/', self.create_device_entries, 4)
+
+    def test_visitor_detail(self):
+        visitor = self.create_visitors(2)[1] # With a photo, which is nested
+        url = f'/api/visitors/{visitor.pk}/'
+        self.client.get(url)
+        with self.assertNumQueries(2): # The user, and the visitor joined to its photo
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_gate_pass_detail(self):
+        url = f'/api/gate-passes/{self.create_gate_passes(1)[0].pk}/'
+        self.client.get(url)
+        with self.assertNumQueries(3): # The user, the gate pass and its items
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class ConditionalGetTests(LocationScopedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+
+    def assertChangedBy(self, url, change):
+        """Checks that `change` invalidates the ETag of `url`, and returns the revalidated response."""
+        response = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        change()
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertNotEqual(revalidated.content, response.content)
+        return revalidated
+
+    def test_thumbnails_change_visitor_list_and_detail(self):
+        visitor = self.create_visitors(2)[1] # With the photo
+        for url in ('/api/visitors/', f'/api/visitors/{visitor.pk}/'):
+            StoredImage.objects.filter(pk=self.photo.pk).update(derivatives={})
+            response = self.assertChangedBy(url, lambda: generate_derivatives(self.photo.pk))
+            self.assertIn('.webp', response.content.decode())
+
+
+class ValuesProjectionParityTests(LocationScopedAPITestCase):
+    """Pages built from values() rows (values_actions) are byte for byte the serializers' pages."""
+    VISITOR_QUERIES = [
+        '', '?page=2', '?search=Visitor 1', '?fields=id,fullName,checkInTime,location',
+        '?fields=id,fullName,photo&expand=photo,location', '?omit=reason,photo', '?expand=photo',
+    ]
+    TASK_QUERIES = ['', '?page=2', '?fields=id,job_id,is_completed,completed_at,location', '?omit=job_description']
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Half of the visitors nest this photo, thumbnails and all
+        StoredImage.objects.filter(pk=cls.photo.pk).update(derivatives={
+            '64': {'path': 'stored_images/derivatives/1/64.webp', 'width': 64, 'height': 48, 'bytes': 2048},
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.create_visitors(api_settings.PAGE_SIZE * 2 + 5)
+        self.create_tasks(api_settings.PAGE_SIZE * 2 + 5)
+
+    def assertSameResponse(self, viewset_class, url):
+        """GETs `url` with and without viewset_class.values_actions and compares the bodies; returns the first response."""
+        with mock.patch.object(ValuesProjection, 'represent', autospec=True, side_effect=ValuesProjection.represent) as represent:
+            projected = self.client.get(url)
+        self.assertEqual(projected.status_code, 200, url)
+        self.assertTrue(represent.called, f'{url} was not served from values() rows')
+        with mock.patch.object(viewset_class, 'values_actions', ()):
+            serialized = self.client.get(url)
+        self.assertEqual(projected.content, serialized.content, url)
+        return projected
+
+    def test_visitor_list(self):
+        for query in self.VISITOR_QUERIES:
+            self.assertSameResponse(VisitorViewSet, f'/api/visitors/{query}')
+
+    def test_visitor_report(self):
+        today = timezone.localdate()
+        for query in ('', '&page=2', '&fields=id,fullName,photo&expand=photo'):
+            self.assertSameResponse(VisitorViewSet, f'/api/visitors/report/?start_date={today - timedelta(days=1)}&end_date={today}{query}')
+
+    def test_task_list(self):
+        for query in self.TASK_QUERIES:
+            self.assertSameResponse(TaskViewSet, f'/api/task-management/tasks/{query}')
+
+    def test_cursor_pages(self):
+        for viewset_class, url in ((VisitorViewSet, '/api/visitors/?pagination=cursor'),
+                                   (TaskViewSet, '/api/task-management/tasks/?pagination=cursor')):
+            pages = 0
+            while url:
+                url = self.assertSameResponse(viewset_class, url).json()['next']
+                pages += 1
+            self.assertEqual(pages, 3, viewset_class.__name__)
+
+
+class StreamAsyncTests(SimpleTestCase):
+    async def test_sync_stream_is_sent_as_it_is_produced(self):
+        produced = []
+
+        def rows():
+            for i in range(3):
+                produced.append(i)
+                yield f'row {i}\n'
+        response = stream_async(StreamingHttpResponse(rows()))
+        self.assertTrue(response.is_async)
+        received = []
+        async for chunk in response: # As the ASGI handler reads it
+            received.append(chunk)
+            self.assertEqual(len(produced), len(received)) # Not read ahead into memory
+        self.assertEqual(b''.join(received), b'row 0\nrow 1\nrow 2\n')
+
+class ItemOrderTests(LocationScopedAPITestCase):
+    def assertKeepsSubmittedOrder(self, url, items):
+        for order in (items[::-1], items[1:] + items[:1], [items[1]]):
+            response = self.client.patch(url, {'items': order}, format='json')
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(response.json()['items'], order)
+            self.assertEqual(self.client.get(url).json()['items'], order)
+
+    def test_gate_pass_items(self):
+        url = f'/api/gate-passes/{self.create_gate_passes(1)[0].pk}/'
+        self.assertKeepsSubmittedOrder(url, [
+            {'sno': str(sno), 'itemName': f'Router {sno}', 'description': None, 'quantity': '1', 'remarks': None}
+            for sno in (1, 2, 3)
+        ])
+
+    def test_device_storage_items(self):
+        url = f'/api/device-storage/{self.create_device_entries(1)[0].pk}/'
+        self.assertKeepsSubmittedOrder(url, [
+            {'sno': str(sno), 'quantity': '1', 'description': f'Laptop {sno}', 'rackNo': None, 'remarks': None}
+            for sno in (1, 2, 3)
+        ])
\ No newline at end of file
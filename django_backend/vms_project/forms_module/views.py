@@ -1,35 +1,228 @@
+import hashlib
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from .models import DeviceStorageEntry, GatePass
 from .serializers import DeviceStorageEntrySerializer, GatePassSerializer
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django.core.exceptions import PermissionDenied
+from users.authorization import get_authorized_location_ids, authorized_locations_subquery
+from locations.models import Location
+from locations.registry import location_registry
+from locations.serializers import RegisteredLocationPrimaryKeyField
+from .fieldsets import Fieldset, SparseFieldsetSerializerMixin, trim_queryset
+from .pagination import LocationScopedCursorPagination, OptionalCountPageNumberPagination
+from .projection import ValuesProjection
 
 class BaseLocationScopedViewSet(viewsets.ModelViewSet):
+    """
+    Location-scoped CRUD. list and retrieve answer conditional GETs: responses carry an ETag
+    built from Max(updated_at) and the row count of the scoped, filtered queryset (plus the
+    same for `validator_related` and the location registry), and a matching If-None-Match
+    gets a 304 without fetching or serializing any rows. Details also carry Last-Modified for If-Modified-Since; lists
+    don't, because a deleted row changes their count but not their newest timestamp.
+    Lists that skip counting (?count=false, ?pagination=cursor) skip validation too.
+    """
     permission_classes = [IsAuthenticated]
+    # Ordering for opt-in keyset pagination of the list action (?pagination=cursor), e.g. ('-checkInTime', 'id').
+    # Subclasses that set it should back it with a matching (location, ...) composite index.
+    cursor_ordering = None
+    # Foreign keys nested in responses; their updated_at (and whether they are set) go into the validators.
+    # Locations are nested from locations.registry, whose version is always included.
+    validator_related = ()
+    # True when responses contain signed media URLs, which change every MEDIA_URL_TTL without a row changing.
+    signs_media_urls = False
+    # Read actions whose rows are built from queryset.values() instead of model instances (forms_module/projection.py).
+    values_actions = ()
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if (self.cursor_ordering and self.action == 'list'
+                    and self.request.query_params.get('pagination') == 'cursor'):
+                self._paginator = LocationScopedCursorPagination()
+            else:
+                return super().paginator
+        return self._paginator
 
     def get_queryset(self):
         user = self.request.user
         location_id_filter = self.request.query_params.get('location_id')
 
-        if not user.is_approved_by_admin:
-            return self.queryset.model.objects.none()
-
-        authorized_location_ids = user.authorized_locations.values_list('id', flat=True)
+        # Cached per user and keyed on user.authz_version, so this normally costs no query.
+        authorized_location_ids = get_authorized_location_ids(user)
         if not authorized_location_ids:
-            return self.queryset.model.objects.none() 
-
-        queryset = super().get_queryset().filter(location_id__in=authorized_location_ids)
+            return self.queryset.model.objects.none()
 
         if location_id_filter:
             try:
                 location_id_filter_int = int(location_id_filter)
                 if location_id_filter_int not in authorized_location_ids:
                     return self.queryset.model.objects.none()
-                return queryset.filter(location_id=location_id_filter_int)
+                return super().get_queryset().filter(location_id=location_id_filter_int)
             except ValueError:
                 return self.queryset.model.objects.none()
-        
-        return queryset
+
+        # Scope with a subquery on the user/location through table rather than an id list,
+        # so the filter is one index-friendly predicate that is never stale.
+        return super().get_queryset().filter(location_id__in=authorized_locations_subquery(user))
+
+    def get_fieldset(self):
+        """The request's ?fields=/?omit=/?expand= (see forms_module/fieldsets.py); reads only."""
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = Fieldset.from_request(self.request) if self.request.method in ('GET', 'HEAD') else None
+        return self._fieldset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'fieldset': self.get_fieldset()}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_fieldset() is None or not issubclass(self.get_serializer_class(), SparseFieldsetSerializerMixin):
+            return queryset
+        # Besides what the fields read: the location (registry lookups), and what validators and cursors use.
+        # (Lists aggregate validator_related in their own query; only retrieve reads it off the instance.)
+        keep = {'location', 'updated_at', *(name.lstrip('-') for name in self.cursor_ordering or ())}
+        if self.action == 'retrieve':
+            keep.update(self.validator_related)
+        return trim_queryset(queryset, self.get_serializer().fields, keep)
+
+    def validator_aggregates(self):
+        aggregates = {'count': Count('pk'), 'updated_at': Max('updated_at')}
+        for field in self.validator_related:
+            aggregates[f'{field}_count'] = Count(field)
+            aggregates[f'{field}_updated_at'] = Max(f'{field}__updated_at')
+        return aggregates
+
+    def instance_validator_values(self, instance):
+        """validator_aggregates() for a single loaded instance (related rows come from select_related)."""
+        values = {'count': 1, 'updated_at': instance.updated_at}
+        for field in self.validator_related:
+            related = getattr(instance, field)
+            values[f'{field}_count'] = int(related is not None)
+            values[f'{field}_updated_at'] = related.updated_at if related is not None else None
+        return values
+
+    def get_validators(self, values):
+        """(ETag, Last-Modified as a Unix timestamp or None) for the aggregate values of this request's rows."""
+        request = self.request
+        key = [self.queryset.model._meta.label, sorted(values.items()), request.build_absolute_uri(),
+               getattr(request, 'accepted_media_type', 'application/json'),
+               sorted(get_authorized_location_ids(request.user))]
+        location_count, locations_updated_at = location_registry.version()
+        key.append((location_count, locations_updated_at))
+        timestamps = [value for name, value in values.items() if name.endswith('updated_at') and value is not None]
+        if locations_updated_at is not None:
+            timestamps.append(locations_updated_at)
+        last_modified = max(timestamps) if timestamps else None
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp()) # HTTP dates have whole seconds
+        if self.signs_media_urls:
+            period = int(time.time()) // settings.MEDIA_URL_TTL
+            key.append(period)
+            if last_modified is not None:
+                last_modified = max(last_modified, period * settings.MEDIA_URL_TTL)
+        return 'W/"%s"' % hashlib.md5(repr(key).encode()).hexdigest(), last_modified
+
+    def conditional_response(self, etag, last_modified=None):
+        """A 304 if the request's If-None-Match/If-Modified-Since still match, else None."""
+        response = get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified=None):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Revalidate on every use, and never share a cached copy between users.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def counts_rows(self):
+        """Whether list responses count every matching row anyway, which makes validating them nearly free."""
+        paginator = self.paginator
+        if paginator is None:
+            return True
+        return isinstance(paginator, OptionalCountPageNumberPagination) and not paginator.skip_count(self.request)
+
+    def get_projection(self):
+        """A ValuesProjection of this action's serializer, or None to serialize model instances."""
+        if self.action not in self.values_actions or self.request.method not in ('GET', 'HEAD'):
+            return None
+        # Besides the rendered fields: location_id (the async views load the registry from it) and the cursor's fields.
+        extra_columns = ['location_id', *(name.lstrip('-') for name in self.cursor_ordering or ())]
+        return ValuesProjection.compile(self.get_serializer(), extra_columns)
+
+    def list_response(self, queryset):
+        """The page of `queryset` (or all of it, unpaginated) that list returns, serialized."""
+        projection = self.get_projection()
+        if projection is not None:
+            queryset = projection.values(queryset)
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        data = self.get_serializer(rows, many=True).data if projection is None else projection.represent(rows)
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.counts_rows():
+            return self.list_response(queryset)
+        values = queryset.order_by().aggregate(**self.validator_aggregates())
+        etag, _ = self.get_validators(values)
+        not_modified = self.conditional_response(etag)
+        if not_modified is not None:
+            return not_modified
+        self.known_count = values['count'] # Spares the paginator its COUNT query
+        return self.set_validators(self.list_response(queryset), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_validators(self.instance_validator_values(instance))
+        not_modified = self.conditional_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = Response(self.get_serializer(instance).data)
+        return self.set_validators(response, etag, last_modified)
+
+    def create(self, request, *args, **kwargs):
+        with self.location_must_exist():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with self.location_must_exist():
+            return super().update(request, *args, **kwargs)
+
+    @contextmanager
+    def location_must_exist(self):
+        """
+        Saves in a transaction of its own, so a deferred foreign key check fails in here, and
+        turns the IntegrityError of a location_id that the registry still held but another
+        process has deleted into the same 400 as an unknown location_id.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            field = RegisteredLocationPrimaryKeyField()
+            location_id = self.request.data.get('location_id')
+            try:
+                deleted = not Location.objects.filter(pk=int(location_id)).exists()
+            except (TypeError, ValueError):
+                deleted = False
+            if not deleted:
+                raise
+            location_registry.invalidate()
+            raise ValidationError({'location_id': [field.error_messages['does_not_exist'].format(pk_value=location_id)]})
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -41,8 +234,7 @@ class BaseLocationScopedViewSet(viewsets.ModelViewSet):
         if not location_instance:
              raise PermissionDenied("Location is required and was not provided correctly.") 
 
-        authorized_location_ids = user.authorized_locations.values_list('id', flat=True)
-        if location_instance.id not in authorized_location_ids:
+        if location_instance.id not in get_authorized_location_ids(user):
             raise PermissionDenied("User not authorized to create entries for this location.")
         
         user_full_name = user.get_full_name()
@@ -61,9 +253,10 @@ class BaseLocationScopedViewSet(viewsets.ModelViewSet):
         )
 
 class DeviceStorageEntryViewSet(BaseLocationScopedViewSet):
-    queryset = DeviceStorageEntry.objects.all().order_by('-date')
+    # Items are prefetched (and locations come from the registry) so list pages cost the same number of queries at any size.
+    queryset = DeviceStorageEntry.objects.prefetch_related('items').order_by('-date')
     serializer_class = DeviceStorageEntrySerializer
 
 class GatePassViewSet(BaseLocationScopedViewSet):
-    queryset = GatePass.objects.all().order_by('-pass_date')
+    queryset = GatePass.objects.prefetch_related('items').order_by('-pass_date')
     serializer_class = GatePassSerializer
\ No newline at end of file
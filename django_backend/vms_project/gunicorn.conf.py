@@ -0,0 +1,38 @@
+"""
+gunicorn settings, read automatically when gunicorn is started from this directory:
+
+    DJANGO_SETTINGS_MODULE=vms_project.settings_production gunicorn
+
+GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker serves vms_project.asgi (async reads,
+see forms_module/async_views.py) instead of threaded WSGI workers. Every setting can be
+overridden on the command line or with the GUNICORN_* variables below.
+"""
+import multiprocessing
+import os
+
+cpus = multiprocessing.cpu_count()
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+asgi = worker_class.startswith('uvicorn')
+wsgi_app = 'vms_project.asgi:application' if asgi else 'vms_project.wsgi:application'
+
+# Async workers multiplex requests on one event loop, so one per core is enough. Threaded WSGI
+# workers spend much of each request waiting on PostgreSQL; 2 x cores + 1 processes with a few
+# threads each keeps the cores busy. Each thread holds its own persistent database connection,
+# so workers x threads (per server) must fit under PostgreSQL's max_connections.
+workers = int(os.environ.get('GUNICORN_WORKERS', cpus if asgi else cpus * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+backlog = 2048
+keepalive = 5 # Seconds to hold idle client connections open; keep above the proxy's idle timeout
+timeout = 60 # Exports and batch uploads are the slowest requests
+graceful_timeout = 30
+
+# Recycle workers now and then so slow leaks can't accumulate; the jitter stops them restarting together.
+max_requests = 5000
+max_requests_jitter = 500
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
\ No newline at end of file
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.core.files.storage import default_storage
 from .models import StoredImage
 from django.utils.html import format_html
 
@@ -6,13 +7,15 @@ from django.utils.html import format_html
 class StoredImageAdmin(admin.ModelAdmin):
     list_display = ('fullName', 'idType', 'contact', 'email', 'image_preview', 'uploaded_at', 'updated_at') # Added contact and email
     list_filter = ('idType', 'uploaded_at')
-    search_fields = ('fullName', 'idType', 'contact', 'email') # Added contact and email
+    search_fields = ('fullName', 'idType', 'contact', 'email', 'idNumber') # Added contact and email
     readonly_fields = ('image_preview_large', 'uploaded_at', 'updated_at')
-    fields = ('fullName', 'contact', 'email', 'idType', 'imageFile', 'image_preview_large', 'uploaded_at', 'updated_at') # Added contact and email
+    fields = ('fullName', 'contact', 'email', 'idNumber', 'idType', 'imageFile', 'image_preview_large', 'uploaded_at', 'updated_at') # Added contact and email
 
     def image_preview(self, obj):
         if obj.imageFile:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.imageFile.url)
+            thumbnail = (obj.derivatives or {}).get('64') # Small WebP derivative when it has been generated
+            url = default_storage.url(thumbnail['path']) if thumbnail else obj.imageFile.url
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', url)
         return "No Image"
     image_preview.short_description = 'Image Preview'
 
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class ImagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'images'
-    verbose_name = "Image Gallery"
\ No newline at end of file
+    verbose_name = "Image Gallery"
+
+    def ready(self):
+        from . import signals # noqa: F401 -- queues thumbnail generation and keeps the similarity index current on upload
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Batch registration: many photos plus their metadata in one multipart request.
+
+The request carries the files as repeated `images` parts and a `metadata` part holding
+a JSON array with one {"fullName", "email", "contact", "idType"} object per file, in the
+same order. Each item is validated and its file stored on a small shared thread pool;
+the rows that pass are then inserted with a single bulk_create.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .models import StoredImage
+
+METADATA_FIELDS = ('fullName', 'email', 'contact', 'idType')
+
+# Shared by all requests, so concurrent batches can't multiply the number of threads.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='image-batch')
+
+
+def parse_batch(request):
+    """Returns (items, error): serializer input dicts for each file, or a message for a malformed request."""
+    files = request.FILES.getlist('images')
+    if not files:
+        return None, "Send the photos as one or more 'images' files."
+    if len(files) > settings.IMAGE_BATCH_MAX_FILES:
+        return None, f'At most {settings.IMAGE_BATCH_MAX_FILES} images can be uploaded per batch.'
+    try:
+        metadata = json.loads(request.data.get('metadata') or '[]')
+    except ValueError:
+        return None, "'metadata' must be a JSON array."
+    if not isinstance(metadata, list) or not all(isinstance(entry, dict) for entry in metadata):
+        return None, "'metadata' must be a JSON array of objects."
+    if len(metadata) != len(files):
+        return None, f"Got {len(files)} images but {len(metadata)} metadata entries; send one entry per image, in order."
+
+    items = []
+    for entry, file in zip(metadata, files):
+        item = {field: entry[field] for field in METADATA_FIELDS if field in entry}
+        item['imageFile'] = file
+        items.append(item)
+    return items, None
+
+
+def _prepare(serializer):
+    if not serializer.is_valid():
+        return None, serializer.errors
+    image = StoredImage(**serializer.validated_data)
+    image.commit_file()
+    return image, None
+
+
+def prepare_items(serializers):
+    """Validates each serializer and stores the files of the valid ones, in parallel. Returns [(image, errors)]."""
+    return list(_executor.map(_prepare, serializers))
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+WebP derivatives (thumbnails) for StoredImage uploads.
+
+Generation runs on a small process-wide thread pool once the upload's transaction
+commits, so the upload response never waits on Pillow. Results are written to
+`StoredImage.derivatives` as {"<size>": {"path", "width", "height", "bytes"}}, which
+lets list responses build thumbnail URLs without touching the files.
+"""
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_SIZES = (64, 256, 1024) # Longest edge in pixels
+WEBP_QUALITY = 80
+
+DERIVATIVES_PREFIX = 'stored_images/derivatives'
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-derivatives')
+
+
+def derivative_path(key, size):
+    # key is the image's content hash, so identical uploads share derivatives.
+    # Images from before content-addressed storage fall back to their primary key.
+    return f'{DERIVATIVES_PREFIX}/{key}/{size}.webp'
+
+
+def render_derivatives(source):
+    """Yields (size, webp_bytes, width, height) for each configured size from an open image file."""
+    with Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+        for size in DERIVATIVE_SIZES:
+            derivative = original.copy()
+            derivative.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            derivative.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+            yield size, buffer.getvalue(), derivative.width, derivative.height
+
+
+def generate_derivatives(image_id):
+    """Builds and stores all derivatives for one StoredImage. Safe to call from any thread."""
+    from .models import StoredImage
+
+    image = StoredImage.objects.filter(pk=image_id).only('id', 'imageFile', 'content_hash').first()
+    if image is None or not image.imageFile:
+        return None
+    source_name = image.imageFile.name
+
+    derivatives = None
+    if image.content_hash:
+        # Same photo uploaded before: reuse its derivatives instead of rendering them again.
+        derivatives = (StoredImage.objects.filter(content_hash=image.content_hash).exclude(derivatives={})
+                       .values_list('derivatives', flat=True).first())
+    if not derivatives:
+        derivatives = {}
+        with image.imageFile.storage.open(source_name, 'rb') as source:
+            for size, data, width, height in render_derivatives(source):
+                path = derivative_path(image.content_hash or image_id, size)
+                if default_storage.exists(path):
+                    default_storage.delete(path)
+                path = default_storage.save(path, ContentFile(data))
+                derivatives[str(size)] = {'path': path, 'width': width, 'height': height, 'bytes': len(data)}
+
+    # Only record them if the image wasn't replaced while we were working. updated_at moves too,
+    # so the ETags of visitors nesting this photo change and pollers pick up the thumbnails.
+    StoredImage.objects.filter(pk=image_id, imageFile=source_name).update(derivatives=derivatives, updated_at=timezone.now())
+    return derivatives
+
+
+def _run(image_id):
+    close_old_connections()
+    try:
+        generate_derivatives(image_id)
+    except Exception:
+        logger.exception('Could not generate derivatives for StoredImage %s', image_id)
+    finally:
+        connection.close() # Worker threads get their own connection; don't leak it
+
+
+def schedule_derivatives(image_id):
+    """Queues derivative generation to start after the current transaction commits."""
+    transaction.on_commit(lambda: _executor.submit(_run, image_id))
@@ -0,0 +1,9 @@
+from django.core.management import call_command
+
+from jobs.queue import job
+
+
+@job(max_attempts=1)
+def collect_orphaned_files():
+    """Nightly run of `manage.py gc_image_files`."""
+    call_command('gc_image_files')
\ No newline at end of file
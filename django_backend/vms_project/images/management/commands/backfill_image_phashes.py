@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from images.models import StoredImage, compute_phash
+
+
+class Command(BaseCommand):
+    help = "Computes the perceptual hash of stored images uploaded before it was recorded (or all, with --all)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute the hash of every image.')
+
+    def handle(self, *args, **options):
+        images = StoredImage.objects.exclude(imageFile='')
+        if not options['all']:
+            images = images.filter(phash__isnull=True)
+        done = failed = 0
+        for image in images.only('id', 'imageFile').iterator(chunk_size=500):
+            phash = compute_phash(image.imageFile)
+            if phash is None:
+                failed += 1
+                continue
+            # updated_at lets running servers' similarity indexes pick the hash up.
+            StoredImage.objects.filter(pk=image.pk).update(phash=phash, updated_at=timezone.now())
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f'Hashed {done} image(s), {failed} failed.'))
\ No newline at end of file
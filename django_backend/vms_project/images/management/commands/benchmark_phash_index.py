@@ -0,0 +1,56 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from images.similarity import MultiIndexHash
+
+
+class Command(BaseCommand):
+    help = ("Builds the in-memory perceptual-hash index over random hashes (no database) and times "
+            "near-duplicate queries against a linear scan, checking both return the same matches.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=300000, help='Number of indexed hashes.')
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--max-distance', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        size, max_distance = options['size'], options['max_distance']
+        hashes = [rng.getrandbits(64) for _ in range(size)]
+
+        started = time.perf_counter()
+        index = MultiIndexHash()
+        for item_id, value in enumerate(hashes):
+            index.add(item_id, value)
+        self.stdout.write(f'Indexed {size} hashes in {time.perf_counter() - started:.2f}s')
+
+        # Queries are near-copies of indexed hashes (a few flipped bits), like a re-uploaded photo.
+        queries = []
+        for _ in range(options['queries']):
+            value = rng.choice(hashes)
+            for bit in rng.sample(range(64), rng.randint(0, max_distance)):
+                value ^= 1 << bit
+            queries.append(value)
+
+        index_ms, scan_ms = [], []
+        for value in queries:
+            started = time.perf_counter()
+            found = index.search(value, max_distance)
+            index_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            expected = sorted((d, i) for i, h in enumerate(hashes) if (d := (h ^ value).bit_count()) <= max_distance)
+            scan_ms.append((time.perf_counter() - started) * 1000)
+            if found != expected:
+                self.stderr.write(self.style.ERROR(f'Mismatch for {value:016x}: {found} != {expected}'))
+                return
+
+        for label, timings in (('index', index_ms), ('linear scan', scan_ms)):
+            timings.sort()
+            self.stdout.write(f'{label:>12}: median={statistics.median(timings):8.2f}ms '
+                              f'p95={timings[int(len(timings) * 0.95) - 1]:8.2f}ms')
+        self.stdout.write(self.style.SUCCESS('Index results match the linear scan.'))
\ No newline at end of file
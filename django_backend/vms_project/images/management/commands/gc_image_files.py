@@ -0,0 +1,87 @@
+import os
+from datetime import timedelta
+from itertools import islice
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from images.derivatives import DERIVATIVES_PREFIX
+from images.models import StoredImage
+
+ROOT = 'stored_images'
+
+
+def walk_files(storage, path, skip=()):
+    """Yields file names under path one directory at a time, so memory is bounded by the largest directory."""
+    directories, files = storage.listdir(path)
+    for file_name in files:
+        yield f'{path}/{file_name}'
+    for directory in directories:
+        child = f'{path}/{directory}'
+        if child not in skip:
+            yield from walk_files(storage, child, skip)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = ("Deletes stored image files and derivative folders that no StoredImage row references any more "
+            "(left behind by deleted rows, replaced uploads and interrupted uploads).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted.')
+        parser.add_argument('--min-age', type=int, default=3600,
+                            help='Seconds a file must be unmodified before it can be deleted, so uploads in flight are safe.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Files checked against the database per query.')
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.cutoff = timezone.now() - timedelta(seconds=options['min_age'])
+        self.removed = self.freed = 0
+        if not default_storage.exists(ROOT):
+            self.stdout.write('Nothing to collect.')
+            return
+
+        # Originals, in both the content-addressed and the legacy per-person layout.
+        for batch in batched(walk_files(default_storage, ROOT, skip={DERIVATIVES_PREFIX}), options['batch_size']):
+            referenced = set(StoredImage.objects.filter(imageFile__in=batch).values_list('imageFile', flat=True))
+            for name in batch:
+                if name not in referenced:
+                    self.remove(name)
+
+        # Derivative folders are keyed on the content hash (or the row id for legacy images).
+        if default_storage.exists(DERIVATIVES_PREFIX):
+            keys, _ = default_storage.listdir(DERIVATIVES_PREFIX)
+            for batch in batched(keys, options['batch_size']):
+                hashes = [key for key in batch if not key.isdigit()]
+                ids = [int(key) for key in batch if key.isdigit()]
+                referenced = set(StoredImage.objects.filter(content_hash__in=hashes).values_list('content_hash', flat=True))
+                referenced.update(str(pk) for pk in StoredImage.objects.filter(pk__in=ids, content_hash__isnull=True).values_list('pk', flat=True))
+                for key in batch:
+                    if key not in referenced:
+                        folder = f'{DERIVATIVES_PREFIX}/{key}'
+                        for name in walk_files(default_storage, folder):
+                            self.remove(name)
+                        if not self.dry_run:
+                            try:
+                                os.rmdir(default_storage.path(folder))
+                            except OSError:
+                                pass # Not empty (a file was too new) or already gone
+
+        verb = 'Would remove' if self.dry_run else 'Removed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {self.removed} orphaned file(s), {self.freed / 1024 / 1024:.1f} MB.'))
+
+    def remove(self, name):
+        if default_storage.get_modified_time(name) > self.cutoff:
+            return
+        self.freed += default_storage.size(name)
+        self.removed += 1
+        if self.dry_run:
+            self.stdout.write(f'orphaned: {name}')
+        else:
+            default_storage.delete(name)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from images.derivatives import generate_derivatives
+from images.models import StoredImage
+
+
+class Command(BaseCommand):
+    help = "Generates WebP thumbnails for stored images that don't have them yet (or all, with --all)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate derivatives for every image.')
+
+    def handle(self, *args, **options):
+        images = StoredImage.objects.exclude(imageFile='')
+        if not options['all']:
+            images = images.filter(derivatives={})
+        done = failed = 0
+        for image_id in images.values_list('id', flat=True).iterator():
+            try:
+                generate_derivatives(image_id)
+                done += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f'StoredImage {image_id}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Generated derivatives for {done} image(s), {failed} failed.'))
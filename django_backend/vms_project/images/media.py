@@ -0,0 +1,188 @@
+"""
+Authenticated serving of uploaded media (everything under MEDIA_ROOT).
+
+Image URLs returned by the API carry a signature (`?expires=...&sig=...`) so they work
+in <img> tags, which can't send the JWT header; requests with a staff session, or a JWT
+whose user may see the file (see can_view_media), are accepted without one. Once access
+is checked the transfer is handed to the front proxy (MEDIA_SENDFILE = 'x-accel-redirect'
+for nginx, 'x-sendfile' for Apache), or, without a proxy, streamed by FileResponse, which
+uses the server's sendfile support.
+Either way ETag/Last-Modified revalidation happens here, and Range requests are honoured.
+
+nginx example for MEDIA_SENDFILE = 'x-accel-redirect':
+
+    location /protected-media/ {
+        internal;
+        alias /path/to/media_locations/;
+    }
+"""
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.authorization import get_authorized_location_ids
+from .derivatives import DERIVATIVES_PREFIX
+from .models import StoredImage
+from .storage import content_hash_from_name
+
+SIGNATURE_SALT = 'images.media'
+IMMUTABLE_CACHE = 'private, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'private, no-cache'
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _signature(name, expires):
+    return signing.Signer(salt=SIGNATURE_SALT).signature(f'{name}:{expires}')
+
+
+def signed_media_url(name):
+    """
+    MEDIA_URL path for `name` with a signature valid for one to two MEDIA_URL_TTL periods.
+    Expiry is rounded to the period, so a file's URL (and the browser's cached copy) stays
+    the same for a whole period.
+    """
+    ttl = settings.MEDIA_URL_TTL
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return f'{default_storage.url(name)}?expires={expires}&sig={_signature(name, expires)}'
+
+
+def _stored_images_for(name):
+    """The StoredImage rows whose file (or derivative folder) `name` is."""
+    if name.startswith(DERIVATIVES_PREFIX + '/'):
+        key = name[len(DERIVATIVES_PREFIX) + 1:].split('/')[0] # The content hash, or the pk of a legacy file
+        return StoredImage.objects.filter(pk=int(key)) if key.isdigit() else StoredImage.objects.filter(content_hash=key)
+    return StoredImage.objects.filter(imageFile=name)
+
+
+def can_view_media(user, name):
+    """
+    Photos attached to visits are visible to approved users authorized for one of those visits'
+    locations; registration images no visit uses are visible to any approved user, as in the
+    images API. Files with no StoredImage are not served.
+    """
+    if not user.is_approved_by_admin:
+        return False
+    location_ids = get_authorized_location_ids(user)
+    return _stored_images_for(name).filter(Q(visits__isnull=True) | Q(visits__location_id__in=location_ids)).exists()
+
+
+def has_media_access(request, name):
+    expires, signature = request.GET.get('expires', ''), request.GET.get('sig', '')
+    if expires.isdigit() and int(expires) > time.time() and constant_time_compare(signature, _signature(name, expires)):
+        return True
+    if request.user.is_authenticated and request.user.is_staff: # Admin site session
+        return True
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return authenticated is not None and can_view_media(authenticated[0], name)
+
+
+def _is_immutable(name):
+    # Blob names are their content hash; derivative folders are keyed on it too.
+    return content_hash_from_name(name) is not None or name.startswith(DERIVATIVES_PREFIX + '/')
+
+
+class _FileRange:
+    """Reads at most `length` bytes of an open file, starting at its current position."""
+
+    def __init__(self, file, length):
+        self.file, self.remaining = file, length
+
+    def read(self, size=-1):
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _requested_range(request, size, etag, last_modified):
+    """(start, end) for a satisfiable single-range request, None to send the whole file, or 'invalid'."""
+    header = request.META.get('HTTP_RANGE', '')
+    match = _RANGE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None # Absent, multi-range or malformed: send everything
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range not in (etag, http_date(last_modified)):
+        return None # The client's partial copy is stale
+    first, last = match.groups()
+    if first == '':
+        start, end = max(size - int(last), 0), size - 1 # Suffix range: the last N bytes
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return 'invalid'
+    return start, end
+
+
+def serve_media(request, name):
+    if not name.startswith('stored_images/'):
+        raise Http404
+    try:
+        path = default_storage.path(name)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not has_media_access(request, name):
+        raise PermissionDenied
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+
+    content_hash = content_hash_from_name(name)
+    etag = quote_etag(content_hash or f'{stat.st_size:x}-{stat.st_mtime_ns:x}')
+    last_modified = int(stat.st_mtime)
+    cache_control = IMMUTABLE_CACHE if _is_immutable(name) else REVALIDATE_CACHE
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(name)
+        elif settings.MEDIA_SENDFILE == 'x-sendfile':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        else:
+            response = _file_response(request, path, stat.st_size, content_type, etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def _file_response(request, path, size, content_type, etag, last_modified):
+    requested = _requested_range(request, size, etag, last_modified)
+    if requested == 'invalid':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if requested is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = requested
+        file = open(path, 'rb')
+        file.seek(start)
+        response = FileResponse(_FileRange(file, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
\ No newline at end of file
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:43
+
+from django.db import migrations, models
+import images.models
+import images.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0002_storedimage_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedimage',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='storedimage',
+            name='imageFile',
+            field=models.ImageField(db_index=True, max_length=255, storage=images.storage.ContentAddressedStorage(), upload_to=images.models.image_upload_path, verbose_name='Image File'),
+        ),
+    ]
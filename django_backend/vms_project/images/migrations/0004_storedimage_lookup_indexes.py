@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:50
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0003_storedimage_content_addressed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedimage',
+            name='idNumber',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='ID Number'),
+        ),
+        migrations.AddIndex(
+            model_name='storedimage',
+            index=models.Index(django.db.models.functions.text.Upper('email'), models.OrderBy(models.F('uploaded_at'), descending=True), name='image_email_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storedimage',
+            index=models.Index(fields=['contact', '-uploaded_at'], name='image_contact_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storedimage',
+            index=models.Index(fields=['idNumber', '-uploaded_at'], name='image_idnumber_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0004_storedimage_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedimage',
+            name='phash',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='storedimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
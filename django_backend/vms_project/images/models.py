@@ -1,11 +1,30 @@
 # StoredImage model is kept global as per thought process (user profile images).
 # No location ForeignKey here.
+import logging
+
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Upper
+from .similarity import dhash, to_signed
+from .storage import content_addressed_storage, content_hash_from_name
+
+logger = logging.getLogger(__name__)
 
+# Only used by the legacy layout and old migrations; new files are content-addressed (see images/storage.py).
 def image_upload_path(instance, filename):
     identifier = instance.email if instance.email else instance.fullName.replace(" ", "_")
     return f'stored_images/{instance.idType.lower()}/{identifier}/{filename}'
 
+def compute_phash(image_file):
+    if not image_file:
+        return None
+    try:
+        with image_file.storage.open(image_file.name, 'rb') as source:
+            return to_signed(dhash(source))
+    except Exception:
+        logger.exception('Could not hash %s', image_file.name)
+        return None
+
 class StoredImage(models.Model):
     ID_TYPE_CHOICES = [
         ('Visitor', 'Visitor'),
@@ -16,12 +35,36 @@ class StoredImage(models.Model):
     fullName = models.CharField(max_length=255, verbose_name="Full Name")
     contact = models.CharField(max_length=50, blank=True, null=True, verbose_name="Contact Number")
     email = models.EmailField(blank=True, null=True, verbose_name="Email Address")
+    idNumber = models.CharField(max_length=100, blank=True, null=True, verbose_name="ID Number")
     
-    imageFile = models.ImageField(upload_to=image_upload_path, verbose_name="Image File")
+    imageFile = models.ImageField(upload_to=image_upload_path, storage=content_addressed_storage, max_length=255, db_index=True, verbose_name="Image File")
+    # sha256 of the file; rows with the same hash share one stored file and one set of derivatives.
+    # Null for files uploaded before content-addressed storage.
+    content_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True, editable=False)
     idType = models.CharField(max_length=50, choices=ID_TYPE_CHOICES, default='Visitor', verbose_name="ID Type")
+    # WebP thumbnails generated in the background after upload (see images/derivatives.py):
+    # {"64": {"path": ..., "width": ..., "height": ..., "bytes": ...}, "256": {...}, "1024": {...}}
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    # 64-bit perceptual (difference) hash, signed; searched by images/similarity.py for near-duplicates
+    phash = models.BigIntegerField(blank=True, null=True, editable=False)
     
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True) # Indexed for the similarity index's catch-up
+
+    def commit_file(self):
+        """Stores a newly assigned imageFile, so its content hash is known before the row is written."""
+        if self.imageFile and not self.imageFile._committed:
+            self.imageFile.save(self.imageFile.name, self.imageFile.file, save=False)
+        content_hash = content_hash_from_name(self.imageFile.name)
+        if self.pk and content_hash != self.content_hash:
+            self.derivatives = {} # They belong to the previous file; regenerated in the background
+        if content_hash != self.content_hash or (self.imageFile and self.phash is None):
+            self.phash = compute_phash(self.imageFile)
+        self.content_hash = content_hash
+
+    def save(self, *args, **kwargs):
+        self.commit_file()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Image of {self.fullName} ({self.idType})"
@@ -29,4 +72,12 @@ class StoredImage(models.Model):
     class Meta:
         ordering = ['-uploaded_at']
         verbose_name = "Stored Image (User Registration)"
-        verbose_name_plural = "Stored Images (User Registrations)"
\ No newline at end of file
+        verbose_name_plural = "Stored Images (User Registrations)"
+        indexes = [
+            # Exact lookups for the check-in form's auto-fill (see StoredImageViewSet.lookup); each
+            # index is ordered by upload time so "latest match" is a single index probe.
+            # email is matched case-insensitively, which compiles to UPPER(email) = UPPER(%s).
+            models.Index(Upper('email'), F('uploaded_at').desc(), name='image_email_latest_idx'),
+            models.Index(fields=['contact', '-uploaded_at'], name='image_contact_latest_idx'),
+            models.Index(fields=['idNumber', '-uploaded_at'], name='image_idnumber_latest_idx'),
+        ]
\ No newline at end of file
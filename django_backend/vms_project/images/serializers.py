@@ -1,15 +1,58 @@
+from PIL import Image
 from rest_framework import serializers
+from .media import signed_media_url
 from .models import StoredImage
+from .uploads import inspect_image
+
+class HeaderCheckedImageField(serializers.FileField):
+    """
+    Like serializers.ImageField, but validates from the image header (see images/uploads.py)
+    instead of loading and verifying the whole image with Pillow.
+    """
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        image_format, width, height = inspect_image(file)
+        file.content_type = Image.MIME.get(image_format, file.content_type)
+        return file
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = signed_media_url(value.name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 class StoredImageSerializer(serializers.ModelSerializer):
-    imageFile = serializers.ImageField(use_url=True) 
+    imageFile = HeaderCheckedImageField(use_url=True)
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = StoredImage
-        fields = ['id', 'fullName', 'contact', 'email', 'imageFile', 'idType', 'uploaded_at', 'updated_at'] # Added contact and email
-        read_only_fields = ('id', 'uploaded_at', 'updated_at')
+        fields = ['id', 'fullName', 'contact', 'email', 'idNumber', 'imageFile', 'thumbnails', 'idType', 'uploaded_at', 'updated_at'] # Added contact and email
+        read_only_fields = ('id', 'thumbnails', 'uploaded_at', 'updated_at')
+
+    def get_thumbnails(self, obj):
+        """
+        {"64": {"url", "width", "height", "bytes"}, ...} built from the stored derivative metadata,
+        so no files are opened. Empty until background generation has finished.
+        """
+        request = self.context.get('request')
+        thumbnails = {}
+        for size, derivative in (obj.derivatives or {}).items():
+            url = signed_media_url(derivative['path'])
+            thumbnails[size] = {
+                'url': request.build_absolute_uri(url) if request else url,
+                'width': derivative['width'],
+                'height': derivative['height'],
+                'bytes': derivative['bytes'],
+            }
+        return thumbnails
+
+
+class StoredImagePhotoSerializer(StoredImageSerializer):
+    """Just the image and its thumbnails, for nesting in other records (e.g. Visitor.photo)."""
 
-    def validate_imageFile(self, value):
-        if value.size > 5 * 1024 * 1024: # 5MB limit example
-            raise serializers.ValidationError("Image file too large. Max size is 5MB.")
-        return value
\ No newline at end of file
+    class Meta(StoredImageSerializer.Meta):
+        fields = ['id', 'imageFile', 'thumbnails']
+        read_only_fields = fields
\ No newline at end of file
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from .models import StoredImage
+from .derivatives import schedule_derivatives
+from .similarity import phash_index
+
+
+@receiver(post_init, sender=StoredImage)
+def remember_image_file(sender, instance, **kwargs):
+    if 'imageFile' in instance.__dict__:
+        instance._loaded_image_name = instance.imageFile.name if instance.imageFile else None
+
+
+@receiver(post_save, sender=StoredImage)
+def queue_derivatives(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.imageFile:
+        return
+    if created or instance.__dict__.get('_loaded_image_name') != instance.imageFile.name:
+        schedule_derivatives(instance.pk)
+    instance._loaded_image_name = instance.imageFile.name
+
+
+
+@receiver(post_save, sender=StoredImage)
+def index_phash(sender, instance, raw=False, **kwargs):
+    if not raw:
+        phash_index.update(instance.pk, instance.phash)
+
+
+@receiver(post_delete, sender=StoredImage)
+def unindex_phash(sender, instance, **kwargs):
+    phash_index.discard(instance.pk)
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Near-duplicate detection for StoredImage photos.
+
+Each image gets a 64-bit difference hash (dHash): the photo is shrunk to 9x8 greyscale
+and every bit records whether a pixel is brighter than its right-hand neighbour. Re-saved,
+resized or lightly edited copies of a photo land within a few bits of each other, so
+"similar" means a small Hamming distance between hashes.
+
+Hashes are searched with a multi-index hash table kept in memory per process: the 64
+bits are split into four 16-bit chunks, each with its own {chunk value: ids} table. Two
+hashes within distance r must agree to within r // 4 bits on at least one chunk, so a
+query only probes the few thousand chunk values near its own and checks those
+candidates, instead of scanning every image.
+"""
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from itertools import combinations
+
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+HASH_BITS = 64
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+MAX_DISTANCE = 12 # Beyond this unrelated photos start to match, and queries approach a full scan
+
+# Rows saved by other processes are picked up by re-reading everything updated since the
+# last sync; the overlap covers transactions that commit a little after their save().
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def dhash(file):
+    """64-bit difference hash of an image file (path or file object), as an unsigned int."""
+    with Image.open(file) as image:
+        image.draft('L', (64, 64)) # JPEGs are decoded at a fraction of their size
+        image = ImageOps.exif_transpose(image).convert('L').resize((9, 8), Image.LANCZOS)
+    pixels = list(image.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = value << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+# StoredImage.phash is a signed BigIntegerField, so hashes are stored two's complement.
+def to_signed(value):
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value):
+    return value & ((1 << HASH_BITS) - 1)
+
+
+def _chunks(value):
+    return [(value >> (CHUNK_BITS * i)) & CHUNK_MASK for i in range(CHUNKS)]
+
+
+def _neighbours(chunk, radius):
+    """Every chunk value within `radius` bits of `chunk`."""
+    yield chunk
+    for bits in range(1, radius + 1):
+        for positions in combinations(range(CHUNK_BITS), bits):
+            flipped = chunk
+            for position in positions:
+                flipped ^= 1 << position
+            yield flipped
+
+
+class MultiIndexHash:
+    """In-memory Hamming-distance index over {id: 64-bit hash}."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.tables = [defaultdict(set) for _ in range(CHUNKS)]
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def add(self, item_id, value):
+        value = to_unsigned(value)
+        if self.hashes.get(item_id) == value:
+            return
+        self.discard(item_id)
+        self.hashes[item_id] = value
+        for table, chunk in zip(self.tables, _chunks(value)):
+            table[chunk].add(item_id)
+
+    def discard(self, item_id):
+        value = self.hashes.pop(item_id, None)
+        if value is None:
+            return
+        for table, chunk in zip(self.tables, _chunks(value)):
+            ids = table[chunk]
+            ids.discard(item_id)
+            if not ids:
+                del table[chunk]
+
+    def search(self, value, max_distance):
+        """[(distance, id)] for every hash within max_distance of value, closest first."""
+        value = to_unsigned(value)
+        radius = max_distance // CHUNKS
+        candidates = set()
+        for table, chunk in zip(self.tables, _chunks(value)):
+            for neighbour in _neighbours(chunk, radius):
+                ids = table.get(neighbour)
+                if ids:
+                    candidates |= ids
+        matches = []
+        for item_id in candidates:
+            item_distance = (self.hashes[item_id] ^ value).bit_count()
+            if item_distance <= max_distance:
+                matches.append((item_distance, item_id))
+        matches.sort()
+        return matches
+
+
+class PhashIndex:
+    """
+    The process-wide index of StoredImage.phash. Built from the database on first use, updated
+    by this process's saves and deletes (images/signals.py), and caught up with other
+    processes' writes before every search.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._synced_at = None
+
+    def _rows(self, since=None):
+        from .models import StoredImage
+        rows = StoredImage.objects.filter(phash__isnull=False)
+        if since is not None:
+            rows = rows.filter(updated_at__gte=since)
+        return rows.values_list('id', 'phash').iterator(chunk_size=10000)
+
+    def _sync(self):
+        started = timezone.now()
+        if self._index is None:
+            index = MultiIndexHash()
+            for image_id, phash in self._rows():
+                index.add(image_id, phash)
+            self._index = index
+        else:
+            for image_id, phash in self._rows(since=self._synced_at - SYNC_OVERLAP):
+                self._index.add(image_id, phash)
+        self._synced_at = started
+
+    def search(self, value, max_distance):
+        with self._lock:
+            self._sync()
+            return self._index.search(value, max_distance)
+
+    def update(self, image_id, value):
+        with self._lock:
+            if self._index is not None: # Not built yet: it will read the row when it is
+                if value is None:
+                    self._index.discard(image_id)
+                else:
+                    self._index.add(image_id, value)
+
+    def discard(self, image_id):
+        self.update(image_id, None)
+
+    def reset(self):
+        with self._lock:
+            self._index = self._synced_at = None
+
+
+phash_index = PhashIndex()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = 'stored_images/blobs'
+_BLOB_NAME = re.compile(r'^' + re.escape(BLOB_PREFIX) + r'/[0-9a-f]{2}/[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(\.\w+)?$')
+
+
+def blob_name(sha256, extension):
+    return f'{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}'
+
+
+def content_hash_from_name(name):
+    """The sha256 of a content-addressed file, or None for files in the legacy per-person layout."""
+    match = _BLOB_NAME.match(name or '')
+    return match.group('sha256') if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every distinct file once, under stored_images/blobs/ab/cd/<sha256><ext>.
+
+    The upload is hashed while it is copied to a temporary file next to the blobs, then
+    moved into place; uploads staged by BoundedImageUploadHandler arrive already hashed
+    and are only renamed. If the blob already exists the copy is dropped, so re-uploading the
+    same photo costs no extra bytes. The suggested name only contributes its extension.
+    Files are never deleted here: rows sharing a blob are its references, and
+    `manage.py gc_image_files` removes blobs no row points at any more.
+    """
+
+    def staging_file(self):
+        """An open temporary file next to the blobs, so moving it into place is a rename."""
+        staging_dir = self.path(BLOB_PREFIX)
+        os.makedirs(staging_dir, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=staging_dir, prefix='.upload-')
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        extension = os.path.splitext(name)[1].lower()
+
+        content_hash, staging = getattr(content, 'content_hash', None), None
+        if content_hash and os.path.dirname(content.temporary_file_path()) == self.path(BLOB_PREFIX):
+            # Already staged and hashed while it was uploaded (images/uploads.py).
+            staged_path = content.temporary_file_path()
+        else:
+            staging = self.staging_file()
+            digest = hashlib.sha256()
+            for chunk in content.chunks():
+                digest.update(chunk)
+                staging.write(chunk)
+            staging.flush()
+            content_hash, staged_path = digest.hexdigest(), staging.name
+
+        final_name = blob_name(content_hash, extension)
+        final_path = self.path(final_name)
+        try:
+            if os.path.exists(final_path):
+                os.utime(final_path) # A fresh reference; keeps the garbage collector's grace period honest
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.chmod(staged_path, self.file_permissions_mode or 0o644)
+                os.replace(staged_path, final_path)
+        finally:
+            # A staged copy that wasn't moved into place is deleted when its temporary file closes.
+            if staging is not None:
+                try:
+                    staging.close()
+                except FileNotFoundError:
+                    pass # It was moved
+        return final_name
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,80 @@
+from django.test import Client
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from forms_module.tests import LocationScopedAPITestCase
+from locations.models import Location
+from users.models import User
+from visitors.models import Visitor
+from .derivatives import generate_derivatives
+from .media import signed_media_url
+from .models import StoredImage
+from .similarity import phash_index
+
+
+class MediaAccessTests(LocationScopedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+        self.create_visitors(2) # The second has the photo
+        generate_derivatives(self.photo.pk)
+        self.photo.refresh_from_db()
+        self.names = [self.photo.imageFile.name, self.photo.derivatives['64']['path']]
+        self.other_location = Location.objects.create(name='Other Data Center')
+
+    def create_user(self, username, location, **fields):
+        user = User.objects.create_user(username=username, email=username, password='password', **fields)
+        user.authorized_locations.add(location)
+        return user
+
+    def assertStatus(self, client, status_code):
+        for name in self.names:
+            self.assertEqual(client.get(f'/media/{name}').status_code, status_code, name)
+
+    def jwt_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client
+
+    def test_user_authorized_for_the_visit(self):
+        self.assertStatus(self.client, 200)
+
+    def test_unapproved_user(self):
+        self.assertStatus(self.jwt_client(self.create_user('new@example.com', self.location)), 403)
+
+    def test_user_from_another_location(self):
+        client = self.jwt_client(self.create_user('other@example.com', self.other_location, is_approved_by_admin=True))
+        self.assertStatus(client, 403)
+        Visitor.objects.update(photo=None) # A registration image no visit uses
+        self.assertStatus(client, 200)
+
+    def test_sessions_need_staff(self):
+        client = Client()
+        client.force_login(self.create_user('session@example.com', self.location, is_approved_by_admin=True))
+        self.assertStatus(client, 403)
+        client.force_login(self.create_user('admin@example.com', self.other_location, is_staff=True))
+        self.assertStatus(client, 200)
+
+    def test_signed_url(self):
+        for name in self.names:
+            self.assertEqual(Client().get(signed_media_url(name)).status_code, 200, name)
+
+
+class SimilarImageTests(LocationScopedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        phash_index.reset() # Row ids are reused after each test's rollback
+        self.addCleanup(phash_index.reset)
+        StoredImage.objects.filter(pk=self.photo.pk).update(phash=0)
+        StoredImage.objects.bulk_create([StoredImage(fullName=f'Lookalike {phash}', phash=phash) for phash in (0, 0, 1, 3)])
+
+    def similar(self, **params):
+        response = self.client.get(f'/api/images/{self.photo.pk}/similar/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_parameters_are_clamped(self):
+        self.assertEqual([match['distance'] for match in self.similar()['results']], [0, 0, 1, 2])
+        response = self.similar(max_distance=-3, limit=-1)
+        self.assertEqual((response['max_distance'], [match['distance'] for match in response['results']]), (0, [0]))
+        self.assertEqual(len(self.similar(limit=0)['results']), 1)
\ No newline at end of file
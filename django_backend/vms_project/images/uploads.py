@@ -0,0 +1,115 @@
+"""
+Bounded, streaming image uploads.
+
+Django's default handlers keep uploads under 2.5 MB in memory and only let the
+serializer see the size once the whole body has been read. `BoundedImageUploadHandler`
+instead rejects a request from its Content-Length before reading it, writes each 64 KB
+chunk straight into the blob staging directory while hashing it, and aborts as soon
+as a file grows past IMAGE_UPLOAD_MAX_BYTES. `inspect_image` then checks format and
+dimensions from the image header alone, so no upload is ever decoded or held in memory.
+"""
+import hashlib
+import warnings
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from PIL import Image
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from .storage import content_addressed_storage
+
+# Room for the non-file form fields (fullName, email, ...) sent alongside the image.
+FORM_FIELDS_ALLOWANCE = 64 * 1024
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Upload too large.'
+    default_code = 'upload_too_large'
+
+
+def max_size_message(max_bytes=None):
+    max_bytes = max_bytes or settings.IMAGE_UPLOAD_MAX_BYTES
+    return f'Image file too large. Max size is {max_bytes / 1024 / 1024:g}MB.'
+
+
+class StagedImageUpload(TemporaryUploadedFile):
+    """
+    An upload written to the content-addressed storage's staging directory, with its sha256
+    computed on the way in. ContentAddressedStorage moves it into place instead of copying it.
+    """
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None):
+        file = content_addressed_storage.staging_file()
+        super(TemporaryUploadedFile, self).__init__(file, name, content_type, size, charset, content_type_extra)
+        self.digest = hashlib.sha256()
+        self.content_hash = None
+
+
+class BoundedImageUploadHandler(FileUploadHandler):
+    """Streams each uploaded file to disk, enforcing a per-file and a per-request size limit."""
+
+    def __init__(self, request=None, max_files=1):
+        super().__init__(request)
+        self.max_bytes = settings.IMAGE_UPLOAD_MAX_BYTES
+        self.max_body = self.max_bytes * max_files + FORM_FIELDS_ALLOWANCE
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Reject before a single byte of the body is read.
+        if content_length > self.max_body:
+            raise UploadTooLarge(max_size_message(self.max_bytes))
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = StagedImageUpload(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_bytes:
+            # Content-Length can't be trusted (or the body holds several files); stop reading now.
+            self.file.close()
+            raise UploadTooLarge(max_size_message(self.max_bytes))
+        self.file.digest.update(raw_data)
+        self.file.write(raw_data)
+        return None # Nothing is left for other handlers
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.content_hash = self.file.digest.hexdigest()
+        return self.file
+
+
+def inspect_image(file):
+    """
+    Returns (format, width, height) read from the image header only; the pixel data is
+    never decoded. Raises serializers.ValidationError for anything that isn't an
+    allowed image within the size and pixel limits.
+    """
+    if file.size is not None and file.size > settings.IMAGE_UPLOAD_MAX_BYTES:
+        raise serializers.ValidationError(max_size_message())
+
+    source = file.temporary_file_path() if hasattr(file, 'temporary_file_path') else file
+    position = file.tell() if source is file else None
+    try:
+        with warnings.catch_warnings():
+            # Pillow only warns below twice its own limit; ours is enforced below.
+            warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+            with Image.open(source) as image:
+                image_format, (width, height) = image.format, image.size
+    except Image.DecompressionBombError:
+        raise serializers.ValidationError('Image has too many pixels.')
+    except Exception:
+        raise serializers.ValidationError('Upload a valid image. The file you uploaded was either not an image or a corrupted image.')
+    finally:
+        if position is not None:
+            file.seek(position)
+
+    if image_format not in settings.IMAGE_UPLOAD_FORMATS:
+        raise serializers.ValidationError(f'Unsupported image format. Use one of: {", ".join(settings.IMAGE_UPLOAD_FORMATS)}.')
+    if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+        raise serializers.ValidationError(
+            f'Image is {width}x{height}; at most {settings.IMAGE_UPLOAD_MAX_PIXELS // 1_000_000} megapixels are allowed.'
+        )
+    return image_format, width, height
\ No newline at end of file
@@ -1,8 +1,19 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser # For file uploads
 from rest_framework.response import Response
+from .batch import parse_batch, prepare_items
+from .derivatives import schedule_derivatives
 from .models import StoredImage
+from .similarity import MAX_DISTANCE, phash_index, to_unsigned
 from .serializers import StoredImageSerializer
+from .uploads import BoundedImageUploadHandler
+
+# ?param= for /lookup/ -> exact lookup, each backed by an index in StoredImage.Meta
+LOOKUP_PARAMS = {'email': 'email__iexact', 'contact': 'contact', 'id_number': 'idNumber'}
 
 class StoredImageViewSet(viewsets.ModelViewSet):
     queryset = StoredImage.objects.all().order_by('-uploaded_at')
@@ -11,6 +22,12 @@ class StoredImageViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter]
     search_fields = ['fullName', 'idType'] # For '?search=' query parameter
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Before anything reads the body: stream uploads to disk with size limits instead of buffering them.
+        max_files = settings.IMAGE_BATCH_MAX_FILES if self.action_map.get(request.method.lower()) == 'batch' else 1
+        request.upload_handlers = [BoundedImageUploadHandler(request, max_files=max_files)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -28,4 +45,88 @@ class StoredImageViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request):
+        """
+        Registers many photos at once (see images/batch.py for the request format).
+        Items are independent: the valid ones are created even if others fail, and
+        `results` reports each item in request order.
+        """
+        items, error = parse_batch(request)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        prepared = prepare_items([self.get_serializer(data=item) for item in items])
+        with transaction.atomic():
+            created = StoredImage.objects.bulk_create([image for image, errors in prepared if image is not None])
+            for image in created: # bulk_create sends no post_save, so queue thumbnails and index here
+                schedule_derivatives(image.pk)
+                phash_index.update(image.pk, image.phash)
+
+        results = []
+        for index, (image, errors) in enumerate(prepared):
+            if image is None:
+                results.append({'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': errors})
+            else:
+                results.append({'index': index, 'status': status.HTTP_201_CREATED, 'data': self.get_serializer(image).data})
+
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif len(created) < len(prepared):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response({'created': len(created), 'failed': len(prepared) - len(created), 'results': results},
+                        status=response_status)
+
+    @action(detail=False, methods=['get'], url_path='lookup')
+    def lookup(self, request):
+        """
+        The latest image whose email (case-insensitive), contact or ID number exactly matches
+        the given ?email=, ?contact= or ?id_number=, with its thumbnails, in one query.
+        Used to auto-fill the check-in form; link the result to the visitor via photo_id.
+        """
+        matches = Q()
+        for param, lookup in LOOKUP_PARAMS.items():
+            value = request.query_params.get(param, '').strip()
+            if value:
+                matches |= Q(**{lookup: value})
+        if not matches:
+            return Response({'detail': 'Provide email, contact or id_number.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        image = StoredImage.objects.filter(matches).order_by('-uploaded_at').first()
+        if image is None:
+            return Response({'detail': 'No stored image matches.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(image).data)
+
+    @action(detail=True, methods=['get'], url_path='similar')
+    def similar(self, request, pk=None):
+        """
+        Other images whose perceptual hash is within ?max_distance= bits (default 10, 0 to 12)
+        of this one's, closest first (?limit=, default 20, 1 to 100), e.g. the same face
+        registered under another name.
+        Distance 0-5 is almost certainly the same photo; above 12 matches get unreliable.
+        """
+        image = self.get_object()
+        if image.phash is None:
+            return Response({'detail': 'This image has no perceptual hash.'}, status=status.HTTP_409_CONFLICT)
+        try:
+            max_distance = max(0, min(int(request.query_params.get('max_distance', 10)), MAX_DISTANCE))
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            return Response({'detail': 'max_distance and limit must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches = [(d, image_id) for d, image_id in phash_index.search(image.phash, max_distance) if image_id != image.pk]
+        candidates = StoredImage.objects.in_bulk([image_id for _, image_id in matches[:limit * 2]])
+        results = []
+        for d, image_id in matches[:limit * 2]:
+            candidate = candidates.get(image_id)
+            if candidate is None or candidate.phash is None:
+                phash_index.discard(image_id) # Deleted by another process
+                continue
+            results.append({'distance': d, **self.get_serializer(candidate).data})
+            if len(results) == limit:
+                break
+        return Response({'phash': f'{to_unsigned(image.phash):016x}', 'max_distance': max_distance, 'results': results})
\ No newline at end of file
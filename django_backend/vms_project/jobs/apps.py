@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = "Background Jobs"
+
+    def ready(self):
+        autodiscover_modules('jobs') # Registers the @job functions in each app's jobs.py
\ No newline at end of file
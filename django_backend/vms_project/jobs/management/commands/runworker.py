@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+
+from jobs.queue import claim, prune_finished, requeue_stale, run
+from jobs.schedule import enqueue_due, sync_schedule
+
+MAINTENANCE_INTERVAL = 60 # Seconds between stale-job/prune passes
+
+
+class Worker:
+    def __init__(self, stop, poll_interval, scheduler, burst):
+        self.stop, self.poll_interval, self.scheduler, self.burst = stop, poll_interval, scheduler, burst
+
+    def name(self):
+        return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+    def loop(self):
+        worker_name = self.name()
+        try:
+            while not self.stop.is_set():
+                claimed = claim(worker_name)
+                if claimed is not None:
+                    run(claimed)
+                    continue
+                if self.burst:
+                    return
+                close_old_connections()
+                self.stop.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def housekeeping(self):
+        """Scheduler and maintenance, on their own thread so long jobs can't delay them."""
+        last_maintenance = 0
+        try:
+            while not self.stop.is_set():
+                if self.scheduler:
+                    enqueue_due()
+                if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL:
+                    requeue_stale()
+                    prune_finished()
+                    last_maintenance = time.monotonic()
+                close_old_connections()
+                self.stop.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+
+def run_process(threads, poll_interval, scheduler, burst):
+    """Runs `threads` worker loops (plus housekeeping) until SIGTERM/SIGINT, or until the queue is empty in burst mode."""
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *args: stop.set()) # Finish the current jobs, then exit
+    worker = Worker(stop, poll_interval, scheduler, burst)
+    loops = [threading.Thread(target=worker.loop, name=f'job-worker-{i}') for i in range(threads)]
+    helper = threading.Thread(target=worker.housekeeping, name='job-housekeeping', daemon=True)
+    if not burst:
+        helper.start()
+    for thread in loops:
+        thread.start()
+    for thread in loops:
+        thread.join()
+    stop.set()
+
+
+class Command(BaseCommand):
+    help = ("Runs background jobs queued with jobs.queue.enqueue, and queues the periodic jobs in "
+            "settings.JOB_SCHEDULE. Stop with SIGTERM/Ctrl-C; running jobs are finished first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--threads', type=int, default=2, help='Worker threads per process.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--no-scheduler', action='store_true', help="Don't queue JOB_SCHEDULE entries from these workers.")
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due (for cron or tests).')
+
+    def handle(self, *args, **options):
+        scheduler = not options['no_scheduler']
+        if scheduler:
+            sync_schedule()
+            if options['burst']:
+                enqueue_due()
+        settings = (options['threads'], options['poll_interval'], scheduler, options['burst'])
+        self.stdout.write(f"Starting {options['processes']} process(es) x {options['threads']} thread(s).")
+
+        if options['processes'] == 1:
+            run_process(*settings)
+            return
+        connections.close_all() # Never share a connection with forked children
+        children = [multiprocessing.get_context('fork').Process(target=run_process, args=settings)
+                    for _ in range(options['processes'])]
+        for child in children:
+            child.start()
+
+        def forward(signum, frame): # Each child finishes its current jobs, then exits
+            for child in children:
+                if child.is_alive():
+                    os.kill(child.pid, signum)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, forward)
+        for child in children:
+            child.join()
\ No newline at end of file
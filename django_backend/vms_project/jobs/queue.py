@@ -0,0 +1,138 @@
+"""
+A small job queue stored in the database.
+
+Functions decorated with @job (in an app's jobs.py) can be queued with `enqueue()`; the
+row is written in the caller's transaction, so a job queued by a request that rolls
+back never runs. `manage.py runworker` claims jobs with SELECT ... FOR UPDATE SKIP LOCKED,
+so any number of workers can poll the same table without blocking each other or taking
+the same job. Failed jobs are retried with exponential backoff until max_attempts.
+While a job runs, a heartbeat thread in its worker refreshes locked_at; jobs whose
+heartbeat stops (the worker died or lost the database) are requeued after LOCK_TIMEOUT.
+Jobs may run more than once (a worker can die after finishing one), so keep them idempotent.
+"""
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_DELAY = 10 # Seconds before the first retry; doubles with each attempt
+RETRY_MAX_DELAY = 60 * 60
+HEARTBEAT_INTERVAL = 30 # Seconds between refreshes of a running job's locked_at
+LOCK_TIMEOUT = timedelta(minutes=5) # A running job whose heartbeat stopped this long ago is requeued
+KEEP_FINISHED = timedelta(days=7)
+
+registry = {}
+
+
+def job(func=None, *, max_attempts=5, priority=0):
+    """Registers a function as a job. Arguments must be JSON-serializable."""
+    def register(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        func.job_name = name
+        func.job_options = {'max_attempts': max_attempts, 'priority': priority}
+        registry[name] = func
+        return func
+    return register(func) if func is not None else register
+
+
+def enqueue(func, *args, priority=None, run_at=None, max_attempts=None, **kwargs):
+    """Queues func(*args, **kwargs); func is a @job function or its registered name."""
+    name = func if isinstance(func, str) else func.job_name
+    options = registry[name].job_options
+    return Job.objects.create(
+        name=name, args=list(args), kwargs=kwargs,
+        priority=options['priority'] if priority is None else priority,
+        max_attempts=options['max_attempts'] if max_attempts is None else max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def retry_delay(attempts):
+    delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.75, 1.25)) # Jitter, so failures don't retry in lockstep
+
+
+def claim(worker_name):
+    """Marks the next due job as running for this worker and returns it, or None if nothing is due."""
+    now = timezone.now()
+    with transaction.atomic():
+        next_job = (Job.objects.select_for_update(skip_locked=True)
+                    .filter(status=Job.QUEUED, run_at__lte=now)
+                    .order_by('-priority', 'run_at', 'id').first())
+        if next_job is None:
+            return None
+        next_job.status = Job.RUNNING
+        next_job.attempts += 1
+        next_job.locked_by = worker_name
+        next_job.locked_at = now
+        next_job.save(update_fields=['status', 'attempts', 'locked_by', 'locked_at'])
+    return next_job
+
+
+def _heartbeat(claimed, stop):
+    """Refreshes locked_at every HEARTBEAT_INTERVAL until `stop` is set, so a long job isn't taken for a dead one."""
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                Job.objects.filter(pk=claimed.pk, locked_by=claimed.locked_by, status=Job.RUNNING).update(locked_at=timezone.now())
+            except DatabaseError:
+                logger.exception('Heartbeat for job %s #%s failed', claimed.name, claimed.pk)
+                connection.close() # Reconnect on the next beat
+    finally:
+        connection.close() # Its own connection; don't leak it
+
+
+def run(claimed):
+    """Runs a claimed job and records the outcome. Returns True if it succeeded."""
+    close_old_connections()
+    func = registry.get(claimed.name)
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(claimed, stop), name=f'job-heartbeat-{claimed.pk}', daemon=True)
+    heartbeat.start()
+    try:
+        if func is None:
+            raise LookupError(f'No @job registered as {claimed.name!r}.')
+        func(*claimed.args, **claimed.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s #%s failed (attempt %s of %s)', claimed.name, claimed.pk, claimed.attempts, claimed.max_attempts)
+        changes = {'last_error': error, 'locked_by': '', 'locked_at': None}
+        if func is None or claimed.attempts >= claimed.max_attempts:
+            changes.update(status=Job.FAILED, finished_at=timezone.now())
+        else:
+            changes.update(status=Job.QUEUED, run_at=timezone.now() + retry_delay(claimed.attempts))
+        _record(claimed, changes)
+        return False
+    finally:
+        stop.set()
+        heartbeat.join()
+        close_old_connections()
+    _record(claimed, {'status': Job.DONE, 'finished_at': timezone.now(), 'locked_by': '', 'locked_at': None})
+    return True
+
+
+def _record(claimed, changes):
+    # Only while this worker still holds the job; requeue_stale() may have handed it to another.
+    if not Job.objects.filter(pk=claimed.pk, locked_by=claimed.locked_by).update(**changes):
+        logger.warning('Job %s #%s finished after it was requeued; its outcome was not recorded', claimed.name, claimed.pk)
+
+
+def requeue_stale():
+    """Puts back running jobs whose heartbeat stopped (their worker died mid-run); they count as a failed attempt."""
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=timezone.now() - LOCK_TIMEOUT)
+    changes = {'locked_by': '', 'locked_at': None, 'last_error': 'Worker stopped responding.'}
+    stale.filter(attempts__gte=F('max_attempts')).update(status=Job.FAILED, finished_at=timezone.now(), **changes)
+    return stale.update(status=Job.QUEUED, **changes)
+
+
+def prune_finished():
+    return Job.objects.filter(status=Job.DONE, finished_at__lt=timezone.now() - KEEP_FINISHED).delete()[0]
\ No newline at end of file
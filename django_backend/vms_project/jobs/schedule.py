@@ -0,0 +1,60 @@
+"""
+Periodic jobs from settings.JOB_SCHEDULE, e.g.
+
+    JOB_SCHEDULE = {
+        'visitors.jobs.auto_checkout_open_visits': {'daily_at': '00:05'},
+        'some.jobs.refresh': {'every': 300}, # seconds
+    }
+
+Each entry has a ScheduledJob row holding when it is next due. Every worker running the
+scheduler checks those rows, locking them with SKIP LOCKED, so however many run, each
+due entry is queued exactly once. Missed runs (no worker running) are not made up;
+the job is queued once and then follows its schedule again.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ScheduledJob
+from .queue import enqueue, registry
+
+
+def next_run(spec, after):
+    if 'every' in spec:
+        return after + timedelta(seconds=spec['every'])
+    hour, minute = (int(part) for part in spec['daily_at'].split(':'))
+    local = timezone.localtime(after)
+    candidate = timezone.make_aware(datetime.combine(local.date(), time(hour, minute)))
+    return candidate if candidate > after else timezone.make_aware(datetime.combine(local.date() + timedelta(days=1), time(hour, minute)))
+
+
+def sync_schedule():
+    """Creates rows for new JOB_SCHEDULE entries and drops rows for removed ones."""
+    schedule = getattr(settings, 'JOB_SCHEDULE', {})
+    for name in schedule:
+        if name not in registry:
+            raise LookupError(f'JOB_SCHEDULE lists {name!r}, which is not a registered @job.')
+    now = timezone.now()
+    existing = set(ScheduledJob.objects.values_list('name', flat=True))
+    ScheduledJob.objects.bulk_create(
+        [ScheduledJob(name=name, next_run_at=next_run(spec, now)) for name, spec in schedule.items() if name not in existing],
+        ignore_conflicts=True, # Another worker got there first
+    )
+    ScheduledJob.objects.exclude(name__in=list(schedule)).delete()
+
+
+def enqueue_due():
+    """Queues every scheduled job that is due. Returns how many were queued."""
+    schedule = getattr(settings, 'JOB_SCHEDULE', {})
+    now = timezone.now()
+    queued = 0
+    with transaction.atomic():
+        for entry in ScheduledJob.objects.select_for_update(skip_locked=True).filter(next_run_at__lte=now):
+            enqueue(entry.name)
+            entry.last_run_at = now
+            entry.next_run_at = next_run(schedule[entry.name], now)
+            entry.save(update_fields=['last_run_at', 'next_run_at'])
+            queued += 1
+    return queued
\ No newline at end of file
@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim, enqueue, job, requeue_stale, run
+
+requeued_while_running = []
+
+
+@job(max_attempts=1)
+def outlive_lock_timeout(seconds):
+    time.sleep(seconds)
+    requeued_while_running.append(requeue_stale())
+
+
+# The heartbeat writes from its own thread and connection, so the job row has to be committed.
+@mock.patch('jobs.queue.HEARTBEAT_INTERVAL', 0.05)
+@mock.patch('jobs.queue.LOCK_TIMEOUT', timedelta(seconds=0.3))
+class HeartbeatTests(TransactionTestCase):
+    def setUp(self):
+        requeued_while_running.clear()
+
+    def test_running_job_is_not_requeued(self):
+        queued = enqueue(outlive_lock_timeout, 0.6)
+        self.assertTrue(run(claim('test-worker')))
+        self.assertEqual(requeued_while_running, [0])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.DONE, 1))
+
+    def test_job_without_heartbeat_is_requeued(self):
+        queued = enqueue(outlive_lock_timeout, 0, max_attempts=2)
+        claim('dead-worker')
+        Job.objects.filter(pk=queued.pk).update(locked_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_stale(), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by, queued.attempts), (Job.QUEUED, '', 1))
\ No newline at end of file
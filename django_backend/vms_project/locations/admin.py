@@ -1,8 +1,15 @@
 from django.contrib import admin
-from .models import Location
+from .models import Location, LocationDailyStats
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = ('name', 'description', 'created_at', 'updated_at')
     search_fields = ('name', 'description')
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at')
+
+@admin.register(LocationDailyStats)
+class LocationDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ('location', 'day', 'check_ins', 'check_outs', 'open_visits', 'tasks_created', 'tasks_completed')
+    list_filter = ('location',)
+    date_hierarchy = 'day'
+    readonly_fields = ('location', 'day', 'check_ins', 'check_outs', 'open_visits', 'tasks_created', 'tasks_completed')
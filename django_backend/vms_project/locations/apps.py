@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class LocationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'locations'
\ No newline at end of file
+    name = 'locations'
+
+    def ready(self):
+        from . import signals # noqa: F401 -- keeps LocationDailyStats and the location registry up to date
\ No newline at end of file
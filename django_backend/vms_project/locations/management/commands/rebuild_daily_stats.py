@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from locations.models import LocationDailyStats
+from locations.rollups import COUNTERS, compute_from_scratch, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuilds LocationDailyStats from the visitor and task tables, or with --check only reports drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Compare the stored rollup with the base tables without writing.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            expected = compute_from_scratch()
+            stored = {
+                (row['location_id'], row['day']): {counter: row[counter] for counter in COUNTERS}
+                for row in LocationDailyStats.objects.values('location_id', 'day', *COUNTERS).iterator()
+            }
+            zero = dict.fromkeys(COUNTERS, 0)
+            drifted = 0
+            for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], k[1])):
+                want, have = expected.get(key, zero), stored.get(key, zero)
+                if want != have:
+                    drifted += 1
+                    changes = ', '.join(f'{c}: {have[c]} != {want[c]}' for c in COUNTERS if have[c] != want[c])
+                    self.stdout.write(f'location {key[0]} on {key[1]}: {changes}')
+            if drifted:
+                raise CommandError(f'{drifted} daily stats row(s) drifted from the base tables. Run without --check to rebuild.')
+            self.stdout.write(self.style.SUCCESS(f'{len(stored)} daily stats row(s) match the base tables.'))
+            return
+
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily stats row(s).'))
\ No newline at end of file
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('check_ins', models.PositiveIntegerField(default=0, help_text='Visitors checked in on this day.')),
+                ('check_outs', models.PositiveIntegerField(default=0, help_text='Visitors checked out on this day.')),
+                ('open_visits', models.PositiveIntegerField(default=0, help_text='Visitors checked in on this day and not yet checked out.')),
+                ('tasks_created', models.PositiveIntegerField(default=0)),
+                ('tasks_completed', models.PositiveIntegerField(default=0, help_text='Tasks whose completed_at falls on this day.')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='locations.location')),
+            ],
+            options={
+                'verbose_name': 'Location Daily Stats',
+                'verbose_name_plural': 'Location Daily Stats',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='locationdailystats',
+            constraint=models.UniqueConstraint(fields=('location', 'day'), name='unique_location_daily_stats'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def backfill_daily_stats(apps, schema_editor):
+    """Fills LocationDailyStats for the visitors and tasks that existed before the rollup (see rebuild_daily_stats)."""
+    from locations.rollups import rebuild
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_location_daily_stats'),
+        ('task_management', '0004_task_job_sequence'),
+        ('visitors', '0005_visitor_photo'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -12,4 +12,29 @@ class Location(models.Model):
     class Meta:
         ordering = ['name']
         verbose_name = "Data Center Location"
-        verbose_name_plural = "Data Center Locations"
\ No newline at end of file
+        verbose_name_plural = "Data Center Locations"
+
+class LocationDailyStats(models.Model):
+    """
+    Per-location, per-day dashboard counters. Maintained incrementally by signal
+    handlers in locations/signals.py and rebuilt/checked with `manage.py rebuild_daily_stats`.
+    Days are local dates in the project TIME_ZONE.
+    """
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    check_ins = models.PositiveIntegerField(default=0, help_text="Visitors checked in on this day.")
+    check_outs = models.PositiveIntegerField(default=0, help_text="Visitors checked out on this day.")
+    open_visits = models.PositiveIntegerField(default=0, help_text="Visitors checked in on this day and not yet checked out.")
+    tasks_created = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0, help_text="Tasks whose completed_at falls on this day.")
+
+    def __str__(self):
+        return f"{self.location.name} on {self.day}"
+
+    class Meta:
+        ordering = ['-day']
+        verbose_name = "Location Daily Stats"
+        verbose_name_plural = "Location Daily Stats"
+        constraints = [
+            models.UniqueConstraint(fields=['location', 'day'], name='unique_location_daily_stats'),
+        ]
@@ -0,0 +1,105 @@
+"""
+Process-wide registry of Location rows.
+
+Every visitor, task, gate pass and device storage row nests its location, and every write
+validates a location_id. Locations change about once a month, so instead of joining or
+querying them per request each process keeps them all in memory: saves and deletes in this
+process reload the registry (locations/signals.py), and writes made by other processes are
+picked up by the reload at the start of the first request after REFRESH_INTERVAL (or, for a
+new location_id, looked up on its own the first time it is asked for).
+"""
+import copy
+import threading
+import time
+
+REFRESH_INTERVAL = 60 # Seconds another process's location changes may take to show up here
+MISS_INTERVAL = 5 # Seconds before an id that matched no location is looked up again
+MAX_MISSES = 1000 # Remembered unknown ids; forgotten all at once beyond this
+
+
+class LocationRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (loaded_at, {id: Location}, {id: LocationSerializer data}), replaced as a whole so readers need no lock
+        self._snapshot = None
+        self._generation = 0 # Bumped by invalidate(), so a load that raced a change isn't kept
+        self._misses = {} # {location_id: monotonic time it matched no row}
+
+    def _load(self):
+        from .models import Location
+        from .serializers import LocationSerializer
+        with self._lock:
+            generation = self._generation
+            locations = {location.pk: location for location in Location.objects.all()}
+            representations = {location_id: dict(LocationSerializer(location).data) for location_id, location in locations.items()}
+            snapshot = (time.monotonic(), locations, representations)
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    def stale(self, location_ids=()):
+        """Whether the registry is older than REFRESH_INTERVAL or lacks any of `location_ids`."""
+        snapshot = self._snapshot
+        return (snapshot is None or time.monotonic() - snapshot[0] > REFRESH_INTERVAL
+                or any(location_id not in snapshot[1] for location_id in location_ids))
+
+    def ensure(self, location_ids=()):
+        if self.stale(location_ids):
+            self._load()
+
+    def _add(self, location_id):
+        """
+        Adds one location another process may have created since the last load to the current
+        snapshot, with a single-row query; ids that matched nothing are not queried again for
+        MISS_INTERVAL. Returns the snapshot, or None if it was invalidated meanwhile.
+        """
+        from .models import Location
+        from .serializers import LocationSerializer
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or location_id in snapshot[1]: # Invalidated, or added by another thread
+                return snapshot
+            now = time.monotonic()
+            if now - self._misses.get(location_id, -MISS_INTERVAL) < MISS_INTERVAL:
+                return snapshot
+            generation = self._generation
+            location = Location.objects.filter(pk=location_id).first()
+            if location is None:
+                if len(self._misses) >= MAX_MISSES:
+                    self._misses.clear()
+                self._misses[location_id] = now
+                return snapshot
+            snapshot = (snapshot[0], {**snapshot[1], location_id: location},
+                        {**snapshot[2], location_id: dict(LocationSerializer(location).data)})
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    def _lookup(self, location_id):
+        snapshot = self._snapshot
+        if snapshot is not None and location_id not in snapshot[1]:
+            snapshot = self._add(location_id)
+        return snapshot if snapshot is not None else self._load()
+
+    def get(self, location_id):
+        """A copy of the Location with this id, or None."""
+        location = self._lookup(location_id)[1].get(location_id)
+        return copy.copy(location) if location is not None else None
+
+    def representation(self, location_id):
+        """LocationSerializer data for this id, or None."""
+        representation = self._lookup(location_id)[2].get(location_id)
+        return dict(representation) if representation is not None else None
+
+    def version(self):
+        """(number of locations, newest updated_at) as currently loaded, for response validators."""
+        locations = self._snapshot[1] if self._snapshot is not None else {}
+        return len(locations), max((location.updated_at for location in locations.values()), default=None)
+
+    def invalidate(self):
+        self._generation += 1
+        self._snapshot = None
+        self._misses = {}
+
+
+location_registry = LocationRegistry()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Incremental maintenance of LocationDailyStats.
+
+Each Visitor and Task row "contributes" +1 to a few (location, day, counter) cells.
+On save the contribution of the previous state (snapshotted at load time) is
+subtracted and that of the new state added, so creates, edits, checkouts and
+completions all reduce to a handful of `UPDATE ... SET x = x + n` statements.
+"""
+from collections import Counter, defaultdict
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import LocationDailyStats
+
+COUNTERS = ('check_ins', 'check_outs', 'open_visits', 'tasks_created', 'tasks_completed')
+
+
+def _day(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def visitor_contribution(visitor):
+    cells = Counter()
+    if visitor.location_id is None or visitor.checkInTime is None:
+        return cells
+    check_in_day = _day(visitor.checkInTime)
+    cells[(visitor.location_id, check_in_day, 'check_ins')] += 1
+    if visitor.checkOutTime:
+        cells[(visitor.location_id, _day(visitor.checkOutTime), 'check_outs')] += 1
+    else:
+        cells[(visitor.location_id, check_in_day, 'open_visits')] += 1
+    return cells
+
+
+def task_contribution(task):
+    cells = Counter()
+    if task.location_id is None or task.created_at is None:
+        return cells
+    cells[(task.location_id, _day(task.created_at), 'tasks_created')] += 1
+    if task.is_completed and task.completed_at:
+        cells[(task.location_id, _day(task.completed_at), 'tasks_completed')] += 1
+    return cells
+
+
+def apply_deltas(deltas):
+    """Adds {(location_id, day, counter): delta} to the stats rows, creating rows as needed."""
+    rows = defaultdict(dict)
+    for (location_id, day, counter), delta in deltas.items():
+        if delta:
+            rows[(location_id, day)][counter] = delta
+
+    for (location_id, day), changes in rows.items():
+        # Clamped at zero so drift can never make a save fail on the positive-integer check.
+        increments = {counter: Greatest(F(counter) + delta, Value(0)) for counter, delta in changes.items()}
+        if LocationDailyStats.objects.filter(location_id=location_id, day=day).update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                LocationDailyStats.objects.create(
+                    location_id=location_id, day=day,
+                    **{counter: max(delta, 0) for counter, delta in changes.items()}
+                )
+        except IntegrityError:
+            # Another request created the row first.
+            LocationDailyStats.objects.filter(location_id=location_id, day=day).update(**increments)
+
+
+def diff(old, new):
+    deltas = Counter(new)
+    deltas.subtract(old)
+    return deltas
+
+
+def compute_from_scratch(apps=global_apps):
+    """
+    Returns {(location_id, day): {counter: value}} computed from the base tables.
+    Migrations pass their historical `apps`.
+    """
+    Visitor = apps.get_model('visitors', 'Visitor')
+    Task = apps.get_model('task_management', 'Task')
+
+    sources = [
+        ('check_ins', Visitor.objects.all(), 'checkInTime'),
+        ('check_outs', Visitor.objects.filter(checkOutTime__isnull=False), 'checkOutTime'),
+        ('open_visits', Visitor.objects.filter(checkOutTime__isnull=True), 'checkInTime'),
+        ('tasks_created', Task.objects.all(), 'created_at'),
+        ('tasks_completed', Task.objects.filter(is_completed=True, completed_at__isnull=False), 'completed_at'),
+    ]
+    stats = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for counter, queryset, field in sources:
+        grouped = (queryset.order_by().annotate(day=TruncDate(field))
+                   .values('location_id', 'day').annotate(total=Count('id')))
+        for row in grouped:
+            stats[(row['location_id'], row['day'])][counter] = row['total']
+    return stats
+
+
+
+
+def rebuild(apps=global_apps):
+    """Replaces every LocationDailyStats row with compute_from_scratch(apps); returns the number of rows."""
+    stats_model = apps.get_model('locations', 'LocationDailyStats')
+    expected = compute_from_scratch(apps)
+    with transaction.atomic():
+        stats_model.objects.all().delete()
+        stats_model.objects.bulk_create(
+            [stats_model(location_id=location_id, day=day, **counters) for (location_id, day), counters in expected.items()],
+            batch_size=1000,
+        )
+    return len(expected)
\ No newline at end of file
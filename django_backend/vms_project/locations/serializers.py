@@ -1,7 +1,46 @@
 from rest_framework import serializers
-from .models import Location
+from .models import Location, LocationDailyStats
+from .registry import location_registry
 
 class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Location
-        fields = ['id', 'name', 'description']
\ No newline at end of file
+        fields = ['id', 'name', 'description']
+
+
+class RegisteredLocationField(serializers.Field):
+    """Read-only nested location ({id, name, description}) from the location registry, without a join."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'location_id')
+        super().__init__(**kwargs)
+
+    def to_representation(self, location_id):
+        return location_registry.representation(location_id)
+
+
+class RegisteredLocationPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """location_id input, checked against the location registry instead of a query per request."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Location.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            location_id = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        location = location_registry.get(location_id)
+        if location is None:
+            self.fail('does_not_exist', pk_value=data)
+        return location
+
+
+class LocationDailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LocationDailyStats
+        fields = ['location_id', 'day', 'check_ins', 'check_outs', 'open_visits', 'tasks_created', 'tasks_completed']
\ No newline at end of file
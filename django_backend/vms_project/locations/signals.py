@@ -0,0 +1,63 @@
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from visitors.models import Visitor
+from task_management.models import Task
+from .models import Location
+from .registry import location_registry
+from .rollups import visitor_contribution, task_contribution, apply_deltas, diff
+
+CONTRIBUTIONS = {
+    Visitor: (visitor_contribution, ('location_id', 'checkInTime', 'checkOutTime')),
+    Task: (task_contribution, ('location_id', 'created_at', 'is_completed', 'completed_at')),
+}
+
+
+def _snapshot(instance):
+    contribution, fields = CONTRIBUTIONS[type(instance)]
+    # Instances loaded with deferred fields are not snapshotted (that would cost a query);
+    # saves of those are left to `manage.py rebuild_daily_stats`.
+    if all(field in instance.__dict__ for field in fields):
+        instance._daily_stats_snapshot = contribution(instance)
+
+
+@receiver(post_init, sender=Visitor)
+@receiver(post_init, sender=Task)
+def snapshot_daily_stats(sender, instance, **kwargs):
+    if instance.pk is not None:
+        _snapshot(instance)
+
+
+@receiver(post_save, sender=Visitor)
+@receiver(post_save, sender=Task)
+def update_daily_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = {} if created else instance.__dict__.get('_daily_stats_snapshot')
+    if old is None:
+        return
+    contribution, _ = CONTRIBUTIONS[sender]
+    apply_deltas(diff(old, contribution(instance)))
+    _snapshot(instance)
+
+
+@receiver(post_delete, sender=Visitor)
+@receiver(post_delete, sender=Task)
+def remove_from_daily_stats(sender, instance, **kwargs):
+    old = instance.__dict__.get('_daily_stats_snapshot')
+    if old:
+        apply_deltas(diff(old, {}))
+
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def reload_location_registry(sender, **kwargs):
+    transaction.on_commit(location_registry.invalidate) # Not before, or another thread could reload the old row
+
+
+@receiver(request_started)
+def refresh_location_registry(sender, **kwargs):
+    # Picks up other processes' location changes; runs on a worker thread under ASGI too.
+    location_registry.ensure()
\ No newline at end of file
@@ -0,0 +1,85 @@
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from forms_module.tests import LocationScopedAPITestCase
+from locations.models import Location, LocationDailyStats
+from locations.registry import LocationRegistry, location_registry
+from users.models import User
+from visitors.models import Visitor
+
+backfill = import_module('locations.migrations.0003_backfill_daily_stats')
+
+
+class BackfillTests(LocationScopedAPITestCase):
+    def test_migration_counts_rows_that_predate_the_rollup(self):
+        url = '/api/task-management/tasks/completed-today-count/'
+        self.create_visitors(6) # bulk_create skips the signals, like rows saved before 0002
+        tasks = self.create_tasks(4)
+        self.assertFalse(LocationDailyStats.objects.exists())
+        self.assertEqual(self.client.get(url).json()['count'], 0)
+
+        backfill.backfill_daily_stats(apps, None)
+        call_command('rebuild_daily_stats', '--check', stdout=StringIO())
+        completed_today = sum(1 for task in tasks if task.completed_at and timezone.localdate(task.completed_at) == timezone.localdate())
+        self.assertEqual(self.client.get(url).json()['count'], completed_today)
+
+
+class RegistryTests(TestCase):
+    def setUp(self):
+        self.registry = LocationRegistry()
+        self.known = Location.objects.create(name='Known')
+        self.registry.ensure()
+
+    def test_new_location_is_looked_up_on_its_own(self):
+        created = Location.objects.bulk_create([Location(name='Created elsewhere')])[0] # No signals, as in another process
+        with self.assertNumQueries(1):
+            self.assertEqual(self.registry.get(created.pk).name, 'Created elsewhere')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.registry.representation(created.pk)['name'], 'Created elsewhere')
+            self.assertEqual(self.registry.get(self.known.pk).name, 'Known')
+
+    def test_unknown_ids_are_rate_limited(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(self.registry.get(-1))
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.registry.get(-1))
+        with mock.patch('locations.registry.MISS_INTERVAL', 0), self.assertNumQueries(1):
+            self.assertIsNone(self.registry.get(-1))
+        self.registry.invalidate() # As after a save in this process
+        self.registry.ensure()
+        with self.assertNumQueries(1):
+            self.assertIsNone(self.registry.get(-1))
+
+
+# The foreign key is checked when the transaction commits, so the test can't run inside one.
+class DeletedLocationTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        location_registry.invalidate()
+        self.addCleanup(location_registry.invalidate)
+        self.location = Location.objects.create(name='Soon deleted')
+        user = User.objects.create_user(username='desk@example.com', email='desk@example.com', password='desk-password',
+                                        is_approved_by_admin=True)
+        user.authorized_locations.add(self.location)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def test_location_deleted_by_another_process(self):
+        self.client.get('/api/visitors/') # Caches the user's locations and loads the registry
+        with connection.cursor() as cursor: # Without signals, so both caches still have it
+            cursor.execute('DELETE FROM users_user_authorized_locations')
+            cursor.execute('DELETE FROM locations_location WHERE id = %s', [self.location.pk])
+        response = self.client.post('/api/visitors/', {'location_id': self.location.pk, 'fullName': 'Visitor'}, format='json')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('location_id', response.json())
+        self.assertFalse(Visitor.objects.exists())
\ No newline at end of file
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LocationViewSet
+from .views import LocationViewSet, LocationDailyStatsView
 
 router = DefaultRouter()
 router.register(r'', LocationViewSet, basename='location')
 
 urlpatterns = [
+    path('daily-stats/', LocationDailyStatsView.as_view(), name='location_daily_stats'), # Before the router so it isn't read as a pk
     path('', include(router.urls)),
 ]
\ No newline at end of file
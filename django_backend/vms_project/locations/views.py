@@ -1,8 +1,49 @@
-from rest_framework import viewsets, permissions
-from .models import Location
-from .serializers import LocationSerializer
+from datetime import datetime, timedelta
+from django.utils import timezone
+from rest_framework import viewsets, permissions, generics
+from rest_framework.exceptions import ParseError, PermissionDenied
+from users.authorization import get_authorized_location_ids
+from .models import Location, LocationDailyStats
+from .serializers import LocationSerializer, LocationDailyStatsSerializer
 
 class LocationViewSet(viewsets.ModelViewSet):
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
-    permission_classes = [permissions.IsAdminUser] # Only admins can manage locations
\ No newline at end of file
+    permission_classes = [permissions.IsAdminUser] # Only admins can manage locations
+
+
+class LocationDailyStatsView(generics.ListAPIView):
+    """
+    Dashboard counters per location and day, read from the LocationDailyStats rollup
+    so the cost is O(days) regardless of how many visitors or tasks there are.
+    ?start_date / ?end_date (YYYY-MM-DD, default: the last 30 days), optional ?location_id.
+    """
+    serializer_class = LocationDailyStatsSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        authorized_location_ids = get_authorized_location_ids(self.request.user)
+        if not authorized_location_ids:
+            raise PermissionDenied('User not approved or has no authorized locations.')
+
+        params = self.request.query_params
+        try:
+            end_date = datetime.strptime(params['end_date'], '%Y-%m-%d').date() if params.get('end_date') else timezone.localdate()
+            start_date = datetime.strptime(params['start_date'], '%Y-%m-%d').date() if params.get('start_date') else end_date - timedelta(days=29)
+        except ValueError:
+            raise ParseError('Invalid date format. Please use YYYY-MM-DD.')
+
+        location_ids = authorized_location_ids
+        if params.get('location_id'):
+            try:
+                location_id = int(params['location_id'])
+            except ValueError:
+                raise ParseError('Invalid location_id format.')
+            if location_id not in authorized_location_ids:
+                raise PermissionDenied('Not authorized for this location.')
+            location_ids = [location_id]
+
+        return LocationDailyStats.objects.filter(
+            location_id__in=location_ids, day__gte=start_date, day__lte=end_date
+        ).order_by('day', 'location_id')
\ No newline at end of file
@@ -0,0 +1,98 @@
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, IntegrityError
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from locations.models import Location
+from task_management.models import Task, TaskJobSequence
+
+
+def create_tasks(location_id, count, label):
+    """Creates `count` tasks and returns (per-create latencies in ms, IntegrityError count)."""
+    latencies, failures = [], 0
+    try:
+        for i in range(count):
+            started = time.perf_counter()
+            try:
+                Task.objects.create(
+                    location_id=location_id, job_date=timezone.localdate(), job_title=f'Benchmark {label}-{i}',
+                    full_name='Benchmark', company_name='Benchmark', rack_number='R0', encoded_by='benchmark_job_ids',
+                )
+            except IntegrityError:
+                failures += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection.close()
+    return latencies, failures
+
+
+def _thread_worker(args):
+    return create_tasks(*args)
+
+
+def _process_worker(args):
+    # Each forked process runs its own thread pool, so threads and processes contend together.
+    location_id, count, threads, label = args
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(_thread_worker, [(location_id, count, f'{label}.{t}') for t in range(threads)]))
+
+
+class Command(BaseCommand):
+    help = ("Creates tasks at one location from several processes and threads at once, then checks "
+            "that every job_id is unique and contiguous and that allocation time stays flat.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=4, help='Threads per process.')
+        parser.add_argument('--tasks', type=int, default=250, help='Tasks created by each thread.')
+        parser.add_argument('--location-name', default='Job ID Benchmark')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark tasks afterwards.')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            raise CommandError('SQLite serializes all writers; run this against PostgreSQL.')
+
+        location, _ = Location.objects.get_or_create(name=options['location_name'])
+        tasks = Task.objects.filter(location=location)
+        before = tasks.count()
+        last_number = (TaskJobSequence.objects.filter(location=location).values_list('last_value', flat=True).first()
+                       or tasks.aggregate(m=Max('job_number'))['m'] or 0)
+        processes, threads, per_thread = options['processes'], options['threads'], options['tasks']
+
+        connections.close_all() # Never share a connection with forked children
+        started = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            results = pool.map(_process_worker, [(location.pk, per_thread, threads, f'p{p}') for p in range(processes)])
+        elapsed = time.perf_counter() - started
+
+        per_worker = [worker for process in results for worker in process]
+        failures = sum(f for _, f in per_worker)
+        latencies = [ms for worker_latencies, _ in per_worker for ms in worker_latencies]
+        # Compare the first and last tenth of each worker's creates to show the cost does not grow.
+        tenth = max(1, per_thread // 10)
+        early = [ms for worker_latencies, _ in per_worker for ms in worker_latencies[:tenth]]
+        late = [ms for worker_latencies, _ in per_worker for ms in worker_latencies[-tenth:]]
+
+        created = tasks.count() - before
+        duplicates = tasks.values('job_number').annotate(n=Count('id')).filter(n__gt=1).count()
+        numbers = sorted(tasks.filter(job_number__gt=last_number).values_list('job_number', flat=True))
+        contiguous = numbers == list(range(last_number + 1, last_number + created + 1))
+
+        latencies.sort()
+        self.stdout.write(f'{processes} processes x {threads} threads x {per_thread} tasks in {elapsed:.2f}s '
+                          f'({created / elapsed:.0f} creates/s)')
+        self.stdout.write(f'created={created} integrity_errors={failures} duplicate_job_numbers={duplicates} contiguous={contiguous}')
+        self.stdout.write(f'latency p50={statistics.median(latencies):.2f}ms '
+                          f'p99={latencies[int(len(latencies) * 0.99) - 1]:.2f}ms')
+        self.stdout.write(f'median first 10%={statistics.median(early):.2f}ms last 10%={statistics.median(late):.2f}ms')
+
+        if not options['keep']:
+            tasks.filter(encoded_by='benchmark_job_ids').delete()
+
+        if failures or duplicates or not contiguous:
+            raise CommandError('Job ID allocation produced duplicates or failures.')
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_management', '0002_task_created_by_email_task_created_by_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['location', '-created_at', 'id'], name='task_loc_created_id_idx'),
+        ),
+    ]
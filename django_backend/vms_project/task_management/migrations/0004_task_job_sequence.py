@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_job_numbers(apps, schema_editor):
+    """Backfills job_number from numeric job_ids and seeds each location's sequence with its max."""
+    Task = apps.get_model('task_management', 'Task')
+    TaskJobSequence = apps.get_model('task_management', 'TaskJobSequence')
+
+    max_by_location = {}
+    for task in Task.objects.only('id', 'location_id', 'job_id').iterator():
+        if task.job_id and task.job_id.isdigit():
+            number = int(task.job_id)
+            Task.objects.filter(pk=task.pk).update(job_number=number)
+            max_by_location[task.location_id] = max(number, max_by_location.get(task.location_id, 0))
+
+    TaskJobSequence.objects.bulk_create(
+        [TaskJobSequence(location_id=location_id, last_value=last_value) for location_id, last_value in max_by_location.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('task_management', '0003_task_loc_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskJobSequence',
+            fields=[
+                ('location', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_job_sequence', serialize=False, to='locations.location')),
+                ('last_value', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Task Job ID Sequence',
+                'verbose_name_plural': 'Task Job ID Sequences',
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='job_number',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_job_numbers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('location', 'job_number'), name='unique_task_location_job_number'),
+        ),
+    ]
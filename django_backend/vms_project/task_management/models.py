@@ -1,5 +1,5 @@
-from django.db import models
-from django.db.models import Max # For auto-incrementing job_id
+from django.db import models, connection, transaction
+from django.db.models import Max
 from django.utils import timezone
 from locations.models import Location 
 from django.conf import settings # To get User model
@@ -9,6 +9,8 @@ class Task(models.Model):
     job_date = models.DateField()
     # job_id will be auto-generated, make it not directly editable by user through API form
     job_id = models.CharField(max_length=100, editable=False, help_text="Auto-generated Job ID (e.g., LOC-0001)") 
+    # Numeric value behind job_id, allocated from TaskJobSequence. Use it for numeric ordering ("10" sorts after "9").
+    job_number = models.PositiveIntegerField(null=True, blank=True, editable=False)
     job_title = models.CharField(max_length=255)
     full_name = models.CharField(max_length=255, help_text="Client or contact person's full name for the task")
     company_name = models.CharField(max_length=255)
@@ -38,29 +40,14 @@ class Task(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
-        if not self.job_id and self.location:
-            # Generate a simple auto-incrementing job_id per location
-            # This is a basic example, consider more robust strategies for production
-            # (e.g., using a separate sequence, UUIDs, or more complex prefixes)
-            last_task_agg = Task.objects.filter(location=self.location).aggregate(max_numeric_job_id=Max('job_id'))
-            
-            current_max_numeric = 0
-            if last_task_agg['max_numeric_job_id']:
-                try:
-                    # Assuming job_id is purely numeric for simplicity in this example
-                    # If you use prefixes like "TASK-", you'll need to parse the numeric part
-                    current_max_numeric = int(last_task_agg['max_numeric_job_id'])
-                except ValueError:
-                    # Handle cases where job_id might not be purely numeric or parsing fails
-                    # For example, count existing tasks for a fallback or use a timestamp
-                    current_max_numeric = Task.objects.filter(location=self.location).count() 
-
-            next_numeric_id = current_max_numeric + 1
-            
-            # Example job_id format: "KTM-0001" (Location Prefix - Sequential Number)
-            # self.job_id = f"{self.location.name[:3].upper()}-{next_numeric_id:04d}" 
-            # For simpler purely numeric job_id:
-            self.job_id = str(next_numeric_id)
+        if not self.job_id and self.location_id:
+            # Allocate and insert in one transaction: the sequence row stays locked until commit,
+            # and a failed insert rolls the allocation back, so numbers are unique and gap-free.
+            with transaction.atomic():
+                self.job_number = TaskJobSequence.allocate(self.location_id)
+                self.job_id = str(self.job_number)
+                super().save(*args, **kwargs)
+            return
 
         super().save(*args, **kwargs)
 
@@ -72,4 +59,45 @@ class Task(models.Model):
         ordering = ['-job_date', '-created_at']
         # Make job_id unique per location. If job_id format is complex, this might need adjustment.
         # If job_id is generated purely sequentially per location, this is appropriate.
-        unique_together = (('location', 'job_id'),) 
\ No newline at end of file
+        unique_together = (('location', 'job_id'),) 
+        constraints = [
+            models.UniqueConstraint(fields=['location', 'job_number'], name='unique_task_location_job_number'),
+        ]
+        indexes = [
+            # Serves location-scoped lists ordered by creation time, including keyset pages.
+            models.Index(fields=['location', '-created_at', 'id'], name='task_loc_created_id_idx'),
+        ]
+
+
+class TaskJobSequence(models.Model):
+    """
+    Per-location counter for Task.job_number. Allocation is a single
+    `UPDATE ... SET last_value = last_value + 1 ... RETURNING last_value`, which takes a
+    row lock, so concurrent creates at one location queue on that row instead of racing
+    into the (location, job_id) unique constraint, and the cost does not grow with the table.
+    """
+    location = models.OneToOneField(Location, on_delete=models.CASCADE, primary_key=True, related_name='task_job_sequence')
+    last_value = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.location.name}: {self.last_value}"
+
+    class Meta:
+        verbose_name = "Task Job ID Sequence"
+        verbose_name_plural = "Task Job ID Sequences"
+
+    @classmethod
+    def allocate(cls, location_id):
+        """Returns the next job number for the location. Call inside a transaction."""
+        sql = f'UPDATE {connection.ops.quote_name(cls._meta.db_table)} SET last_value = last_value + 1 WHERE location_id = %s RETURNING last_value'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [location_id])
+            row = cursor.fetchone()
+            if row is None:
+                # First task at this location since the sequence existed: seed it from existing tasks.
+                # ignore_conflicts covers a concurrent request seeding the same row.
+                current_max = Task.objects.filter(location_id=location_id).aggregate(m=Max('job_number'))['m'] or 0
+                cls.objects.bulk_create([cls(location_id=location_id, last_value=current_max)], ignore_conflicts=True)
+                cursor.execute(sql, [location_id])
+                row = cursor.fetchone()
+        return row[0]
@@ -1,13 +1,12 @@
 from rest_framework import serializers
 from .models import Task
-from locations.models import Location
-from locations.serializers import LocationSerializer
+from locations.serializers import RegisteredLocationField, RegisteredLocationPrimaryKeyField
+from forms_module.fieldsets import SparseFieldsetSerializerMixin, collapsed_id
 
-class TaskSerializer(serializers.ModelSerializer):
-    location = LocationSerializer(read_only=True) # For displaying location details
-    location_id = serializers.PrimaryKeyRelatedField(
-        queryset=Location.objects.all(), source='location', write_only=True # For creating/updating with location ID
-    )
+class TaskSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {'location': collapsed_id('location_id')}
+    location = RegisteredLocationField() # For displaying location details (from the location registry, no join)
+    location_id = RegisteredLocationPrimaryKeyField(source='location', write_only=True) # For creating/updating with location ID
     # job_id is now auto-generated by the model's save method, so it should be read-only in the API
     job_id = serializers.CharField(read_only=True) 
 
@@ -1,10 +1,22 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet
+from forms_module.async_views import read_async, router_views
+from .views import TaskViewSet, AsyncTaskReads
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet, basename='task') # Will create /tasks/, /tasks/{id}/ etc.
 
-urlpatterns = [
+urlpatterns = []
+
+if settings.ASYNC_READ_VIEWS: # Under ASGI, GETs on the busiest routes are served by async views
+    reads, sync_views = AsyncTaskReads(TaskViewSet), router_views(router)
+    urlpatterns += [
+        re_path(r'^tasks/$', read_async(reads.list, sync_views['task-list'])),
+        re_path(r'^tasks/completed-today-count/$', read_async(reads.completed_today_count, sync_views['task-completed-today-count'])),
+        re_path(r'^tasks/(?P<pk>[^/.]+)/$', read_async(reads.retrieve, sync_views['task-detail'])),
+    ]
+
+urlpatterns += [
     path('', include(router.urls)),
 ]
\ No newline at end of file
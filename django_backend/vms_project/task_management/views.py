@@ -3,15 +3,21 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db.models import Sum
+from locations.models import LocationDailyStats
 from .models import Task
 from .serializers import TaskSerializer
 # Import the BaseLocationScopedViewSet from forms_module or a common module
 # Assuming it's in forms_module for now as per previous context
 from forms_module.views import BaseLocationScopedViewSet 
+from forms_module.async_views import AsyncLocationScopedReads
+from users.authorization import get_authorized_location_ids, authorized_locations_subquery
 
 class TaskViewSet(BaseLocationScopedViewSet): # Inherit from BaseLocationScopedViewSet
-    queryset = Task.objects.all().order_by('-created_at') # Base queryset
+    queryset = Task.objects.order_by('-created_at') # Base queryset; the nested location comes from the location registry
     serializer_class = TaskSerializer
+    cursor_ordering = ('-created_at', 'id') # Backed by task_loc_created_id_idx
+    values_actions = ('list',) # Pages built from values() rows (forms_module/projection.py)
     filter_backends = [
         DjangoFilterBackend, 
         drf_filters.SearchFilter, 
@@ -48,6 +54,7 @@ class TaskViewSet(BaseLocationScopedViewSet): # Inherit from BaseLocationScopedV
     ordering_fields = [
         'job_date', 
         'job_id', 
+        'job_number', # Numeric order of job_id
         'job_title', 
         'full_name', 
         'company_name', 
@@ -76,32 +83,58 @@ class TaskViewSet(BaseLocationScopedViewSet): # Inherit from BaseLocationScopedV
             serializer.save()
 
 
-    @action(detail=False, methods=['get'], url_path='completed-today-count')
-    def completed_today_count(self, request):
-        user = self.request.user
-        location_id_filter = self.request.query_params.get('location_id')
+    def get_completed_today_queryset(self, request):
+        """
+        Today's LocationDailyStats rows for ?location_id or all the user's locations.
+        Returns (queryset, None) or (None, error_response).
+        """
+        user = request.user
+        location_id_filter = request.query_params.get('location_id')
         
         if not user.is_approved_by_admin:
-            return Response({'count': 0, 'detail': 'User not approved'}, status=status.HTTP_403_FORBIDDEN)
+            return None, Response({'count': 0, 'detail': 'User not approved'}, status=status.HTTP_403_FORBIDDEN)
 
-        authorized_location_ids = user.authorized_locations.values_list('id', flat=True)
+        authorized_location_ids = get_authorized_location_ids(user)
         if not authorized_location_ids:
-            return Response({'count': 0, 'detail': 'No authorized locations'}, status=status.HTTP_403_FORBIDDEN)
+            return None, Response({'count': 0, 'detail': 'No authorized locations'}, status=status.HTTP_403_FORBIDDEN)
 
-        query_filters = {'is_completed': True, 'completed_at__date': timezone.now().date()}
+        # Read from the daily rollup (one row per location) instead of counting task rows.
+        query_filters = {'day': timezone.localdate()}
         
         if location_id_filter:
             try:
                 location_id_filter_int = int(location_id_filter)
                 if location_id_filter_int not in authorized_location_ids:
-                    return Response({'count': 0, 'detail': 'Not authorized for this location'}, status=status.HTTP_403_FORBIDDEN)
+                    return None, Response({'count': 0, 'detail': 'Not authorized for this location'}, status=status.HTTP_403_FORBIDDEN)
                 query_filters['location_id'] = location_id_filter_int
             except ValueError:
-                 return Response({'count': 0, 'detail': 'Invalid location_id format.'}, status=status.HTTP_400_BAD_REQUEST)
+                 return None, Response({'count': 0, 'detail': 'Invalid location_id format.'}, status=status.HTTP_400_BAD_REQUEST)
         else:
             # If no specific location, count for all authorized locations by default for this specific action
             # Or, you could require a location_id if that's preferred.
-            query_filters['location_id__in'] = authorized_location_ids
+            query_filters['location_id__in'] = authorized_locations_subquery(user)
             
-        count = Task.objects.filter(**query_filters).count()
+        return LocationDailyStats.objects.filter(**query_filters), None
+
+    @action(detail=False, methods=['get'], url_path='completed-today-count')
+    def completed_today_count(self, request):
+        stats, error_response = self.get_completed_today_queryset(request)
+        if error_response is not None:
+            return error_response
+        count = stats.aggregate(count=Sum('tasks_completed'))['count'] or 0
+        return Response({'count': count}, status=status.HTTP_200_OK)
+
+
+class AsyncTaskReads(AsyncLocationScopedReads):
+    """TaskViewSet's list, retrieve and completed-today-count for ASGI (see forms_module/async_views.py)."""
+
+    async def completed_today_count(self, request):
+        return await self.respond(self._completed_today_count, request)
+
+    async def _completed_today_count(self, request):
+        view = await self.view_for(request, 'completed_today_count')
+        stats, error_response = view.get_completed_today_queryset(view.request)
+        if error_response is not None:
+            return error_response
+        count = (await stats.aaggregate(count=Sum('tasks_completed')))['count'] or 0
         return Response({'count': count}, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Cached location authorization for the location-scoped API viewsets.
+
+Every request to visitors, gate passes, device storage and tasks needs the set of
+location ids the current user may access. The set is cached per user under a key
+that includes `User.authz_version`, which is loaded with the user row by the JWT
+authentication anyway. Changing a user's locations or approval bumps the version
+(see users/signals.py), so stale entries are simply never read again and expire.
+"""
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import User
+
+AUTHZ_CACHE_TIMEOUT = 60 * 60 # Seconds. Entries are also invalidated by version bumps.
+
+
+def _cache_key(user):
+    return f"users:authz:{user.pk}:{user.authz_version}"
+
+
+def get_authorized_location_ids(user):
+    """
+    Returns a frozenset of the location ids the user is authorized for.
+    Unapproved or anonymous users get an empty set. The result is memoized on the
+    user instance for the rest of the request and in the cache across requests.
+    """
+    if not user.is_authenticated or not user.is_approved_by_admin:
+        return frozenset()
+
+    memo = getattr(user, '_authorized_location_ids', None)
+    if memo is not None and memo[0] == user.authz_version:
+        return memo[1]
+
+    key = _cache_key(user)
+    location_ids = cache.get(key)
+    if location_ids is None:
+        location_ids = frozenset(user.authorized_locations.values_list('id', flat=True))
+        cache.set(key, location_ids, AUTHZ_CACHE_TIMEOUT)
+
+    user._authorized_location_ids = (user.authz_version, location_ids)
+    return location_ids
+
+
+def authorized_locations_subquery(user):
+    """
+    Subquery of the user's location ids on the user/location through table.
+    Used as `location_id__in=...` so scoping stays a single SQL predicate that is
+    answered from the through table's (user_id, location_id) unique index.
+    """
+    return User.authorized_locations.through.objects.filter(user_id=user.pk).values('location_id')
+
+
+def bump_authz_version(user_ids):
+    """Invalidates cached authorization for the given users."""
+    User.objects.filter(pk__in=list(user_ids)).update(authz_version=F('authz_version') + 1)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_authorized_locations_user_is_approved_by_admin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='authz_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
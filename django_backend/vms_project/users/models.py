@@ -12,6 +12,20 @@ class User(AbstractUser):
         related_name='authorized_users',
         help_text="Locations this user is authorized to access data for."
     )
+    # Bumped whenever authorized_locations or is_approved_by_admin changes (see users/signals.py).
+    # It is loaded with the user row on every request, so cached authorization can be keyed on it.
+    authz_version = models.PositiveIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        # authz_version only ever changes through bump_authz_version()'s F() update. Writing the
+        # loaded value back (admin forms, serializers) could undo a concurrent bump and revive
+        # the cache entry for revoked locations, so updates leave it out.
+        if not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [field.name for field in self._meta.concrete_fields if not field.primary_key]
+            kwargs['update_fields'] = [name for name in update_fields if name != 'authz_version']
+        super().save(*args, **kwargs)
 
     # USERNAME_FIELD = 'email' # If you want to log in with email
     # REQUIRED_FIELDS = ['username'] # If USERNAME_FIELD is 'email'
@@ -0,0 +1,42 @@
+from django.db.models.signals import m2m_changed, post_init, post_save, pre_delete
+from django.dispatch import receiver
+from locations.models import Location
+from .models import User
+from .authorization import bump_authz_version
+
+
+@receiver(m2m_changed, sender=User.authorized_locations.through)
+def authorized_locations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # Changed from the Location side (location.authorized_users); pk_set holds user ids.
+        if action == 'pre_clear':
+            instance._authz_cleared_user_ids = list(instance.authorized_users.values_list('pk', flat=True))
+        elif action == 'post_clear':
+            bump_authz_version(instance.__dict__.pop('_authz_cleared_user_ids', []))
+        elif action in ('post_add', 'post_remove') and pk_set:
+            bump_authz_version(pk_set)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        bump_authz_version([instance.pk])
+        instance.authz_version += 1 # Keep the in-memory instance in step with the row
+
+
+@receiver(post_init, sender=User)
+def remember_approval_state(sender, instance, **kwargs):
+    # Skip deferred loads so this never triggers an extra query.
+    if 'is_approved_by_admin' in instance.__dict__:
+        instance._authz_loaded_approval = instance.is_approved_by_admin
+
+
+@receiver(post_save, sender=User)
+def approval_changed(sender, instance, created, **kwargs):
+    loaded = instance.__dict__.get('_authz_loaded_approval')
+    if not created and loaded is not None and loaded != instance.is_approved_by_admin:
+        bump_authz_version([instance.pk])
+        instance.authz_version += 1
+    instance._authz_loaded_approval = instance.is_approved_by_admin
+
+
+@receiver(pre_delete, sender=Location)
+def location_deleted(sender, instance, **kwargs):
+    # Deleting a location cascades through the m2m table without firing m2m_changed.
+    bump_authz_version(instance.authorized_users.values_list('pk', flat=True))
@@ -0,0 +1,23 @@
+from django.test import TestCase
+
+from locations.models import Location
+from .authorization import bump_authz_version
+from .models import User
+
+
+class AuthzVersionTests(TestCase):
+    def test_save_keeps_a_concurrent_bump(self):
+        user = User.objects.create_user(username='desk@example.com', email='desk@example.com', password='desk-password')
+        loaded = User.objects.get(pk=user.pk)
+        user.authorized_locations.add(Location.objects.create(name='Revoked Later')) # Another request bumps the version
+        loaded.first_name = 'Desk'
+        loaded.save() # e.g. an admin form loaded before the bump
+        user.refresh_from_db()
+        self.assertEqual((user.first_name, user.authz_version), ('Desk', 1))
+
+    def test_partial_save_never_writes_it(self):
+        user = User.objects.create_user(username='desk@example.com', email='desk@example.com', password='desk-password')
+        bump_authz_version([user.pk])
+        user.save(update_fields=['authz_version', 'last_name'])
+        user.refresh_from_db()
+        self.assertEqual(user.authz_version, 1)
\ No newline at end of file
@@ -8,10 +8,11 @@ class VisitorAdmin(admin.ModelAdmin):
     search_fields = ('location__name', 'fullName', 'idNumberType', 'contact', 'email', 'reason', 'created_by_name', 'created_by_email')
     date_hierarchy = 'checkInTime'
     readonly_fields = ('created_at', 'updated_at', 'created_by_name', 'created_by_email') 
+    raw_id_fields = ('photo',) # A select would list every stored image
 
     fieldsets = (
         (None, {
-            'fields': ('location', 'fullName', 'idNumberType', 'contact', 'email')
+            'fields': ('location', 'fullName', 'idNumberType', 'contact', 'email', 'photo')
         }),
         ('Visit Details', {
             'fields': ('reason', 'approvedBy', 'requestedBy', 'requestSource')
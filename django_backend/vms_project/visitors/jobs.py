@@ -0,0 +1,29 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+
+from jobs.queue import job
+from .models import Visitor
+
+
+def end_of_local_day(value):
+    """The last instant of `value`'s day in the current time zone."""
+    return timezone.make_aware(datetime.combine(timezone.localdate(value), time.max))
+
+
+@job
+def auto_checkout_open_visits():
+    """
+    Checks out visitors still checked in from an earlier day (scheduled just after midnight in JOB_SCHEDULE).
+    The visit is closed at the end of its check-in day and marked auto_checked_out_at, so the daily
+    stats count the checkout on that day and reports leave it out of dwell times. Rows are saved
+    one by one so the daily stats rollups see the checkout.
+    """
+    start_of_today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    checked_out = 0
+    for visitor in Visitor.objects.filter(checkOutTime__isnull=True, checkInTime__lt=start_of_today).iterator(chunk_size=500):
+        visitor.checkOutTime = end_of_local_day(visitor.checkInTime)
+        visitor.auto_checked_out_at = timezone.now()
+        visitor.save(update_fields=['checkOutTime', 'auto_checked_out_at', 'updated_at'])
+        checked_out += 1
+    return checked_out
\ No newline at end of file
@@ -0,0 +1,86 @@
+import gzip
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from forms_module.compression import BROTLI_QUALITY, brotli
+from forms_module.renderers import DATETIME_FORMAT, FastJSONRenderer, orjson
+from locations.models import Location
+from locations.registry import location_registry
+from visitors.models import Visitor
+from visitors.serializers import VisitorSerializer
+
+FIRST_NAMES = ['Aarav', 'Sita', 'Ram', 'Gita', 'Hari', 'Maya', 'Bikash', 'Anita', 'Suman', 'Priya', 'Rajesh', 'Sunita']
+LAST_NAMES = ['Shrestha', 'Sharma', 'Paneru', 'Thapa', 'Gurung', 'Rai', 'Karki', 'Adhikari', 'Tamang', 'Magar']
+REASONS = ['Meeting', 'Delivery', 'Interview', 'Maintenance of rack equipment', 'Site inspection', 'Vendor demo']
+
+
+class Command(BaseCommand):
+    help = ("Times serializing and rendering one page of visitors with DRF's JSONRenderer and a "
+            "DATETIME_FORMAT string (the previous settings) against FastJSONRenderer with "
+            "DATETIME_FORMAT=None, and shows the page's size raw, gzipped and brotli-compressed.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Visitors on the page.')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per renderer.')
+        parser.add_argument('--location-name', default='Rendering Benchmark')
+
+    def handle(self, *args, **options):
+        location, _ = Location.objects.get_or_create(name=options['location_name'])
+        location_registry.ensure({location.pk})
+        visitors = self.visitors(location, options['rows'])
+
+        previous = dict(settings.REST_FRAMEWORK, DATETIME_FORMAT=DATETIME_FORMAT)
+        with override_settings(REST_FRAMEWORK=previous):
+            before = self.measure('JSONRenderer, strftime', JSONRenderer(), visitors, options['repeat'])
+        after = self.measure(f'FastJSONRenderer{"" if orjson else " (no orjson)"}', FastJSONRenderer(), visitors, options['repeat'])
+        self.stdout.write(f'Identical output: {"yes" if before[1] == after[1] else "NO"}; '
+                          f'{before[0] / after[0]:.1f}x faster to serialize and render.')
+
+        content = after[1]
+        sizes = [('raw', len(content)), ('gzip', len(compress_string(content))), ('gzip -9', len(gzip.compress(content, 9, mtime=0)))]
+        if brotli is not None:
+            sizes.append((f'brotli q{BROTLI_QUALITY}', len(brotli.compress(content, quality=BROTLI_QUALITY))))
+        for label, size in sizes:
+            self.stdout.write(f'{label:>10}: {size:>9,} bytes ({size / len(content):.0%})')
+
+    def measure(self, label, renderer, visitors, repeat):
+        serialize_times, render_times = [], []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = {'count': len(visitors), 'next': None, 'previous': None,
+                    'results': VisitorSerializer(visitors, many=True).data}
+            serialized = time.perf_counter()
+            content = renderer.render(data)
+            serialize_times.append((serialized - started) * 1000)
+            render_times.append((time.perf_counter() - serialized) * 1000)
+        serialize, render = statistics.median(serialize_times), statistics.median(render_times)
+        self.stdout.write(f'{label:<28} serialize={serialize:7.1f}ms render={render:7.1f}ms total={serialize + render:7.1f}ms')
+        return serialize + render, content
+
+    def visitors(self, location, rows):
+        """Unsaved visitors shaped like a busy front desk's; serializing them needs no queries."""
+        now = timezone.now()
+        visitors = []
+        for i in range(rows):
+            first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+            check_in = now - timedelta(minutes=random.randint(0, 60 * 24 * 30), microseconds=random.randint(0, 999999))
+            visitors.append(Visitor(
+                id=i + 1, location=location,
+                fullName=f'{first} {last}', idNumberType=f'Citizenship {random.randint(10000, 99999)}',
+                email=f'{first.lower()}.{last.lower()}{i}@gmail.com', contact=f'98{random.randint(40000000, 49999999)}',
+                reason=random.choice(REASONS), approvedBy='Front Desk', requestedBy=f'{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}',
+                requestSource='Walk-in', checkInTime=check_in,
+                checkOutTime=check_in + timedelta(minutes=random.randint(5, 240)) if i % 3 else None,
+                created_by_name='Front Desk', created_by_email='desk@example.com',
+                created_at=check_in, updated_at=check_in,
+            ))
+        return visitors
\ No newline at end of file
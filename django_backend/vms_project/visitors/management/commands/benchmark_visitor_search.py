@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework import filters as drf_filters
+from rest_framework.request import Request
+
+from locations.models import Location
+from visitors.models import Visitor
+from visitors.views import VisitorViewSet, TrigramSearchFilter
+
+FIRST_NAMES = ['Aarav', 'Sita', 'Ram', 'Gita', 'Hari', 'Maya', 'Bikash', 'Anita', 'Suman', 'Priya', 'Rajesh', 'Sunita']
+LAST_NAMES = ['Shrestha', 'Sharma', 'Paneru', 'Thapa', 'Gurung', 'Rai', 'Karki', 'Adhikari', 'Tamang', 'Magar']
+ID_TYPES = ['Citizenship', 'Passport', 'License', 'Staff ID']
+
+
+class Command(BaseCommand):
+    help = ("Compares ?search= on the visitor list using DRF's SearchFilter over a sequential scan "
+            "(the previous behaviour) against TrigramSearchFilter on the pg_trgm GIN indexes.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Seed the benchmark location up to this many visitors.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per term and backend.')
+        parser.add_argument('--terms', default='paneru,9841,gmail,shrestha sita,zzzz',
+                            help='Comma separated search strings, as typed into the front desk search box.')
+        parser.add_argument('--location-name', default='Search Benchmark')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark needs PostgreSQL with the pg_trgm extension.')
+
+        with transaction.atomic():
+            location, _ = Location.objects.get_or_create(name=options['location_name'])
+            self.seed(location, options['rows'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE visitors_visitor')
+            self.benchmark(location, options)
+            transaction.set_rollback(True) # Leave the database as it was
+
+    def benchmark(self, location, options):
+        view = VisitorViewSet()
+        backends = [
+            ('SearchFilter (seq scan)', drf_filters.SearchFilter(), True),
+            ('TrigramSearchFilter', TrigramSearchFilter(), False),
+        ]
+        for term in options['terms'].split(','):
+            request = Request(RequestFactory().get('/api/visitors/', {'search': term}))
+            for label, backend, force_seq_scan in backends:
+                timings = []
+                for _ in range(options['repeat']):
+                    queryset = Visitor.objects.filter(location=location).order_by('-checkInTime')
+                    queryset = backend.filter_queryset(request, queryset, view)
+                    with transaction.atomic(), connection.cursor() as cursor:
+                        if force_seq_scan:
+                            # What the tree did before the trigram indexes existed.
+                            cursor.execute('SET LOCAL enable_bitmapscan = off')
+                            cursor.execute('SET LOCAL enable_indexscan = off')
+                        started = time.perf_counter()
+                        count = queryset.count()
+                        list(queryset[:10])
+                        timings.append((time.perf_counter() - started) * 1000)
+                        # Releasing the savepoint would keep SET LOCAL until the outer rollback
+                        transaction.set_rollback(True)
+                self.stdout.write(
+                    f"{term!r:>18} {label:<24} matches={count:<8} "
+                    f"median={statistics.median(timings):8.1f}ms max={max(timings):8.1f}ms"
+                )
+
+    def seed(self, location, rows):
+        existing = Visitor.objects.filter(location=location).count()
+        if existing >= rows:
+            return
+        self.stdout.write(f'Seeding {rows - existing} visitors into "{location.name}"...')
+        now = timezone.now()
+        batch = []
+        for i in range(existing, rows):
+            first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+            batch.append(Visitor(
+                location=location,
+                fullName=f'{first} {last}',
+                idNumberType=f'{random.choice(ID_TYPES)} {random.randint(10000, 99999)}',
+                email=f'{first.lower()}.{last.lower()}{i}@{random.choice(["gmail.com", "yahoo.com", "times.com.np"])}',
+                contact=f'98{random.randint(40000000, 49999999)}',
+                checkInTime=now - timedelta(minutes=random.randint(0, 60 * 24 * 365)),
+                created_by_name='Benchmark Seeder',
+                created_by_email='seeder@example.com',
+            ))
+            if len(batch) == 10_000:
+                Visitor.objects.bulk_create(batch)
+                batch = []
+        Visitor.objects.bulk_create(batch)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visitors', '0002_visitor_created_by_email_visitor_created_by_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='visitor',
+            index=models.Index(fields=['location', '-checkInTime', 'id'], name='visitor_loc_checkin_id_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:35
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class AddIndexOnPostgres(migrations.AddIndex):
+    """GIN/trigram indexes only exist on PostgreSQL; keep the SQLite dev setup migratable."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def trigram_index(field, name):
+    return AddIndexOnPostgres(
+        model_name='visitor',
+        index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(field), name='gin_trgm_ops'), name=name),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visitors', '0003_visitor_loc_checkin_id_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        trigram_index('fullName', 'visitor_fullname_trgm'),
+        trigram_index('idNumberType', 'visitor_idnumbertype_trgm'),
+        trigram_index('email', 'visitor_email_trgm'),
+        trigram_index('contact', 'visitor_contact_trgm'),
+        trigram_index('created_by_name', 'visitor_created_by_name_trgm'),
+        trigram_index('created_by_email', 'visitor_created_by_email_trgm'),
+    ]
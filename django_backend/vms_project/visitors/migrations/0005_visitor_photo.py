@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0004_storedimage_lookup_indexes'),
+        ('visitors', '0004_visitor_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitor',
+            name='photo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='visits', to='images.storedimage'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visitors', '0005_visitor_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitor',
+            name='auto_checked_out_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Auto Checked Out At'),
+        ),
+    ]
@@ -1,8 +1,14 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.utils import timezone
 from locations.models import Location # Import Location model
+from images.models import StoredImage
 # from django.conf import settings # If you decide to link to User model directly
 
+# Columns matched by ?search= on the visitor list; each one has a trigram index.
+SEARCH_FIELDS = ('fullName', 'idNumberType', 'email', 'contact', 'created_by_name', 'created_by_email')
+
 class Visitor(models.Model):
     location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name='visitors')
     idNumberType = models.CharField(max_length=100, blank=True, null=True, verbose_name="ID Number/Type")
@@ -13,9 +19,14 @@ class Visitor(models.Model):
     approvedBy = models.CharField(max_length=255, blank=True, null=True, verbose_name="Approved By")
     requestedBy = models.CharField(max_length=255, blank=True, null=True, verbose_name="Requested By")
     requestSource = models.CharField(max_length=100, blank=True, null=True, verbose_name="Request Source")
+    # Registered photo, usually picked via /api/images/lookup/ when the check-in form auto-fills
+    photo = models.ForeignKey(StoredImage, on_delete=models.SET_NULL, blank=True, null=True, related_name='visits')
     
     checkInTime = models.DateTimeField(default=timezone.now, verbose_name="Check-In Time")
     checkOutTime = models.DateTimeField(blank=True, null=True, verbose_name="Check-Out Time")
+    # Set when visitors.jobs.auto_checkout_open_visits closed the visit at the end of its check-in day;
+    # checkOutTime is then not when the visitor left, so these visits are left out of dwell times.
+    auto_checked_out_at = models.DateTimeField(blank=True, null=True, editable=False, verbose_name="Auto Checked Out At")
 
     # Fields to store creator's information
     created_by_name = models.CharField(max_length=255, blank=True, null=True, editable=False, help_text="Full name of the user who created this entry.")
@@ -38,4 +49,13 @@ class Visitor(models.Model):
     class Meta:
         ordering = ['-checkInTime']
         verbose_name = "Visitor Record"
-        verbose_name_plural = "Visitor Records"
\ No newline at end of file
+        verbose_name_plural = "Visitor Records"
+        indexes = [
+            # Serves location-scoped lists ordered by check-in time, including keyset pages.
+            models.Index(fields=['location', '-checkInTime', 'id'], name='visitor_loc_checkin_id_idx'),
+        ] + [
+            # Trigram indexes on UPPER(col), the expression Django's icontains compiles to on
+            # PostgreSQL, so ?search= substring matches use a bitmap index scan (PostgreSQL only).
+            GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=f'visitor_{field.lower()}_trgm')
+            for field in SEARCH_FIELDS
+        ]
\ No newline at end of file
@@ -1,19 +1,24 @@
 from rest_framework import serializers
 from .models import Visitor
-from locations.models import Location
-from locations.serializers import LocationSerializer
+from locations.serializers import RegisteredLocationField, RegisteredLocationPrimaryKeyField
+from images.models import StoredImage
+from images.serializers import StoredImagePhotoSerializer
+from forms_module.fieldsets import SparseFieldsetSerializerMixin, collapsed_id
 
-class VisitorSerializer(serializers.ModelSerializer):
-    location = LocationSerializer(read_only=True)
-    location_id = serializers.PrimaryKeyRelatedField(
-        queryset=Location.objects.all(), source='location', write_only=True
+class VisitorSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {'location': collapsed_id('location_id'), 'photo': collapsed_id('photo_id')}
+    location = RegisteredLocationField() # From the in-memory location registry, no join
+    location_id = RegisteredLocationPrimaryKeyField(source='location', write_only=True)
+    photo = StoredImagePhotoSerializer(read_only=True)
+    photo_id = serializers.PrimaryKeyRelatedField(
+        queryset=StoredImage.objects.all(), source='photo', write_only=True, required=False, allow_null=True
     )
 
     class Meta:
         model = Visitor
         fields = [
             'id', 'location', 'location_id', 'idNumberType', 'fullName', 'contact', 'email', 
-            'reason', 'approvedBy', 'requestedBy', 'requestSource',
+            'reason', 'approvedBy', 'requestedBy', 'requestSource', 'photo', 'photo_id',
             'checkInTime', 'checkOutTime', 
             'created_by_name', 'created_by_email', # Added fields
             'created_at', 'updated_at'
@@ -0,0 +1,57 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from forms_module.tests import LocationScopedAPITestCase
+from locations.models import Location, LocationDailyStats
+from .jobs import auto_checkout_open_visits
+from .models import Visitor
+
+
+class ReportSummaryTestCase(LocationScopedAPITestCase):
+    def get_summary(self, **params):
+        """The report summary for yesterday and today, by location name."""
+        today = timezone.localdate()
+        response = self.client.get('/api/visitors/report/summary/', {
+            'start_date': today - timedelta(days=1), 'end_date': today, **params})
+        self.assertEqual(response.status_code, 200)
+        return {summary['location_name']: summary for summary in response.json()['locations']}
+
+
+class ReportSummaryTests(ReportSummaryTestCase):
+    def test_top_approvers_per_location(self):
+        other = Location.objects.create(name='Other Data Center')
+        self.user.authorized_locations.add(other)
+        approvals = {self.location: {'Manager A': 3, 'Manager B': 1, 'Manager C': 2, '': 4},
+                     other: {'Manager B': 2, 'Manager D': 2, 'Manager E': 1}}
+        now = timezone.now()
+        Visitor.objects.bulk_create([
+            Visitor(location=location, fullName=f'Visitor {i}', approvedBy=approver, checkInTime=now)
+            for location, counts in approvals.items() for approver, count in counts.items() for i in range(count)
+        ])
+        summaries = self.get_summary(top=2)
+        self.assertEqual(summaries[self.location.name]['top_approvers'],
+                         [{'approvedBy': 'Manager A', 'count': 3}, {'approvedBy': 'Manager C', 'count': 2}])
+        self.assertEqual(summaries[other.name]['top_approvers'],
+                         [{'approvedBy': 'Manager B', 'count': 2}, {'approvedBy': 'Manager D', 'count': 2}])
+
+
+class AutoCheckoutTests(ReportSummaryTestCase):
+    def test_open_visit_closes_at_the_end_of_its_day(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        check_in = timezone.make_aware(datetime.combine(yesterday, time(10)))
+        # Saved one by one, so the daily stats rollup sees them
+        left = Visitor.objects.create(location=self.location, fullName='Left', checkInTime=check_in, checkOutTime=check_in + timedelta(hours=1))
+        stayed = Visitor.objects.create(location=self.location, fullName='Stayed', checkInTime=check_in)
+
+        self.assertEqual(auto_checkout_open_visits(), 1)
+        stayed.refresh_from_db()
+        self.assertIsNotNone(stayed.auto_checked_out_at)
+        self.assertEqual(timezone.localtime(stayed.checkOutTime), timezone.make_aware(datetime.combine(yesterday, time.max)))
+        left.refresh_from_db()
+        self.assertIsNone(left.auto_checked_out_at)
+
+        stats = LocationDailyStats.objects.get(location=self.location, day=yesterday)
+        self.assertEqual((stats.check_ins, stats.check_outs, stats.open_visits), (2, 2, 0))
+        self.assertFalse(LocationDailyStats.objects.filter(location=self.location, day=timezone.localdate()).exists())
+        self.assertEqual(self.get_summary()[self.location.name]['avg_dwell_seconds'], 3600)
\ No newline at end of file
@@ -1,10 +1,22 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import VisitorViewSet
+from forms_module.async_views import read_async, router_views
+from .views import VisitorViewSet, AsyncVisitorReads
 
 router = DefaultRouter()
 router.register(r'', VisitorViewSet, basename='visitor') # Empty string for base path /api/visitors/
 
-urlpatterns = [
+urlpatterns = []
+
+if settings.ASYNC_READ_VIEWS: # Under ASGI, GETs on the busiest routes are served by async views
+    reads, sync_views = AsyncVisitorReads(VisitorViewSet), router_views(router)
+    urlpatterns += [
+        re_path(r'^$', read_async(reads.list, sync_views['visitor-list'])),
+        re_path(r'^report/$', read_async(reads.report, sync_views['visitor-report'])),
+        re_path(r'^(?P<pk>[^/.]+)/$', read_async(reads.retrieve, sync_views['visitor-detail'])),
+    ]
+
+urlpatterns += [
     path('', include(router.urls)),
 ]
\ No newline at end of file
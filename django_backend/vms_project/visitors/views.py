@@ -1,13 +1,21 @@
 from rest_framework import viewsets, status, filters as drf_filters 
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django.utils import timezone
+from datetime import datetime
 from django.utils.dateparse import parse_datetime
+from django.db import connection
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, OuterRef, Q, Subquery
+from django.db.models.functions import ExtractHour, Greatest, TruncDay
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django_filters.rest_framework import DjangoFilterBackend
 # from django.core.exceptions import PermissionDenied # No longer needed here
-from .models import Visitor
+from .models import Visitor, SEARCH_FIELDS
 from .serializers import VisitorSerializer, VisitorCheckoutSerializer
+from .exports import CSVExportRenderer, XLSXExportRenderer, export_response
 from forms_module.views import BaseLocationScopedViewSet 
+from forms_module.async_views import AsyncLocationScopedReads
 
 # Custom filter for check_in_time_after and check_in_time_before
 class VisitorDateFilter(drf_filters.BaseFilterBackend):
@@ -24,11 +32,35 @@ class VisitorDateFilter(drf_filters.BaseFilterBackend):
             if dt_before: queryset = queryset.filter(checkInTime__lte=dt_before)
         return queryset
 
+# Same ?search= contract as SearchFilter: every term must icontains-match one of search_fields.
+# On PostgreSQL those predicates are answered from the UPPER(col) gin_trgm_ops indexes
+# (see visitors/migrations/0004) instead of a sequential scan, and matches are ranked by
+# trigram word similarity, best first. Other databases get plain SearchFilter behaviour.
+class TrigramSearchFilter(drf_filters.SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms or connection.vendor != 'postgresql':
+            return queryset
+
+        search_rank = None
+        for term in search_terms:
+            term_rank = Greatest(*[TrigramWordSimilarity(term, field) for field in search_fields])
+            search_rank = term_rank if search_rank is None else search_rank + term_rank
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(search_rank=search_rank).order_by('-search_rank', *ordering)
+
 class VisitorViewSet(BaseLocationScopedViewSet): 
-    queryset = Visitor.objects.all().order_by('-checkInTime') 
+    queryset = Visitor.objects.select_related('photo').order_by('-checkInTime') # photo is nested in every row; location comes from the registry
     serializer_class = VisitorSerializer
-    filter_backends = [drf_filters.SearchFilter, VisitorDateFilter, DjangoFilterBackend]
-    search_fields = ['fullName', 'idNumberType', 'email', 'contact', 'created_by_name', 'created_by_email'] 
+    cursor_ordering = ('-checkInTime', 'id') # Backed by visitor_loc_checkin_id_idx
+    validator_related = ('photo',)
+    signs_media_urls = True # photo.imageFile and its thumbnails
+    values_actions = ('list', 'report') # Pages built from values() rows (forms_module/projection.py)
+    filter_backends = [TrigramSearchFilter, VisitorDateFilter, DjangoFilterBackend]
+    search_fields = list(SEARCH_FIELDS) 
     
     filterset_fields = { 
         'fullName': ['icontains'], 
@@ -59,34 +91,129 @@ class VisitorViewSet(BaseLocationScopedViewSet):
         serializer = VisitorSerializer(visitor) 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    @action(detail=False, methods=['get'], url_path='report')
-    def report(self, request):
+    def get_report_queryset(self, request):
+        """
+        Location-scoped, filtered visitors checked in between ?start_date and ?end_date (YYYY-MM-DD).
+        Returns (queryset, None) or (None, error_response).
+        """
         start_date_str = request.query_params.get('start_date')
         end_date_str = request.query_params.get('end_date')
 
         if not start_date_str or not end_date_str:
-            return Response({'detail': 'Both start_date and end_date parameters are required.'}, 
-                            status=status.HTTP_400_BAD_REQUEST)
+            return None, Response({'detail': 'Both start_date and end_date parameters are required.'}, 
+                                  status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            from datetime import datetime
             start_date = datetime.strptime(start_date_str, '%Y-%m-%d').replace(hour=0, minute=0, second=0, tzinfo=timezone.get_current_timezone())
             end_date = datetime.strptime(end_date_str, '%Y-%m-%d').replace(hour=23, minute=59, second=59, tzinfo=timezone.get_current_timezone())
         except ValueError:
-            return Response({'detail': 'Invalid date format. Please use YYYY-MM-DD.'}, 
-                            status=status.HTTP_400_BAD_REQUEST)
+            return None, Response({'detail': 'Invalid date format. Please use YYYY-MM-DD.'}, 
+                                  status=status.HTTP_400_BAD_REQUEST)
 
         queryset = self.filter_queryset(self.get_queryset()) 
         
-        report_queryset = queryset.filter(
+        return queryset.filter(
             checkInTime__gte=start_date, 
             checkInTime__lte=end_date 
-        ).order_by('checkInTime')
+        ), None
+
+    # ?format=csv / ?format=xlsx stream the whole report instead of returning a JSON page.
+    @action(detail=False, methods=['get'], url_path='report',
+            renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, CSVExportRenderer, XLSXExportRenderer])
+    def report(self, request):
+        report_queryset, error_response = self.get_report_queryset(request)
+        if error_response is not None:
+            return error_response
+
+        report_queryset = report_queryset.order_by('checkInTime')
+
+        export_format = request.accepted_renderer.format
+        if export_format in (CSVExportRenderer.format, XLSXExportRenderer.format):
+            filename = f"visitor_report_{request.query_params['start_date']}_{request.query_params['end_date']}"
+            return export_response(report_queryset, export_format, filename)
         
-        page = self.paginate_queryset(report_queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        return self.list_response(report_queryset)
+
+    @action(detail=False, methods=['get'], url_path='report/summary')
+    def report_summary(self, request):
+        """
+        Per-location analytics for the same start_date/end_date/location_id parameters as `report`:
+        visitors per day, per hour of day (peak hour), per requestSource, top approvedBy values
+        and average dwell time of visits checked out at the desk (auto checked out visits have no
+        real checkout time). Each breakdown is a single GROUP BY over the scoped report queryset,
+        so the number of queries does not grow with rows or locations.
+        """
+        report_queryset, error_response = self.get_report_queryset(request)
+        if error_response is not None:
+            return error_response
+
+        try:
+            top_n = max(1, int(request.query_params.get('top', 5)))
+        except ValueError:
+            return Response({'detail': 'Invalid top value.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        base = report_queryset.order_by()
+        tz = timezone.get_current_timezone()
+        dwell = ExpressionWrapper(F('checkOutTime') - F('checkInTime'), output_field=DurationField())
+
+        summaries = {}
+        for row in base.values('location_id', 'location__name').annotate(
+            total_visitors=Count('id'),
+            checked_out=Count('checkOutTime'),
+            avg_dwell=Avg(dwell, filter=Q(checkOutTime__isnull=False, auto_checked_out_at__isnull=True)),
+        ).order_by('location__name'):
+            summaries[row['location_id']] = {
+                'location_id': row['location_id'],
+                'location_name': row['location__name'],
+                'total_visitors': row['total_visitors'],
+                'checked_out': row['checked_out'],
+                'still_checked_in': row['total_visitors'] - row['checked_out'],
+                'avg_dwell_seconds': row['avg_dwell'].total_seconds() if row['avg_dwell'] is not None else None,
+                'per_day': [],
+                'hourly': [],
+                'peak_hour': None,
+                'request_sources': [],
+                'top_approvers': [],
+            }
+
+        for row in base.annotate(day=TruncDay('checkInTime', tzinfo=tz)).values('location_id', 'day').annotate(count=Count('id')).order_by('day'):
+            summaries[row['location_id']]['per_day'].append({'date': row['day'].date().isoformat(), 'count': row['count']})
+
+        for row in base.annotate(hour=ExtractHour('checkInTime', tzinfo=tz)).values('location_id', 'hour').annotate(count=Count('id')).order_by('hour'):
+            summary = summaries[row['location_id']]
+            summary['hourly'].append({'hour': row['hour'], 'count': row['count']})
+            if summary['peak_hour'] is None or row['count'] > summary['peak_hour']['count']:
+                summary['peak_hour'] = {'hour': row['hour'], 'count': row['count']}
+
+        for row in base.values('location_id', 'requestSource').annotate(count=Count('id')).order_by('-count', 'requestSource'):
+            summaries[row['location_id']]['request_sources'].append({'requestSource': row['requestSource'], 'count': row['count']})
+
+        # Each location's top_n approvers come from a correlated LIMIT subquery, so only those rows are
+        # grouped and returned however many approvers there are. (Django groups by a Window over a
+        # values() aggregate, so RowNumber can't rank them here.)
+        approved = base.exclude(approvedBy__isnull=True).exclude(approvedBy='')
+        top_approvers = approved.filter(location_id=OuterRef('location_id')).values('approvedBy').annotate(
+            count=Count('id')).order_by('-count', 'approvedBy').values('approvedBy')[:top_n]
+        for row in approved.filter(approvedBy__in=Subquery(top_approvers)).values('location_id', 'approvedBy').annotate(
+                count=Count('id')).order_by('-count', 'approvedBy'):
+            summaries[row['location_id']]['top_approvers'].append({'approvedBy': row['approvedBy'], 'count': row['count']})
+
+        return Response({
+            'start_date': request.query_params['start_date'],
+            'end_date': request.query_params['end_date'],
+            'locations': list(summaries.values()),
+        })
+
+
+class AsyncVisitorReads(AsyncLocationScopedReads):
+    """VisitorViewSet's list, retrieve and JSON report for ASGI (see forms_module/async_views.py)."""
+
+    async def report(self, request):
+        return await self.respond(self._report, request)
 
-        serializer = self.get_serializer(report_queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+    async def _report(self, request):
+        view = await self.view_for(request, 'report')
+        report_queryset, error_response = view.get_report_queryset(view.request)
+        if error_response is not None:
+            return error_response
+        return await self.paginated(view, report_queryset.order_by('checkInTime'))
\ No newline at end of file
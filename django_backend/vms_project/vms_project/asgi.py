@@ -2,4 +2,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vms_project.settings')
+os.environ.setdefault('DJANGO_ASYNC_READ_VIEWS', 'True') # Serve the busiest reads from async views
+os.environ.setdefault('DB_CONN_MAX_AGE', '0') # Persistent connections aren't reused under ASGI (see settings_production.py)
 application = get_asgi_application()
\ No newline at end of file
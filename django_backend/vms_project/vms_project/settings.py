@@ -5,6 +5,8 @@ from datetime import timedelta
 BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-your-default-secret-key-here-for-locations')
 DEBUG = os.environ.get('DJANGO_DEBUG', 'True') == 'True'
+# Async views for the busiest read endpoints; vms_project/asgi.py turns this on (see forms_module/async_views.py)
+ASYNC_READ_VIEWS = os.environ.get('DJANGO_ASYNC_READ_VIEWS', 'False') == 'True'
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', '192.168.55.61', '192.168.55.193', '192.168.69.202','192.168.18.120','192.168.55.83']
 
 INSTALLED_APPS = [
@@ -14,6 +16,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres', # pg_trgm lookups and GIN indexes for visitor search
 
     'rest_framework',
     'rest_framework_simplejwt',
@@ -26,10 +29,12 @@ INSTALLED_APPS = [
     'images.apps.ImagesConfig',
     'task_management.apps.TaskManagementConfig',
     'locations.apps.LocationsConfig', 
+    'jobs.apps.JobsConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'forms_module.compression.CompressionMiddleware', # Before anything else that reads or writes the body
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,10 +99,30 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles_locations'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media_locations'
+# Media is served by images.media.serve_media after an access check. Set to 'x-accel-redirect' (nginx)
+# or 'x-sendfile' (Apache mod_xsendfile) to let the front proxy send the file.
+MEDIA_SENDFILE = os.environ.get('DJANGO_MEDIA_SENDFILE', '')
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/' # nginx `internal` location aliased to MEDIA_ROOT
+MEDIA_URL_TTL = 24 * 60 * 60 # Signed media URLs stay valid for one to two of these
+
+# Image uploads are streamed to disk and rejected as soon as they exceed these (see images/uploads.py)
+IMAGE_UPLOAD_MAX_BYTES = 5 * 1024 * 1024 # Per file
+IMAGE_UPLOAD_MAX_PIXELS = 40_000_000 # width * height; guards thumbnail generation against decompression bombs
+IMAGE_UPLOAD_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+IMAGE_BATCH_MAX_FILES = 50 # Per request to /api/images/batch/
+
+# Periodic background jobs, queued by `manage.py runworker` (see jobs/schedule.py). Times are in TIME_ZONE.
+JOB_SCHEDULE = {
+    'visitors.jobs.auto_checkout_open_visits': {'daily_at': '00:05'},
+    'images.jobs.collect_orphaned_files': {'daily_at': '03:00'},
+}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.User'
 
+# Text responses smaller than this are sent uncompressed (forms_module/compression.py).
+COMPRESSION_MIN_SIZE = 1024
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -105,9 +130,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'forms_module.pagination.OptionalCountPageNumberPagination', # Supports ?count=false
     'PAGE_SIZE': 10,
-    'DATETIME_FORMAT': "%Y-%m-%dT%H:%M:%S.%fZ",
+    'DEFAULT_RENDERER_CLASSES': [
+        'forms_module.renderers.FastJSONRenderer', # orjson when installed
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Serializers pass datetimes through; FastJSONRenderer writes them as forms_module.renderers.DATETIME_FORMAT
+    # ("%Y-%m-%dT%H:%M:%S.%fZ") far faster than each field's strftime.
+    'DATETIME_FORMAT': None,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
 }
 
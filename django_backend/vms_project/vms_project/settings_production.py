@@ -0,0 +1,31 @@
+"""
+Production profile. Run with DJANGO_SETTINGS_MODULE=vms_project.settings_production behind
+gunicorn, which picks up ../gunicorn.conf.py from the project directory.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import * # noqa: F401,F403
+
+DEBUG = False
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY: # No insecure fallback outside development
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY for the production settings.')
+SIMPLE_JWT = {**SIMPLE_JWT, 'SIGNING_KEY': SECRET_KEY}
+if os.environ.get('DJANGO_ALLOWED_HOSTS'):
+    ALLOWED_HOSTS = os.environ['DJANGO_ALLOWED_HOSTS'].split(',')
+
+# Keep each worker thread's connection open between requests instead of reconnecting for every
+# one (the TCP + auth handshake costs more than most of our queries). CONN_HEALTH_CHECKS makes
+# Django test a reused connection before the request that picks it up, so a restarted database
+# or a dropped idle connection costs one reconnect rather than a 500. vms_project/asgi.py sets
+# DB_CONN_MAX_AGE=0: under ASGI, Django 4.2 runs each request's sync code on a fresh thread, so
+# a persistent connection would never be reused and only leak.
+DATABASES['default'].update({
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+    'CONN_HEALTH_CHECKS': True,
+})
+DATABASES['default'].setdefault('OPTIONS', {}).update({
+    'connect_timeout': 5, # Fail the request (and /healthz) quickly if the database is unreachable
+})
\ No newline at end of file
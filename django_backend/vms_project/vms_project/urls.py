@@ -1,9 +1,12 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from images.media import serve_media
+from forms_module.health import healthz
 
 urlpatterns = [
+    path('healthz', healthz, name='healthz'), # Readiness probe; see forms_module/health.py
     path('admin/', admin.site.urls),
     path('api/auth/', include('users.urls')),
     path('api/locations/', include('locations.urls')), # Add locations URLs
@@ -11,8 +14,9 @@ urlpatterns = [
     path('api/', include('forms_module.urls')), # Keep this for device-storage and gate-passes
     path('api/images/', include('images.urls')),
     path('api/task-management/', include('task_management.urls')),
+    # Uploaded media needs an authenticated user or a signed URL, in every environment
+    re_path(r'^%s(?P<name>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)